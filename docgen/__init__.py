@@ -1,8 +1,19 @@
+from docgen.catalogue import (
+    catalogue_records,
+    save_catalogue,
+)
 from docgen.nbmeta import NbMeta
 from docgen.parser import (
     build_doc,
+    build_docs,
+    find_nbs,
+    index_notebook,
+    load_template,
     nb_relative_path,
     parse,
     process_nb,
+    read_first_cell,
+    save_index_page,
+    watched_state,
 )
 
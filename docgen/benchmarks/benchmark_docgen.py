@@ -0,0 +1,222 @@
+import argparse
+import base64
+import json
+import os
+import platform
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+from datetime import datetime, timezone
+from pathlib import Path
+from unittest import mock
+
+import chevron
+import nbformat
+
+import parser as docgen
+
+FEATURES = [
+    "aggregation", "corporate actions", "cut labels", "derived portfolios", "holdings", "instruments",
+    "portfolio groups", "properties", "quotes", "reconciliations", "transaction config", "valuation"
+]
+
+MODES = ["serial", "parallel", "cached"]
+
+README_TEMPLATE = Path(__file__).parent.parent.joinpath("README.mustache").resolve()
+
+
+def synthetic_notebook(rng, index, payload_kb):
+    """
+    Creates a notebook laid out like the samples in this repository: a docstring cell followed by code cells
+    with the kind of outputs notebooks are committed with
+
+    Parameters
+    ----------
+    rng : random.Random
+        Random number generator used to vary the content
+    index : int
+        Index of the notebook, used in its title
+    payload_kb : int
+        Approximate size of the outputs in kilobytes
+
+    Returns
+    -------
+    nbformat.NotebookNode
+        The notebook
+    """
+    features = "\n".join(rng.sample(FEATURES, rng.randint(1, 4)))
+    docstring = f'"""Synthetic notebook {index}\n\nShows how to do thing {index} in LUSID.\n\nAttributes\n----------\n{features}\n"""'
+
+    image = base64.b64encode(rng.randbytes(payload_kb * 1024 // 2)).decode("ascii")
+    rows = "".join(
+        f"<tr><td>{rng.random():.6f}</td><td>BBG{rng.randint(0, 10 ** 9):09d}</td></tr>"
+        for _ in range(payload_kb * 1024 // 4 // 50)
+    )
+
+    cells = [nbformat.v4.new_code_cell(docstring)]
+    for i in range(rng.randint(3, 12)):
+        cells.append(nbformat.v4.new_markdown_cell(f"## Step {i}\n\nSome explanation of step {i}."))
+        cells.append(nbformat.v4.new_code_cell(f"response = api.do_thing_{i}()"))
+
+    cells[-1].outputs = [
+        nbformat.v4.new_output("display_data", data={"image/png": image, "text/plain": "<Figure>"}),
+        nbformat.v4.new_output("execute_result", data={"text/html": f"<table>{rows}</table>"}, execution_count=1),
+        nbformat.v4.new_output("stream", name="stdout", text="Upserted 100 instruments\n" * 20),
+    ]
+
+    return nbformat.v4.new_notebook(cells=cells)
+
+
+def generate_tree(root, size, payload_kb, seed=0):
+    """
+    Generates a synthetic repository of notebooks spread over nested folders, alongside the data and image
+    folders found next to real notebooks
+
+    Parameters
+    ----------
+    root : str
+        Folder to generate the repository in
+    size : int
+        Number of notebooks
+    payload_kb : int
+        Approximate size of the outputs of each notebook in kilobytes
+    seed : int
+        Seed for the random number generator, so that runs are comparable
+    """
+    rng = random.Random(seed)
+
+    for i in range(size):
+        folder = Path(root, "examples", f"area-{i % 7}", f"topic-{i % 53}")
+        if not folder.exists():
+            folder.joinpath("data").mkdir(parents=True)
+            folder.joinpath("img").mkdir()
+            folder.joinpath("data", "transactions.csv").write_text("id,units\n" + "T1,100\n" * 1000)
+            folder.joinpath("img", "diagram.png").write_bytes(rng.randbytes(16 * 1024))
+
+        nbformat.write(synthetic_notebook(rng, i, payload_kb), str(folder.joinpath(f"notebook-{i}.ipynb")))
+
+
+class Stopwatch:
+    """
+    Accumulates the time spent in named stages
+    """
+
+    def __init__(self):
+        self.timings = {}
+
+    def time(self, stage, fn, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            self.timings[stage] = self.timings.get(stage, 0.0) + time.perf_counter() - start
+
+    def wrap(self, stage, fn):
+        return lambda *args, **kwargs: self.time(stage, fn, *args, **kwargs)
+
+
+def run_case(nb_root, mode, workers):
+    """
+    Times each docgen stage over an existing notebook tree. Run in a fresh process so the peak RSS is that of
+    this case alone.
+
+    Parameters
+    ----------
+    nb_root : str
+        Root folder of the notebook tree
+    mode : str
+        One of 'serial' (process_nb one notebook at a time), 'parallel' (process_nbs across a process pool) or
+        'cached' (incremental parse against a warm manifest)
+    workers : int
+        Maximum number of worker processes for the parallel and cached modes
+
+    Returns
+    -------
+    dict
+        Timings in seconds per stage, number of notebooks found and indexed and peak RSS in kilobytes
+    """
+    stopwatch = Stopwatch()
+
+    nbs = stopwatch.time("find_nbs", lambda: list(docgen.find_nbs(nb_root)))
+
+    if mode == "serial":
+        meta = stopwatch.time("process_nb", lambda: [docgen.process_nb(nb) for nb in nbs])
+    elif mode == "parallel":
+        meta = stopwatch.time("process_nb", docgen.process_nbs, nbs, workers)
+    else:
+        with tempfile.TemporaryDirectory() as cache_dir:
+            manifest_path = os.path.join(cache_dir, "manifest.pickle")
+            stopwatch.time("parse_cold", docgen.parse, nb_root, manifest_path=manifest_path, workers=workers)
+            meta = stopwatch.time("process_nb", docgen.parse, nb_root, manifest_path=manifest_path, workers=workers)
+
+    meta = [m for m in meta if m is not None]
+
+    with mock.patch.object(chevron, "render", stopwatch.wrap("chevron.render", chevron.render)):
+        stopwatch.time("build_doc", docgen.build_doc, meta, README_TEMPLATE, True)
+
+    # ru_maxrss is reported in bytes on macOS and kilobytes elsewhere
+    scale = 1024 if sys.platform == "darwin" else 1
+    return {
+        "timings": stopwatch.timings,
+        "notebooks": len(nbs),
+        "indexed": len(meta),
+        "peak_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss // scale,
+        "peak_rss_children_kb": resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss // scale,
+    }
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Benchmarks docgen over synthetic notebook trees")
+    arg_parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000],
+                            help="number of notebooks in each synthetic tree")
+    arg_parser.add_argument("--modes", nargs="+", choices=MODES, default=MODES,
+                            help="ways of extracting the notebook metadata to compare")
+    arg_parser.add_argument("--payload-kb", type=int, default=32, help="approximate output size of each notebook")
+    arg_parser.add_argument("--workers", type=int, default=None, help="worker processes for the pooled modes")
+    arg_parser.add_argument("--output", default="docgen-benchmark.json", help="path to write the results to")
+    arg_parser.add_argument("--run-case", nargs=2, metavar=("NB_ROOT", "MODE"), help=argparse.SUPPRESS)
+    args = arg_parser.parse_args()
+
+    if args.run_case:
+        print(json.dumps(run_case(args.run_case[0], args.run_case[1], args.workers)))
+        return
+
+    results = []
+
+    for size in args.sizes:
+        with tempfile.TemporaryDirectory() as nb_root:
+            print(f"generating {size} notebooks in {nb_root}")
+            generate_tree(nb_root, size, args.payload_kb)
+
+            for mode in args.modes:
+                command = [sys.executable, __file__, "--run-case", nb_root, mode]
+                if args.workers:
+                    command += ["--workers", str(args.workers)]
+
+                # the case result is the last line, anything before it is docgen's own output
+                output = subprocess.run(command, check=True, capture_output=True, text=True).stdout
+                case = json.loads(output.splitlines()[-1])
+                results.append({"size": size, "mode": mode, **case})
+
+                timings = ", ".join(f"{stage} {seconds:.3f}s" for stage, seconds in case["timings"].items())
+                print(f"{size:>6} {mode:<8} {timings}, peak rss {case['peak_rss_kb'] // 1024} MB")
+
+    with open(args.output, "w") as f:
+        json.dump({
+            "created": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "payload_kb": args.payload_kb,
+            "results": results,
+        }, f, indent=2)
+
+    print(f"saved results to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
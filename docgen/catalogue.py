@@ -0,0 +1,164 @@
+import json
+import os
+import sqlite3
+
+from datetime import datetime, timezone
+
+
+def catalogue_records(meta, nb_root):
+    """
+    Converts notebook metadata to catalogue records, adding the size and last modified time of each notebook
+
+    Parameters
+    ----------
+    meta : [NbMeta]
+        Notebook metadata
+    nb_root : str
+        Root folder the notebook paths are relative to
+
+    Returns
+    -------
+    [dict]
+        Catalogue records, sorted by notebook path
+    """
+    records = []
+
+    for m in meta:
+        path = f"{m.path}/{m.filename}"
+        stat = os.stat(os.path.join(nb_root, path))
+        records.append({
+            "path": path,
+            "folder": m.path,
+            "filename": m.filename,
+            "title": m.title,
+            "description": m.raw_description,
+            "features": m.features,
+            "size": stat.st_size,
+            "modified": datetime.fromtimestamp(stat.st_mtime, timezone.utc).isoformat(),
+        })
+
+    records.sort(key=lambda r: r["path"])
+
+    return records
+
+
+def save_catalogue_jsonl(path, records):
+    """
+    Saves catalogue records as JSON Lines, one notebook per line, unless the file already has exactly this content
+
+    Parameters
+    ----------
+    path : str
+        Path to save the catalogue to
+    records : [dict]
+        Catalogue records
+
+    Returns
+    -------
+    bool
+        True if the file was written, False if it was already up to date
+    """
+    content = "".join(json.dumps(r, sort_keys=True) + "\n" for r in records).encode("utf-8")
+
+    if os.path.isfile(path):
+        with open(path, "rb") as f:
+            if f.read() == content:
+                return False
+
+    with open(path, "wb") as f:
+        f.write(content)
+
+    return True
+
+
+def save_catalogue_sqlite(path, records):
+    """
+    Saves catalogue records to a SQLite database with a notebooks table and a features table indexed by feature,
+    so notebooks using a feature can be found without scanning the catalogue:
+
+        SELECT n.path FROM notebooks n JOIN features f ON f.notebook_id = n.id WHERE f.feature = 'properties'
+
+    The database is built alongside and then swapped in, so readers never see a partially written catalogue
+
+    Parameters
+    ----------
+    path : str
+        Path to save the database to
+    records : [dict]
+        Catalogue records
+    """
+    tmp_path = f"{path}.tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+
+    connection = sqlite3.connect(tmp_path)
+    try:
+        with connection:
+            connection.executescript("""
+                CREATE TABLE notebooks (
+                    id INTEGER PRIMARY KEY,
+                    path TEXT NOT NULL UNIQUE,
+                    folder TEXT NOT NULL,
+                    filename TEXT NOT NULL,
+                    title TEXT NOT NULL,
+                    description TEXT,
+                    size INTEGER NOT NULL,
+                    modified TEXT NOT NULL
+                );
+                CREATE TABLE features (
+                    notebook_id INTEGER NOT NULL REFERENCES notebooks (id),
+                    feature TEXT NOT NULL
+                );
+            """)
+
+            for notebook_id, r in enumerate(records, start=1):
+                connection.execute(
+                    "INSERT INTO notebooks VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (notebook_id, r["path"], r["folder"], r["filename"], r["title"], r["description"], r["size"],
+                     r["modified"])
+                )
+                connection.executemany(
+                    "INSERT INTO features VALUES (?, ?)",
+                    [(notebook_id, feature) for feature in r["features"]]
+                )
+
+            # created after the inserts as building the index in one go is cheaper than maintaining it row by row
+            connection.execute("CREATE INDEX features_feature ON features (feature, notebook_id)")
+            connection.execute("CREATE INDEX notebooks_folder ON notebooks (folder)")
+    finally:
+        connection.close()
+
+    os.replace(tmp_path, path)
+
+
+def save_catalogue(catalogue_dir, meta, nb_root):
+    """
+    Saves the notebook catalogue as notebooks.jsonl and notebooks.sqlite. The database is only rebuilt when the
+    catalogue has changed
+
+    Parameters
+    ----------
+    catalogue_dir : str
+        Folder to save the catalogue to
+    meta : [NbMeta]
+        Notebook metadata
+    nb_root : str
+        Root folder the notebook paths are relative to
+
+    Returns
+    -------
+    bool
+        True if the catalogue was written, False if it was already up to date
+    """
+    os.makedirs(catalogue_dir, exist_ok=True)
+
+    records = catalogue_records(meta, nb_root)
+    jsonl_path = os.path.join(catalogue_dir, "notebooks.jsonl")
+    sqlite_path = os.path.join(catalogue_dir, "notebooks.sqlite")
+
+    if not save_catalogue_jsonl(jsonl_path, records) and os.path.isfile(sqlite_path):
+        return False
+
+    save_catalogue_sqlite(sqlite_path, records)
+
+    return True
@@ -4,6 +4,10 @@ class NbMeta:
     """
     Metadata associated with a notebook.
 
+    Derived, display only attributes are computed the first time they are accessed and then memoized. Only the
+    attributes passed to the constructor are pickled, which keeps instances small when they are sent across a
+    process pool or stored in the docgen manifest.
+
     Attributes
     ----------
 
@@ -11,10 +15,14 @@ class NbMeta:
         Relative folder path of the location of the notebook from the root of the repository
     filename : str
         Notebook filename
+    url_filename : str
+        URL quoted notebook filename
     title : str
         notebook title
-    description : str
+    raw_description : str
         Notebook description, taken from the short description of the docstring
+    description : str
+        Notebook description with new lines replaced by <br> for display in a markdown table
     features : [str]
         List of notebook features, taken from the attributes of the docstring
     formatted_features : str
@@ -22,6 +30,9 @@ class NbMeta:
 
     """
 
+    __slots__ = ("path", "filename", "title", "raw_description", "features",
+                 "_url_filename", "_description", "_formatted_features")
+
     def __init__(self, path: str, filename: str, title: str, description: str, features: [str]):
         """
         Parameters
@@ -40,11 +51,36 @@ class NbMeta:
 
         self.path = path
         self.filename = filename
-        self.url_filename = urllib.parse.quote(filename)
         self.title = title
-        self.description = description.replace("\n", "<br>") if description else description
+        self.raw_description = description
         self.features = features
-        self.formatted_features = ", ".join(self.features)
+
+    @property
+    def url_filename(self):
+        try:
+            return self._url_filename
+        except AttributeError:
+            self._url_filename = urllib.parse.quote(self.filename)
+            return self._url_filename
+
+    @property
+    def description(self):
+        try:
+            return self._description
+        except AttributeError:
+            self._description = self.raw_description.replace("\n", "<br>") if self.raw_description else self.raw_description
+            return self._description
+
+    @property
+    def formatted_features(self):
+        try:
+            return self._formatted_features
+        except AttributeError:
+            self._formatted_features = ", ".join(self.features)
+            return self._formatted_features
+
+    def __reduce__(self):
+        return NbMeta, (self.path, self.filename, self.title, self.raw_description, self.features)
 
     def __str__(self):
         return self.filename
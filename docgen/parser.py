@@ -1,25 +1,86 @@
+import argparse
 import chevron
+import chevron.tokenizer
 import docstring_parser as dp
-import itertools
+import fnmatch
+import hashlib
+import json
 import nbformat
 import os
-import urllib.parse
-import jupytext
+import pickle
+import time
+
+from concurrent.futures import ProcessPoolExecutor
 
 from pathlib import Path
 
+from catalogue import save_catalogue
 from nbmeta import NbMeta
 import re
 
+# Bump whenever the shape of the manifest or of NbMeta changes so stale caches are discarded
+MANIFEST_VERSION = 2
+
+# Files and folders never searched for notebooks, extended by the patterns in .docgenignore
+DEFAULT_IGNORE_PATTERNS = (".git", ".github", ".ipynb_checkpoints", "__pycache__", "data", "docgen", "img")
+
+# Notebooks are written with sorted keys, so the cell list is the first thing in the file
+NB_CELLS_START = re.compile(r'\s*\{\s*"cells"\s*:\s*\[\s*')
+
+# Size of the first read when streaming the first cell, doubled whenever the cell does not fit
+FIRST_CELL_READ_SIZE = 16 * 1024
+
+# Tokenized templates by path, along with the modification time they were read at
+_template_cache = {}
+
+# Notebook metadata matching what jupytext writes when converting Index.md, so the conversion round trip isn't needed
+INDEX_NOTEBOOK_METADATA = {
+    "jupytext": {"cell_metadata_filter": "-all", "main_language": "python", "notebook_metadata_filter": "-all"}
+}
+
+# Below this number of notebooks to (re)parse, the cost of starting a process pool outweighs the gain
+PARALLEL_THRESHOLD = 8
+
+
+def load_ignore_patterns(nb_root):
+    """
+    Loads the patterns of files and folders to skip when looking for notebooks. These are the default patterns
+    plus any listed, one per line, in a .docgenignore file in the root folder. Blank lines and lines starting
+    with # are ignored
+
+    Parameters
+    ----------
+    nb_root : str
+        Path to root folder containing notebooks to index
+
+    Returns
+    -------
+    [str]
+        Glob patterns matched against file and folder names and against paths relative to the root folder
+
+    """
+    patterns = list(DEFAULT_IGNORE_PATTERNS)
+    ignore_file = os.path.join(nb_root, ".docgenignore")
+
+    if os.path.isfile(ignore_file):
+        with open(ignore_file, "r") as f:
+            patterns.extend(line.strip().rstrip("/") for line in f if line.strip() and not line.startswith("#"))
 
-def find_nbs(nb_root):
+    return patterns
+
+
+def find_nbs(nb_root, ignore_patterns=None):
     """
-    Traverses a folder looking for all .ipynb files and return them via a generator
+    Traverses a folder looking for all .ipynb files and return them via a generator. Ignored folders are pruned
+    before they are descended into. Notebooks are returned in a stable order: alphabetically, with the notebooks
+    in a folder before those in its sub folders
 
     Parameters
     ----------
     nb_root : str
         Path to root folder containing notebooks to index
+    ignore_patterns : [str]
+        Glob patterns of files and folders to skip, defaults to the patterns returned by load_ignore_patterns
 
     Returns
     -------
@@ -27,11 +88,39 @@ def find_nbs(nb_root):
         Generator path to a discovered .ipynb file
 
     """
-    for root, dirs, files in os.walk(nb_root, topdown=False):
-        if ".ipynb_checkpoints" not in root and "docgen" not in root:
-            for name in files:
-                if name.lower().endswith(".ipynb"):
-                    yield os.path.join(root, name)
+    if ignore_patterns is None:
+        ignore_patterns = load_ignore_patterns(nb_root)
+
+    def is_ignored(name, rel_path):
+        return any(fnmatch.fnmatchcase(name, p) or fnmatch.fnmatchcase(rel_path, p) for p in ignore_patterns)
+
+    # depth first, pushing sub folders in reverse so they are popped in alphabetical order
+    folders = [(str(nb_root), "")]
+
+    while folders:
+        folder, rel_folder = folders.pop()
+
+        try:
+            with os.scandir(folder) as it:
+                entries = sorted(it, key=lambda e: e.name)
+        except OSError as e:
+            print(folder, f"x (unable to list folder: {e})")
+            continue
+
+        sub_folders = []
+
+        for entry in entries:
+            rel_path = rel_folder + entry.name
+
+            if is_ignored(entry.name, rel_path):
+                continue
+
+            if entry.is_dir(follow_symlinks=False):
+                sub_folders.append((entry.path, rel_path + "/"))
+            elif entry.name.lower().endswith(".ipynb"):
+                yield entry.path
+
+        folders.extend(reversed(sub_folders))
 
 
 def sanitize_docstring(raw_str):
@@ -54,7 +143,7 @@ def sanitize_docstring(raw_str):
         return stripped_str[3:-3]
 
 
-def nb_relative_path(abs_path):
+def nb_relative_path(abs_path, start=None):
     """
     Converts a full path to a relative path removing leading . directory navigation.
     Used for formatting for display
@@ -63,6 +152,8 @@ def nb_relative_path(abs_path):
     ----------
     abs_path : str
         Full path
+    start : str
+        Folder the path is made relative to, defaults to the current directory
 
     Returns
     -------
@@ -70,11 +161,51 @@ def nb_relative_path(abs_path):
         Relative path with directory navigation removed
 
     """
-    rel_path = os.path.relpath(os.path.dirname(abs_path))
+    rel_path = os.path.relpath(os.path.dirname(abs_path), start)
 
     return rel_path[3:] if rel_path.startswith("../") else rel_path
 
 
+def read_first_cell(nb_path):
+    """
+    Reads the first cell of a notebook without loading the rest of the file. The file is read in increasingly large
+    blocks until the first cell can be decoded, so the cost depends on the size of the first cell rather than on
+    the size of the notebook and its outputs.
+
+    Parameters
+    ----------
+    nb_path : str
+        Path to notebook file
+
+    Returns
+    -------
+    dict
+        The first cell as a dictionary, or None if the notebook has no cells or is not laid out as an nbformat 4
+        notebook with "cells" as its first key, in which case it should be read in full with nbformat
+
+    """
+    decoder = json.JSONDecoder()
+    read_size = FIRST_CELL_READ_SIZE
+
+    with open(nb_path, "r", encoding="utf-8") as f:
+        buffer = f.read(read_size)
+        start = NB_CELLS_START.match(buffer)
+
+        if start is None or buffer[start.end():start.end() + 1] in ("", "]"):
+            return None
+
+        while True:
+            try:
+                cell, _ = decoder.raw_decode(buffer, start.end())
+                return cell if isinstance(cell, dict) else None
+            except json.JSONDecodeError:
+                block = f.read(read_size)
+                if not block:
+                    return None
+                buffer += block
+                read_size *= 2
+
+
 def process_nb(nb_path):
     """
     Extracts metadata from a notebook. By convention the metadata must:
@@ -95,13 +226,21 @@ def process_nb(nb_path):
         Notebook metadata or None if unable to load metadata
 
     """
-    nb = nbformat.read(nb_path, as_version=4)
+    first_cell = read_first_cell(nb_path)
+
+    if first_cell is None:
+        # not laid out the way we expect, fall back to a full, validated read
+        nb = nbformat.read(nb_path, as_version=4)
+        first_cell = nb.cells[0] if len(nb.cells) > 0 else None
 
-    if len(nb.cells) < 1 or nb.cells[0].cell_type != "code":
+    if first_cell is None or first_cell.get("cell_type") != "code":
         print(nb_path, "x (cell 0 is not code)")
         return
 
-    potential_cleaned_str = re.findall('(""".*""")', nb.cells[0].source, re.DOTALL)
+    source = first_cell.get("source", "")
+    source = "".join(source) if isinstance(source, list) else source
+
+    potential_cleaned_str = re.findall('(""".*""")', source, re.DOTALL)
 
     if len(potential_cleaned_str) == 0:
         print(nb_path, "x (no string)")
@@ -123,29 +262,265 @@ def process_nb(nb_path):
     )
 
 
-def parse(nb_root):
+def file_digest(nb_path):
+    """
+    Computes the SHA-256 digest of a file's content
+
+    Parameters
+    ----------
+    nb_path : str
+        Path to the file
+
+    Returns
+    -------
+    str
+        Hex digest of the file content
+
+    """
+    digest = hashlib.sha256()
+    with open(nb_path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def load_manifest(manifest_path):
+    """
+    Loads the on-disk manifest of previously parsed notebooks
+
+    Parameters
+    ----------
+    manifest_path : str
+        Path to the manifest file
+
+    Returns
+    -------
+    dict
+        Dictionary of notebook path: manifest entry. Empty if the manifest is missing, unreadable or was written by
+        an incompatible version of docgen
+
+    """
+    try:
+        with open(manifest_path, "rb") as f:
+            manifest = pickle.load(f)
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        # a corrupt or incompatible cache only costs a full re-parse
+        print(f"ignoring unreadable manifest {manifest_path} ({e})")
+        return {}
+
+    if not isinstance(manifest, dict) or manifest.get("version") != MANIFEST_VERSION:
+        return {}
+
+    return manifest["entries"]
+
+
+def save_manifest(manifest_path, entries):
+    """
+    Saves the manifest of parsed notebooks, replacing any existing manifest atomically
+
+    Parameters
+    ----------
+    manifest_path : str
+        Path to the manifest file
+    entries : dict
+        Dictionary of notebook path: manifest entry
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(manifest_path)), exist_ok=True)
+    tmp_path = f"{manifest_path}.tmp"
+    with open(tmp_path, "wb") as f:
+        pickle.dump({"version": MANIFEST_VERSION, "entries": entries}, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, manifest_path)
+
+
+def process_nbs(nb_paths, workers=None):
+    """
+    Extracts metadata from a list of notebooks, spreading the work across a process pool when there are enough
+    notebooks to make it worthwhile
+
+    Parameters
+    ----------
+    nb_paths : [str]
+        Paths to notebook files
+    workers : int
+        Maximum number of worker processes, defaults to the number of CPUs. 1 forces serial processing
+
+    Returns
+    -------
+    [NbMeta]
+        Notebook metadata, or None where unable to load metadata, in the same order as nb_paths
+
+    """
+    if workers == 1 or len(nb_paths) < PARALLEL_THRESHOLD:
+        return [process_nb(nb) for nb in nb_paths]
+
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(process_nb, nb_paths, chunksize=max(1, len(nb_paths) // (4 * workers))))
+
+
+def parse(nb_root, manifest_path=None, workers=None):
     """
     Navigates a root folder to find all notebooks and extract their metadata where possible
 
+    When a manifest path is provided the parse is incremental: notebooks whose mtime and size, or failing that
+    content hash, match the manifest reuse their cached metadata and only new or changed notebooks are parsed.
+    The manifest is updated with the result.
+
     Parameters
     ----------
     nb_root : str
         Root folder containing notebooks
+    manifest_path : str
+        Optional path to the manifest used to cache metadata between runs
+    workers : int
+        Maximum number of worker processes used to parse notebooks, defaults to the number of CPUs
 
     Returns
     -------
     [NbMeta]
-        List of NbMeta for notebooks that metadata was extracted for
+        List of NbMeta for notebooks that metadata was extracted for, with paths relative to the root folder
 
     """
-    return [
-        meta for meta in
-        [process_nb(nb) for nb in find_nbs(nb_root)]
-        if meta is not None
-    ]
+    nb_paths = [str(nb) for nb in find_nbs(nb_root)]
+    cached = load_manifest(manifest_path) if manifest_path else {}
 
+    entries = {}
+    pending = []
 
-def build_doc(meta, template, generate_for_root_directory):
+    for nb in nb_paths:
+        stat = os.stat(nb)
+        entry = cached.get(nb)
+        digest = None
+
+        if entry is not None and (entry["mtime"], entry["size"]) != (stat.st_mtime_ns, stat.st_size):
+            # touched since the last run, only re-parse if the content has actually changed
+            digest = file_digest(nb)
+            entry = dict(entry, mtime=stat.st_mtime_ns, size=stat.st_size) if entry["sha256"] == digest else None
+
+        if entry is None:
+            entry = {
+                "mtime": stat.st_mtime_ns,
+                "size": stat.st_size,
+                "sha256": digest or file_digest(nb),
+                "meta": None
+            }
+            pending.append(nb)
+        entries[nb] = entry
+
+    for nb, meta in zip(pending, process_nbs(pending, workers)):
+        entries[nb]["meta"] = meta
+
+    for nb, entry in entries.items():
+        if entry["meta"] is not None:
+            # relative to the root rather than to wherever we are run from, so the catalogue can find the notebook
+            entry["meta"].path = nb_relative_path(nb, nb_root)
+
+    if manifest_path:
+        save_manifest(manifest_path, entries)
+
+    return [entries[nb]["meta"] for nb in nb_paths if entries[nb]["meta"] is not None]
+
+
+def load_template(template):
+    """
+    Loads and tokenizes a mustache template. Tokens are cached for the lifetime of the process and the template is
+    only re-read when its modification time changes
+
+    Parameters
+    ----------
+    template : str
+        Path to mustache template
+
+    Returns
+    -------
+    [tuple]
+        Template tokens, which can be passed to chevron.render in place of the template
+
+    """
+    template_path = os.path.abspath(template)
+    mtime = os.stat(template_path).st_mtime_ns
+    cached = _template_cache.get(template_path)
+
+    if cached is None or cached[0] != mtime:
+        with open(template_path, "r") as f:
+            cached = (mtime, list(chevron.tokenizer.tokenize(f.read())))
+        _template_cache[template_path] = cached
+
+    return cached[1]
+
+
+def group_nbs(meta):
+    """
+    Groups notebook metadata by path, ready for rendering
+
+    Parameters
+    ----------
+    meta : [NbMeta]
+        Notebook metadata
+
+    Returns
+    -------
+    [dict]
+        List of dictionaries of k: path, v: [NbMeta in the path sorted by filename], sorted by path
+    """
+
+    # group the notebooks by path in a single pass, input order does not matter
+    groups = {}
+    for m in meta:
+        groups.setdefault(m.path, []).append(m)
+
+    # sort by relative path, and the notebooks within each path alphabetically
+    return [{"k": path, "v": sorted(groups[path], key=lambda m: m.filename)} for path in sorted(groups)]
+
+
+def render_doc(nbs, tokens, link_prefix):
+    """
+    Renders a documentation index from grouped notebook metadata
+
+    Parameters
+    ----------
+    nbs : [dict]
+        Notebook metadata grouped by path, as returned by group_nbs
+    tokens : [tuple]
+        Template tokens, as returned by load_template
+    link_prefix : str
+        Prefix added to each path to link to the notebooks from the location of the generated index
+
+    Returns
+    -------
+    str
+        Generated documentation index
+    """
+    return chevron.render(tokens, {"paths": [dict(n, link=link_prefix + n["k"]) for n in nbs]})
+
+
+def build_docs(meta, template):
+    """
+    Generates the documentation indexes for the root and examples directories from a single grouping of the
+    metadata
+
+    Parameters
+    ----------
+    meta : [NbMeta]
+        Notebook metadata
+    template : str
+        Path to mustache template for generating output documentation index. The template accepts
+        a single variable 'path' containing a list of dictionaries of path: [NbMeta in the path]
+
+    Returns
+    -------
+    (str, str)
+        Generated documentation index for the root directory and for the examples directory
+    """
+    nbs = group_nbs(meta)
+    tokens = load_template(template)
+
+    return render_doc(nbs, tokens, ""), render_doc(nbs, tokens, "../")
+
+
+def build_doc(meta, template, generate_for_root_directory=True):
     """
     Generates a documentation index string given a list of metadata and mustache template
 
@@ -156,31 +531,48 @@ def build_doc(meta, template, generate_for_root_directory):
     template : str
         Path to mustache template for generating output documentation index. The template accepts
         a single variable 'path' containing a list of dictionaries of path: [NbMeta in the path]
+    generate_for_root_directory : bool
+        Whether the links are relative to the root directory or to the examples directory
 
     Returns
     -------
     str
         Generated documentation index
     """
+    return render_doc(group_nbs(meta), load_template(template), "" if generate_for_root_directory else "../")
+
+
+def index_notebook(doc):
+    """
+    Converts a documentation index to a notebook of markdown cells, splitting it wherever there are two or more
+    blank lines as jupytext does. Cell ids are derived from the cell content so that regenerating an unchanged
+    index produces an identical notebook
+
+    Parameters
+    ----------
+    doc : str
+        Documentation index
 
-    # 1. group the notebooks by path
-    # 2. convert to a list of dictionaries for mustache
-    # 3. sort the notebooks alphabetically
-    # note: [*values] converts the generator to a list
-    nbs = [{"k": key, "link": key if generate_for_root_directory else "../" + key, "v": sorted([*values], key=lambda m: m.filename)}
-           for key, values in itertools.groupby(meta, lambda m: m.path)]
+    Returns
+    -------
+    str
+        The notebook as JSON
+    """
+    text = doc[:-1] if doc.endswith("\n") else doc
+    cells = []
 
+    for i, source in enumerate(s for s in re.split(r"\n{3,}", text) if s.strip()):
+        cell_id = hashlib.sha1(f"{i}:{source}".encode("utf-8")).hexdigest()[:8]
+        cells.append(nbformat.v4.new_markdown_cell(source, id=cell_id))
 
-    # sort by relative path
-    nbs.sort(key=lambda n: n["k"])
+    nb = nbformat.v4.new_notebook(cells=cells, metadata=INDEX_NOTEBOOK_METADATA)
 
-    with open(template, 'r') as f:
-        return chevron.render(f, {'paths': nbs})
+    return nbformat.writes(nb) + "\n"
 
 
 def save_index_page(path, doc):
     """
-    Saves the documentation index to a file
+    Saves the documentation index to a file, unless the file already has exactly this content
 
     Parameters
     ----------
@@ -188,36 +580,165 @@ def save_index_page(path, doc):
         Path to save the documentation index to
     doc : str
         Documentation index
+
+    Returns
+    -------
+    bool
+        True if the file was written, False if it was already up to date
+    """
+    content = doc.encode("utf-8")
+
+    if os.path.isfile(path) and file_digest(path) == hashlib.sha256(content).hexdigest():
+        return False
+
+    with open(path, "wb") as file:
+        file.write(content)
+
+    return True
+
+
+def save_indexes(repo_root, doc_root, doc_examples):
+    """
+    Saves the documentation indexes for the root and examples directories, and the root index as a notebook.
+    Files whose content is unchanged are not rewritten
+
+    Parameters
+    ----------
+    repo_root : Path
+        Root of the repository
+    doc_root : str
+        Documentation index for the root directory
+    doc_examples : str
+        Documentation index for the examples directory
+
+    Returns
+    -------
+    bool
+        True if any of the files were written
     """
-    with open(path, "w") as file:
-        file.write(doc)
+    pages = [
+        (repo_root.joinpath("Index.md"), doc_root),
+        (repo_root.joinpath("examples", "README.md"), doc_examples),
+        (repo_root.joinpath("Index.ipynb"), index_notebook(doc_root)),
+    ]
+
+    written = False
+
+    for path, doc in pages:
+        if save_index_page(path, doc):
+            print(f"saving index to {path}")
+            written = True
+        else:
+            print(f"{path} is up to date")
+
+    return written
+
+
+def watched_state(nb_root, paths):
+    """
+    Takes a snapshot of the modification time and size of every notebook and of any additional files
+
+    Parameters
+    ----------
+    nb_root : str
+        Root folder containing notebooks
+    paths : [str]
+        Additional files, such as the template, whose changes should trigger a rebuild
+
+    Returns
+    -------
+    dict
+        Dictionary of path: (modification time, size)
+    """
+    state = {}
+    for path in [*find_nbs(nb_root), *paths]:
+        try:
+            stat = os.stat(path)
+            state[str(path)] = (stat.st_mtime_ns, stat.st_size)
+        except FileNotFoundError:
+            # deleted between being listed and being checked, it will be missing from the next snapshot
+            pass
+    return state
+
+
+def watch(repo_root, manifest_path, template, catalogue_dir, interval):
+    """
+    Polls the repository for added, changed or deleted notebooks and regenerates the indexes when they change.
+    Only the notebooks that were touched are re-parsed and the indexes are only saved when the rendered output
+    differs from the last one saved. Runs until interrupted
+
+    Parameters
+    ----------
+    repo_root : Path
+        Root of the repository
+    manifest_path : str
+        Path to the manifest used to cache metadata between runs
+    template : str
+        Path to mustache template
+    catalogue_dir : str
+        Folder to save the notebook catalogue to
+    interval : float
+        Number of seconds between polls
+    """
+    print(f"watching for changes to notebooks in {repo_root}, press Ctrl+C to stop")
+
+    last_state = None
+    last_docs = None
+
+    try:
+        while True:
+            state = watched_state(repo_root, [template, repo_root.joinpath(".docgenignore")])
+
+            if state != last_state:
+                meta = parse(nb_root=repo_root, manifest_path=manifest_path)
+                docs = build_docs(meta, template)
+
+                if docs != last_docs:
+                    save_indexes(repo_root, *docs)
+
+                if save_catalogue(catalogue_dir, meta, repo_root):
+                    print(f"saving catalogue to {catalogue_dir}")
+
+                last_state = state
+                last_docs = docs
+
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        print("stopped watching")
 
 
 def main():
-    repo_root = Path(__file__).parent.parent
-    doc_gen_root = repo_root.joinpath("docgen").resolve()
+    arg_parser = argparse.ArgumentParser(description="Generates the index of the notebooks in this repository")
+    arg_parser.add_argument("--watch", action="store_true",
+                            help="keep running and regenerate the index whenever a notebook changes")
+    arg_parser.add_argument("--interval", type=float, default=1.0, help="seconds between checks for changes in --watch mode")
+    arg_parser.add_argument("--catalogue-dir", help="folder to save the JSON Lines and SQLite notebook catalogue to, "
+                                                    "defaults to catalogue/ in the root of the repository")
+    args = arg_parser.parse_args()
+
+    repo_root = Path(__file__).parent.parent.resolve()
+    doc_gen_root = repo_root.joinpath("docgen")
     nb_root = repo_root
-    example_folder = repo_root.joinpath("examples").resolve()
+    manifest_path = doc_gen_root.joinpath(".cache", "manifest.pickle")
+    readme_template = doc_gen_root.joinpath("README.mustache")
+    catalogue_dir = args.catalogue_dir or repo_root.joinpath("catalogue")
 
+    if args.watch:
+        watch(repo_root, manifest_path, readme_template, catalogue_dir, args.interval)
+        return
 
     print(f"searching for notebooks in {nb_root}")
 
-    meta = parse(nb_root=nb_root)
-    readme_template = doc_gen_root.joinpath("README.mustache").resolve()
-    #doc for root  directory
-    doc_root = build_doc(meta, readme_template, True) 
-    #generate doc for examples directory
-    doc_examples = build_doc(meta, readme_template, False) 
-    readme_root = nb_root.joinpath("Index.md")
-    readmecopy_examples = example_folder.joinpath("README.md")
-
-    print(f"saving index to {readme_root} and to {readmecopy_examples}")
+    meta = parse(nb_root=nb_root, manifest_path=manifest_path)
+    #docs for root and examples directories
+    doc_root, doc_examples = build_docs(meta, readme_template)
 
-    save_index_page(readme_root, doc_root)
-    save_index_page(readmecopy_examples, doc_examples)
+    save_indexes(repo_root, doc_root, doc_examples)
 
-    ntbk = jupytext.read(readme_root)
-    formatted_ntbk = jupytext.write(ntbk, 'Index.ipynb')
+    if save_catalogue(catalogue_dir, meta, nb_root):
+        print(f"saving catalogue to {catalogue_dir}")
+    else:
+        print(f"{catalogue_dir} is up to date")
 
 
 if __name__ == "__main__":
@@ -1,12 +1,29 @@
+import json
 import os
+import pickle
+import shutil
+import sqlite3
+import tempfile
 import unittest
 from pathlib import Path
+from unittest import mock
+
+import nbformat
 
 from docgen import (
     NbMeta,
     build_doc,
+    build_docs,
+    find_nbs,
+    index_notebook,
+    load_template,
+    parse,
+    save_catalogue,
     process_nb,
-    nb_relative_path)
+    nb_relative_path,
+    read_first_cell,
+    save_index_page,
+    watched_state)
 
 from parameterized import parameterized
 
@@ -41,6 +58,57 @@ class DocGenTests(unittest.TestCase):
         meta = process_nb(nb)
         self.assertIsNone(meta)
 
+    @parameterized.expand(
+        [
+            "notebooks/markdown_cell.ipynb",
+            "notebooks/no_description.ipynb",
+            "notebooks/no_docstring.ipynb",
+            "notebooks/no_features.ipynb",
+            "notebooks/valid.ipynb"
+        ]
+    )
+    def test_read_first_cell(self, nb):
+        with mock.patch("docgen.parser.FIRST_CELL_READ_SIZE", 64):
+            cell = read_first_cell(nb)
+
+        with open(nb) as f:
+            expected = json.load(f)["cells"][0]
+
+        self.assertDictEqual(expected, cell)
+
+    def test_read_first_cell_unsorted_keys_falls_back_to_nbformat(self):
+        with open("notebooks/valid.ipynb") as f:
+            nb = json.load(f)
+
+        with tempfile.TemporaryDirectory() as nb_root:
+            nb_path = os.path.join(nb_root, "unsorted.ipynb")
+            with open(nb_path, "w") as f:
+                json.dump({"metadata": nb["metadata"], "nbformat": 4, "nbformat_minor": 0, "cells": nb["cells"]}, f)
+
+            self.assertIsNone(read_first_cell(nb_path))
+            self.assertEqual("Notebook title", process_nb(nb_path).title)
+
+    def test_nbmeta_derived_fields(self):
+        meta = NbMeta("a", "a b.ipynb", "title a", "line 1\nline 2", ["x", "y"])
+
+        self.assertEqual("a%20b.ipynb", meta.url_filename)
+        self.assertEqual("line 1<br>line 2", meta.description)
+        self.assertEqual("x, y", meta.formatted_features)
+        self.assertIs(meta.formatted_features, meta.formatted_features)
+        self.assertFalse(hasattr(meta, "__dict__"))
+
+    def test_nbmeta_pickles_constructor_fields_only(self):
+        meta = NbMeta("a", "a.ipynb", "title a", "line 1\nline 2", ["x", "y"])
+        meta.formatted_features
+
+        restored = pickle.loads(pickle.dumps(meta))
+
+        self.assertEqual(
+            (meta.path, meta.filename, meta.title, meta.description, meta.features),
+            (restored.path, restored.filename, restored.title, restored.description, restored.features)
+        )
+        self.assertNotIn(b"x, y", pickle.dumps(meta))
+
     def test_build_doc(self):
         meta = [
             NbMeta("a/b", "b.ipynb", "title ab", "des ab", ["a", "b"]),
@@ -52,12 +120,153 @@ class DocGenTests(unittest.TestCase):
 
         doc = build_doc(meta, template)
 
-        self.assertIn("| a.ipynb | title a | des a | a |", doc)
-        self.assertIn("| b.ipynb | title ab | des ab | a, b |", doc)
-        self.assertIn("| c.ipynb | title c | des c | c |",  doc)
+        self.assertIn("| [a.ipynb](<a/a.ipynb>) | title a | des a | a |", doc)
+        self.assertIn("| [b.ipynb](<a/b/b.ipynb>) | title ab | des ab | a, b |", doc)
+        self.assertIn("| [c.ipynb](<c/c.ipynb>) | title c | des c | c |",  doc)
 
         print(doc)
 
+    def test_build_docs(self):
+        meta = [
+            NbMeta("a/b", "b.ipynb", "title ab", "des ab", ["a", "b"]),
+            NbMeta("a", "a.ipynb", "title a", "des a", ["a"]),
+        ]
+
+        template = Path(__file__).parent.parent.joinpath("README.mustache")
+
+        doc_root, doc_examples = build_docs(meta, template)
+
+        self.assertEqual(build_doc(meta, template, True), doc_root)
+        self.assertEqual(build_doc(meta, template, False), doc_examples)
+        self.assertIn("| [b.ipynb](<../a/b/b.ipynb>) | title ab | des ab | a, b |", doc_examples)
+
+    def test_build_doc_groups_non_adjacent_notebooks(self):
+        meta = [
+            NbMeta("a", "z.ipynb", "title z", "des z", ["z"]),
+            NbMeta("c", "c.ipynb", "title c", "des c", ["c"]),
+            NbMeta("a", "a.ipynb", "title a", "des a", ["a"]),
+        ]
+
+        template = Path(__file__).parent.parent.joinpath("README.mustache")
+
+        doc = build_doc(meta, template)
+
+        self.assertEqual(1, doc.count("## a\n"))
+        self.assertLess(doc.index("[a.ipynb]"), doc.index("[z.ipynb]"))
+        self.assertLess(doc.index("## a\n"), doc.index("## c\n"))
+        self.assertEqual(doc, build_doc(list(reversed(meta)), template))
+
+    def test_load_template_reloads_changed_template(self):
+        with tempfile.TemporaryDirectory() as template_root:
+            template = os.path.join(template_root, "README.mustache")
+
+            with open(template, "w") as f:
+                f.write("{{#paths}}{{k}}{{/paths}}")
+            tokens = load_template(template)
+
+            self.assertIs(tokens, load_template(template))
+
+            with open(template, "w") as f:
+                f.write("{{#paths}}- {{k}}{{/paths}}")
+            os.utime(template, ns=(0, os.stat(template).st_mtime_ns + 1))
+
+            self.assertNotEqual(tokens, load_template(template))
+
+    def test_find_nbs_prunes_ignored_folders(self):
+        with tempfile.TemporaryDirectory() as nb_root:
+            for nb in ["b/z.ipynb", "b/a.ipynb", "a/c/x.ipynb", "a/y.IPYNB", "a/data/d.ipynb", "img/i.ipynb",
+                       "a/.ipynb_checkpoints/y-checkpoint.ipynb", "drafts/w.ipynb", "b/skip.ipynb", "b/notes.md"]:
+                Path(nb_root, nb).parent.mkdir(parents=True, exist_ok=True)
+                Path(nb_root, nb).touch()
+
+            with open(os.path.join(nb_root, ".docgenignore"), "w") as f:
+                f.write("# comment\n\ndrafts/\nb/skip.ipynb\n")
+
+            nbs = [os.path.relpath(nb, nb_root) for nb in find_nbs(nb_root)]
+
+            self.assertListEqual(["a/y.IPYNB", "a/c/x.ipynb", "b/a.ipynb", "b/z.ipynb"], nbs)
+
+    def test_watched_state_changes_when_notebook_touched(self):
+        with tempfile.TemporaryDirectory() as nb_root:
+            shutil.copytree(Path(__file__).parent.joinpath("notebooks"), os.path.join(nb_root, "notebooks"))
+            template = Path(__file__).parent.parent.joinpath("README.mustache")
+
+            state = watched_state(nb_root, [template])
+
+            self.assertEqual(state, watched_state(nb_root, [template]))
+
+            os.utime(os.path.join(nb_root, "notebooks", "valid.ipynb"), ns=(0, 0))
+
+            self.assertNotEqual(state, watched_state(nb_root, [template]))
+
+    def test_save_index_page_skips_unchanged_content(self):
+        with tempfile.TemporaryDirectory() as doc_root:
+            path = os.path.join(doc_root, "Index.md")
+
+            self.assertTrue(save_index_page(path, "# Index\n"))
+            os.utime(path, ns=(0, 0))
+
+            self.assertFalse(save_index_page(path, "# Index\n"))
+            self.assertEqual(0, os.stat(path).st_mtime_ns)
+
+            self.assertTrue(save_index_page(path, "# Changed index\n"))
+
+    def test_index_notebook(self):
+        doc = "# Index\n\n| a | b |\n\n\n| :warning: |\n| --- |\n\n"
+
+        nb = nbformat.reads(index_notebook(doc), as_version=4)
+
+        self.assertListEqual(["# Index\n\n| a | b |", "| :warning: |\n| --- |\n"], [c.source for c in nb.cells])
+        self.assertEqual(index_notebook(doc), index_notebook(doc))
+
+    def test_save_catalogue(self):
+        with tempfile.TemporaryDirectory() as nb_root:
+            shutil.copytree(Path(__file__).parent.joinpath("notebooks"), os.path.join(nb_root, "notebooks"))
+            catalogue_dir = os.path.join(nb_root, "catalogue")
+            meta = [
+                NbMeta("notebooks", "valid.ipynb", "title v", "des v", ["properties", "transaction config"]),
+                NbMeta("notebooks", "no_features.ipynb", "title n", "des n", []),
+            ]
+
+            self.assertTrue(save_catalogue(catalogue_dir, meta, nb_root))
+            self.assertFalse(save_catalogue(catalogue_dir, meta, nb_root))
+
+            with open(os.path.join(catalogue_dir, "notebooks.jsonl")) as f:
+                records = [json.loads(line) for line in f]
+
+            self.assertListEqual(["notebooks/no_features.ipynb", "notebooks/valid.ipynb"], [r["path"] for r in records])
+            self.assertEqual(os.path.getsize(os.path.join(nb_root, "notebooks", "valid.ipynb")), records[1]["size"])
+
+            connection = sqlite3.connect(os.path.join(catalogue_dir, "notebooks.sqlite"))
+            try:
+                rows = connection.execute(
+                    "SELECT n.path FROM notebooks n JOIN features f ON f.notebook_id = n.id WHERE f.feature = ?",
+                    ("properties",)
+                ).fetchall()
+            finally:
+                connection.close()
+
+            self.assertListEqual([("notebooks/valid.ipynb",)], rows)
+
+    def test_save_catalogue_from_another_folder(self):
+        with tempfile.TemporaryDirectory() as nb_root, tempfile.TemporaryDirectory() as cwd:
+            shutil.copytree(Path(__file__).parent.joinpath("notebooks"), os.path.join(nb_root, "notebooks"))
+            catalogue_dir = os.path.join(nb_root, "catalogue")
+
+            previous_cwd = os.getcwd()
+            os.chdir(cwd)
+            try:
+                meta = parse(nb_root, workers=1)
+                self.assertTrue(save_catalogue(catalogue_dir, meta, nb_root))
+            finally:
+                os.chdir(previous_cwd)
+
+            with open(os.path.join(catalogue_dir, "notebooks.jsonl")) as f:
+                records = [json.loads(line) for line in f]
+
+            self.assertIn("notebooks/valid.ipynb", [r["path"] for r in records])
+            self.assertTrue(all(r["folder"] == "notebooks" for r in records))
+
     def test_nb_relative_path_with_relative_path(self):
 
         nb_root = Path(__file__).parent.parent.joinpath("examples").joinpath("use-cases").joinpath("ibor").joinpath("notebook.ipynb")
@@ -71,6 +280,40 @@ class DocGenTests(unittest.TestCase):
 
         self.assertEqual("examples/use-cases/ibor", rel_path)
 
+    def test_parse_incremental_reuses_unchanged_notebooks(self):
+        with tempfile.TemporaryDirectory() as nb_root:
+            shutil.copytree(Path(__file__).parent.joinpath("notebooks"), os.path.join(nb_root, "notebooks"))
+            manifest_path = os.path.join(nb_root, ".cache", "manifest.pickle")
+
+            cold = parse(nb_root, manifest_path=manifest_path, workers=1)
+
+            with mock.patch("docgen.parser.process_nb", wraps=process_nb) as process:
+                warm = parse(nb_root, manifest_path=manifest_path, workers=1)
+                process.assert_not_called()
+
+            self.assertListEqual([(m.filename, m.title) for m in cold], [(m.filename, m.title) for m in warm])
+
+    def test_parse_incremental_reparses_changed_notebooks(self):
+        with tempfile.TemporaryDirectory() as nb_root:
+            shutil.copytree(Path(__file__).parent.joinpath("notebooks"), os.path.join(nb_root, "notebooks"))
+            manifest_path = os.path.join(nb_root, ".cache", "manifest.pickle")
+            changed = os.path.join(nb_root, "notebooks", "valid.ipynb")
+            touched = os.path.join(nb_root, "notebooks", "no_features.ipynb")
+
+            parse(nb_root, manifest_path=manifest_path, workers=1)
+
+            with open(changed) as f:
+                content = f.read().replace("Notebook title", "Changed title")
+            with open(changed, "w") as f:
+                f.write(content)
+            os.utime(touched)
+
+            with mock.patch("docgen.parser.process_nb", wraps=process_nb) as process:
+                meta = parse(nb_root, manifest_path=manifest_path, workers=1)
+                process.assert_called_once_with(changed)
+
+            self.assertIn("Changed title", [m.title for m in meta])
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -1,10 +1,19 @@
 # Import modules
 import os
+import sys
 import lusid as lu
 import lusid.models as lm
 import pandas as pd
 from lusidjam import RefreshingToken
 
+# The shared helpers are in the lusid_samples package, in the use-cases folder above this one
+_use_cases = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _use_cases not in sys.path:
+    sys.path.append(_use_cases)
+
+from lusid_samples.api_registry import registry_for
+from lusid_samples.identifiers import resolver_for
+
 # Set the secrets path
 secrets_path = os.getenv("FBN_SECRETS_PATH")
 
@@ -13,18 +22,13 @@ api_factory = lu.utilities.ApiClientFactory(
     token=RefreshingToken(), api_secrets_filename=secrets_path
 )
 
-aggregation_api = api_factory.build(lu.AggregationApi)
-quotes_api = api_factory.build(lu.QuotesApi)
-instruments_api = api_factory.build(lu.api.InstrumentsApi)
+aggregation_api = registry_for(api_factory).build(lu.AggregationApi)
+quotes_api = registry_for(api_factory).build(lu.QuotesApi)
 
 
 def figi_to_lusid(figi):
 
-    instrument = instruments_api.get_instrument(
-        identifier_type="Figi", identifier=figi
-    )
-
-    return instrument.lusid_instrument_id
+    return resolver_for(api_factory).luid(figi)
 
 
 def load_eod_prices(scope):
@@ -40,16 +44,16 @@ def load_eod_prices(scope):
         ("2018-05-20T23:00:00Z", "BBG00HPSG933", 44.66),
     ]
 
+    # Look up the LUIDs of every FIGI in one request, rather than one request per quote
+    luids = resolver_for(api_factory).resolve([quote[1] for quote in quotes])
+
     # Create quotes request
 
-    for quote in quotes:
+    for quote, luid in zip(quotes, luids):
 
         effective_date = quote[0]
-        figi = quote[1]
         price = quote[2]
 
-        luid = figi_to_lusid(figi)
-
         instrument_quotes = {
             "quotes_1": lm.UpsertQuoteRequest(
                 quote_id=lm.QuoteId(
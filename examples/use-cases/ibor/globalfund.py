@@ -1,20 +1,22 @@
 # Import Libraries
-import pprint
-from datetime import datetime, timedelta, time, date
-import pytz
-import uuid
-import printer as prettyprint
-from datetime import datetime
-import pandas as pd
-import numpy as np
 import os
-import json
-import time
+import sys
+from datetime import datetime, timedelta
+
+# The shared helpers are in the lusid_samples package, in the use-cases folder above this one
+_use_cases = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _use_cases not in sys.path:
+    sys.path.append(_use_cases)
+
+import printer as prettyprint
+from lusid_samples import lazy_import
+from lusid_samples.api_registry import registry_for
 
-# Import LUSID
-import lusid
-import lusid.models as models
-import lusid_sample_data as import_data
+# Import LUSID, pandas and pytz only when a helper first uses them, so that importing the helpers is quick
+lusid = lazy_import('lusid')
+models = lazy_import('lusid.models')
+pd = lazy_import('pandas')
+pytz = lazy_import('pytz')
 
 globals = {}
 recipe_scope = "market_value"
@@ -81,7 +83,7 @@ def valuation(api_factory, marketdata_scope, portfolio_group, time):
         ),
     )
 
-    upsert_configuration_recipe_response = api_factory.build(
+    upsert_configuration_recipe_response = registry_for(api_factory).build(
         lusid.api.ConfigurationRecipeApi
     ).upsert_configuration_recipe(
         upsert_recipe_request=models.UpsertRecipeRequest(
@@ -114,7 +116,7 @@ def valuation(api_factory, marketdata_scope, portfolio_group, time):
     )
 
     # Perform a valuation
-    response = api_factory.build(lusid.api.AggregationApi).get_valuation(
+    response = registry_for(api_factory).build(lusid.api.AggregationApi).get_valuation(
         valuation_request=valuation_request
     )
 
@@ -141,7 +143,7 @@ def create_portfolio_group(api_factory, scope, code, portfolios):
     portfolio_creation_date = datetime.now(pytz.UTC) - timedelta(days=5000)
 
     try:
-        api_factory.build(lusid.api.PortfolioGroupsApi).delete_portfolio_group(
+        registry_for(api_factory).build(lusid.api.PortfolioGroupsApi).delete_portfolio_group(
             scope=scope, code=code
         )
     except:
@@ -156,7 +158,7 @@ def create_portfolio_group(api_factory, scope, code, portfolios):
         created=portfolio_creation_date,
     )
 
-    portfolio_group = api_factory.build(
+    portfolio_group = registry_for(api_factory).build(
         lusid.api.PortfolioGroupsApi
     ).create_portfolio_group(scope=scope, create_portfolio_group_request=group_request)
 
@@ -237,7 +239,7 @@ def upsert_quotes(
         )
 
     # Upsert the quotes into LUSID
-    response = api_factory.build(lusid.api.QuotesApi).upsert_quotes(
+    response = registry_for(api_factory).build(lusid.api.QuotesApi).upsert_quotes(
         scope=scope, request_body=instrument_quotes
     )
 
@@ -265,7 +267,7 @@ def create_portfolios(api_factory, scopes, code, currency):
     for scope in scopes:
 
         try:
-            api_factory.build(lusid.api.PortfoliosApi).delete_portfolio(
+            registry_for(api_factory).build(lusid.api.PortfoliosApi).delete_portfolio(
                 scope=scope, code=code
             )
         except lusid.ApiException as e:
@@ -281,7 +283,7 @@ def create_portfolios(api_factory, scopes, code, currency):
         )
 
         # Call LUSID to create your portfolio
-        response = api_factory.build(
+        response = registry_for(api_factory).build(
             lusid.api.TransactionPortfoliosApi
         ).create_portfolio(
             scope=scope,
@@ -344,10 +346,10 @@ def create_cut_labels(api_factory, exchange_names, cut_label_type):
     for exchange in exchange_names:
         exchange_code = exchange + "_" + cut_label_type
         try:
-            response = api_factory.build(
+            response = registry_for(api_factory).build(
                 lusid.api.CutLabelDefinitionsApi
             ).get_cut_label_definition(code=exchange_code)
-            response = api_factory.build(
+            response = registry_for(api_factory).build(
                 lusid.api.CutLabelDefinitionsApi
             ).delete_cut_label_definition(code=exchange_code)
         except lusid.ApiException as e:
@@ -368,7 +370,7 @@ def create_cut_labels(api_factory, exchange_names, cut_label_type):
             time_zone=exchange_info[exchange]["time_zone"],
         )
         try:
-            response = api_factory.build(
+            response = registry_for(api_factory).build(
                 lusid.api.CutLabelDefinitionsApi
             ).create_cut_label_definition(create_cut_label_definition_request=request)
             responses.append(response)
@@ -1,49 +1,51 @@
 # Import Libraries
-import pprint
-from datetime import datetime, timedelta, time
-import pytz
-import printer as prettyprint
-import pandas as pd
+import os
+import sys
+from datetime import datetime, timedelta
+
+# The shared helpers are in the lusid_samples package, in the use-cases folder above this one
+_use_cases = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _use_cases not in sys.path:
+    sys.path.append(_use_cases)
 
-# Import LUSID
-import lusid
-import lusid.models as models
+import printer as prettyprint
 import lusid_sample_data as import_data
+from lusid_samples import lazy_import
+from lusid_samples.api_registry import registry_for
+from lusid_samples.identifiers import resolver_for
+
+# Import LUSID, pandas and pytz only when a helper first uses them, so that importing the helpers is quick
+bulk = lazy_import('lusid_samples.bulk')
+lusid = lazy_import('lusid')
+models = lazy_import('lusid.models')
+pd = lazy_import('pandas')
+pytz = lazy_import('pytz')
 
 recipe_scope = "market_value"
 recipe_code = "helper-functions"
 
 
 def delete_all_current_instruments(api_factory):
-    response = api_factory.build(lusid.api.InstrumentsApi).list_instruments()
-    if len(response.values) == 0:
+    # Delete every instrument, across all pages of the listing
+    results = bulk.delete_instruments(api_factory)
+    if len(results) == 0:
         print('No previous existing instruments')
         return None
-    for ii in range(len(response.values)):
-        identifierTypes=[]
-        identifier=[]
-        IDs = response.values[ii].identifiers.keys()
-        for key in IDs:
-            identifierTypes.append(key)
-            identifier.append(response.values[ii].identifiers[key])
-        print(identifierTypes)
-        print(identifier)
-        deleted = api_factory.build(lusid.api.InstrumentsApi).delete_instrument(identifierTypes[0], identifier[0])
-        print(deleted)
+    prettyprint.delete_results(
+        results,
+        'Instruments',
+        lambda instrument: '{} ({})'.format(instrument.name, instrument.lusid_instrument_id))
 
 def delete_all_current_portfolios(api_factory):
     # delete ALL existing scopes
-    response = api_factory.build(lusid.api.PortfoliosApi).list_portfolios()
-    if len(response.values) == 0:
+    results = bulk.delete_portfolios(api_factory)
+    if len(results) == 0:
         print('No previous existing portfolios')
         return None
-    for ii in range(len(response.values)):
-        code = response.values[ii].id.code
-        scope = response.values[ii].id.scope 
-        print('Deleting:')
-        print('Code: {} \nScope: {}'.format(code, scope))
-        api_factory.build(lusid.api.PortfoliosApi).delete_portfolio(scope, code)
-        print('All scopes deleted')
+    prettyprint.delete_results(
+        results,
+        'Portfolios',
+        lambda portfolio: 'Scope: {} Code: {}'.format(portfolio.id.scope, portfolio.id.code))
 
 def create_analyst_scope():
     # Fetch our scopes
@@ -53,33 +55,36 @@ def create_analyst_scope():
     return analyst_scope_code
 
 def batch_upsert(instrument_universe, api_factory):
+    # Set our identifier columns
+    identifier_columns = [
+            ('isin', 'Isin'), 
+            ('figi', 'Figi'), 
+            ('ticker', 'Ticker'),
+            ('sedol', 'Sedol'),
+            ('client_internal', 'ClientInternal')
+    ]
+
+    # Read each column once, rather than every instrument row by row
+    instrument_names = instrument_universe['instrument_name'].tolist()
+    identifier_values = [(lusid_name, instrument_universe[column].tolist())
+                         for column, lusid_name in identifier_columns]
+
     # Initialise our batch upsert request
     batch_upsert_request = {}
-    # Iterate over our instrument universe
-    for row, instrument in instrument_universe.iterrows():
-
-        # Set our identifier columns
-        identifier_columns = [
-                ('isin', 'Isin'), 
-                ('figi', 'Figi'), 
-                ('ticker', 'Ticker'),
-                ('sedol', 'Sedol'),
-                ('client_internal', 'ClientInternal')
-        ]
+    for position, instrument_name in enumerate(instrument_names):
 
         # Create our identifiers
-        identifiers = {}
-        for identifier in identifier_columns:
-            identifiers[identifier[1]] = models.InstrumentIdValue(
-                value=instrument[identifier[0]])
+        identifiers = {
+            lusid_name: models.InstrumentIdValue(value=values[position])
+            for lusid_name, values in identifier_values}
 
         # Add the instrument to our batch request using the FIGI as the main unique identifier
-        batch_upsert_request[instrument['instrument_name']] = models.InstrumentDefinition(
-            name=instrument['instrument_name'],
+        batch_upsert_request[instrument_name] = models.InstrumentDefinition(
+            name=instrument_name,
             identifiers=identifiers)
 
-    # Call LUSID to upsert our batch
-    instrument_response = api_factory.build(lusid.api.InstrumentsApi).upsert_instruments(request_body=batch_upsert_request)
+    # Call LUSID to upsert our batch, split into requests sent concurrently for large universes
+    instrument_response = bulk.upsert_instruments(api_factory, batch_upsert_request)
 
     # Pretty print the response from LUSID
     prettyprint.instrument_response(instrument_response, identifier='Figi')
@@ -97,7 +102,7 @@ def request_transaction_portfolio_creation(portfolio_code, portfolio_creation_da
         created=portfolio_creation_date)
 
     # Call LUSID to create our portfolio
-    portfolio_response = api_factory.build(lusid.api.TransactionPortfoliosApi).create_portfolio(
+    portfolio_response = registry_for(api_factory).build(lusid.api.TransactionPortfoliosApi).create_portfolio(
         scope=analyst_scope_code,
         create_transaction_portfolio_request=transaction_portfolio_request)
 
@@ -115,7 +120,7 @@ def request_reference_portfolio_creation(reference_portfolio_code, portfolio_cre
         created=portfolio_creation_date)
 
     # Call LUSID to create our reference portfolio
-    portfolio_response = api_factory.build(lusid.api.ReferencePortfolioApi).create_reference_portfolio(
+    portfolio_response = registry_for(api_factory).build(lusid.api.ReferencePortfolioApi).create_reference_portfolio(
         scope=analyst_scope_code,
         create_reference_portfolio_request=reference_portfolio_request)
 
@@ -142,7 +147,7 @@ def populate_with_cash(holdings_effective_date, initial_cash_balance, analyst_sc
     ]
 
     # Call LUSID to set our initial cash balance
-    set_holdings_response = api_factory.build(lusid.api.TransactionPortfoliosApi).set_holdings(
+    set_holdings_response = registry_for(api_factory).build(lusid.api.TransactionPortfoliosApi).set_holdings(
         scope=analyst_scope_code,
         code=transaction_portfolio_code,
         effective_at=holdings_effective_date,
@@ -180,7 +185,7 @@ def upsert_constituents(instrument_market_cap, holdings_effective_date, analyst_
         constituents=constituents)
 
     # Call LUSID to upsert our constituents into our reference portfolio
-    response = api_factory.build(lusid.api.ReferencePortfolioApi).upsert_reference_portfolio_constituents(
+    response = registry_for(api_factory).build(lusid.api.ReferencePortfolioApi).upsert_reference_portfolio_constituents(
         scope=analyst_scope_code,
         code=reference_portfolio_code,
         upsert_reference_portfolio_constituents_request=constituents_request)
@@ -200,7 +205,7 @@ def request_define_property(domain, scope, code, display_name, api_factory):
     )
 
     # Call LUSID to create our new property
-    property_response = api_factory.build(lusid.api.PropertyDefinitionsApi).create_property_definition(
+    property_response = registry_for(api_factory).build(lusid.api.PropertyDefinitionsApi).create_property_definition(
         create_property_definition_request=property_request)
 
     # Grab the key off the response to use when referencing this property in other LUSID calls
@@ -210,61 +215,88 @@ def request_define_property(domain, scope, code, display_name, api_factory):
     prettyprint.heading('Strategy Property Key: ', strategy_property_key)
     return strategy_property_key
     
-def upsert_trades(analyst_transactions, strategy_property_key, scope, portfolio_code, api_factory):
-    # Initialise a list to hold our transactions
-    batch_transaction_requests = []
-
-    # Iterate over the transactions for each portfolio
-    for index, transaction in analyst_transactions.iterrows():
-
-        if 'Cash' in transaction['instrument_name']:
-            identifier_key = 'Instrument/default/Currency'
-        else:
-            identifier_key = 'Instrument/default/Figi'
-
-        batch_transaction_requests.append(
-            models.TransactionRequest(
-                transaction_id=transaction['transaction_id'],
-                type=transaction['type'],
-                instrument_identifiers={
-                    identifier_key: transaction['instrument_uid']},
-                transaction_date=transaction['transaction_date'],
-                settlement_date=transaction['settlement_date'],
-                units=transaction['units'],
-                transaction_price=models.TransactionPrice(
-                    price=transaction['transaction_price'],
-                    type='Price'),
-                total_consideration=models.CurrencyAndAmount(
-                    amount=transaction['total_cost'],
-                    currency=transaction['transaction_currency']),
-                source='Client',
-                transaction_currency=transaction['transaction_currency'],
-                properties={
+def trade_requests(analyst_transactions, strategy_property_key):
+    # Accept a single DataFrame or an iterator of chunks of one, such as pd.read_csv(..., chunksize=...)
+    if isinstance(analyst_transactions, pd.DataFrame):
+        analyst_transactions = [analyst_transactions]
+
+    # Each strategy's property is only created once and shared by its transactions
+    strategy_properties = {}
+
+    for transactions in analyst_transactions:
+
+        # Read each column once, rather than every transaction row by row
+        identifier_keys = [
+            'Instrument/default/Currency' if 'Cash' in instrument_name else 'Instrument/default/Figi'
+            for instrument_name in transactions['instrument_name'].tolist()]
+
+        columns = zip(
+            transactions['transaction_id'].tolist(),
+            transactions['type'].tolist(),
+            identifier_keys,
+            transactions['instrument_uid'].tolist(),
+            transactions['transaction_date'].tolist(),
+            transactions['settlement_date'].tolist(),
+            transactions['units'].tolist(),
+            transactions['transaction_price'].tolist(),
+            transactions['total_cost'].tolist(),
+            transactions['transaction_currency'].tolist(),
+            transactions['strategy'].tolist())
+
+        for (transaction_id, transaction_type, identifier_key, instrument_uid, transaction_date, settlement_date,
+             units, transaction_price, total_cost, transaction_currency, strategy) in columns:
+
+            if strategy not in strategy_properties:
+                strategy_properties[strategy] = {
                     strategy_property_key:
                         models.PerpetualProperty(
                             key=strategy_property_key,
-                            value=models.PropertyValue(label_value=transaction['strategy']) 
+                            value=models.PropertyValue(label_value=strategy)
                         )
                 }
+
+            yield models.TransactionRequest(
+                transaction_id=transaction_id,
+                type=transaction_type,
+                instrument_identifiers={
+                    identifier_key: instrument_uid},
+                transaction_date=transaction_date,
+                settlement_date=settlement_date,
+                units=units,
+                transaction_price=models.TransactionPrice(
+                    price=transaction_price,
+                    type='Price'),
+                total_consideration=models.CurrencyAndAmount(
+                    amount=total_cost,
+                    currency=transaction_currency),
+                source='Client',
+                transaction_currency=transaction_currency,
+                properties=strategy_properties[strategy]
             )
-        )
 
-    # Call LUSID to upsert our transactions
-    transaction_response = api_factory.build(lusid.api.TransactionPortfoliosApi).upsert_transactions(
-        scope=scope,
-        code=portfolio_code,
-        transaction_request=batch_transaction_requests)
+def upsert_trades(analyst_transactions, strategy_property_key, scope, portfolio_code, api_factory,
+                  batch_size=bulk.TRANSACTION_BATCH_SIZE, max_workers=None):
+    # Call LUSID to upsert our transactions, building and sending them a batch at a time so that the
+    # transactions can be streamed in from a file of any size
+    reports = bulk.upsert_transactions(
+        api_factory,
+        scope,
+        portfolio_code,
+        trade_requests(analyst_transactions, strategy_property_key),
+        batch_size=batch_size,
+        max_workers=max_workers)
 
     # Pretty print the response from LUSID
-    prettyprint.transactions_response(
-        transaction_response,
-        scope, 
-        portfolio_code)
+    if len(reports) == 1 and reports[0].error is None:
+        prettyprint.transactions_response(
+            reports[0].response,
+            scope, 
+            portfolio_code)
+    else:
+        prettyprint.batch_reports(reports, scope, portfolio_code)
 
 def get_figi_LUID(instrument, api_factory):
-    luid = api_factory.build(lusid.api.InstrumentsApi).get_instrument(
-        identifier_type='Figi',
-        identifier=instrument['figi']).lusid_instrument_id
+    luid = resolver_for(api_factory).luid(instrument['figi'])
     return luid
 
 def create_instrument_quotes(quotes_effective_date, today, instrument_prices, analyst_scope_code, api_factory):
@@ -277,15 +309,12 @@ def create_instrument_quotes(quotes_effective_date, today, instrument_prices, an
     instrument_quotes = {}
 
     # Create prices for all instruments except cash
-    for index, instrument in instrument_prices.iterrows():
+    instrument_prices = instrument_prices[~instrument_prices['instrument_name'].str.contains('Cash', regex=False, na=False)]
 
-        if 'Cash' in instrument['instrument_name']:
-            continue
+    # Get our Lusid Instrument Ids, in one request rather than one per instrument
+    luids = resolver_for(api_factory).resolve(instrument_prices['figi'])
 
-        # Get our Lusid Instrument Id
-        luid = api_factory.build(lusid.api.InstrumentsApi).get_instrument(
-            identifier_type='Figi',
-            identifier=instrument['figi']).lusid_instrument_id
+    for luid, (index, instrument) in zip(luids, instrument_prices.iterrows()):
 
         instrument_quotes[luid + str(quotes_effective_date)] = models.UpsertQuoteRequest(
             quote_id=models.QuoteId(
@@ -321,7 +350,7 @@ def create_instrument_quotes(quotes_effective_date, today, instrument_prices, an
             lineage='InternalSystem'
         )
 
-    response = api_factory.build(lusid.api.QuotesApi).upsert_quotes(
+    response = registry_for(api_factory).build(lusid.api.QuotesApi).upsert_quotes(
         scope=analyst_scope_code,
         request_body=instrument_quotes
     )
@@ -333,7 +362,7 @@ def setup_index(analyst_scope_code, reference_portfolio_code, instrument_prices,
     # Set an arbitary index level to start our index with
     index_level = 1000
     # Call LUSID - get the constituents of our index from our reference portfolio
-    constituents = api_factory.build(lusid.api.ReferencePortfolioApi).get_reference_portfolio_constituents(
+    constituents = registry_for(api_factory).build(lusid.api.ReferencePortfolioApi).get_reference_portfolio_constituents(
         scope=analyst_scope_code,
         code=reference_portfolio_code,
         effective_at=datetime.now(pytz.UTC))
@@ -342,13 +371,12 @@ def setup_index(analyst_scope_code, reference_portfolio_code, instrument_prices,
     # Get our weights from the constituents into a better format to work with
     weights = {constituent.instrument_uid:constituent.weight for constituent in constituents.constituents}
 
+    # Get our Lusid Instrument IDs, in one request rather than one per instrument
+    luids = resolver_for(api_factory).resolve(instrument_prices['figi'])
+
     # Iterate over our pricing analytics
-    for index, instrument in instrument_prices.iterrows():
+    for Luid, (index, instrument) in zip(luids, instrument_prices.iterrows()):
 
-        # Get our Lusid Instrument ID
-        Luid = api_factory.build(lusid.api.InstrumentsApi).get_instrument(
-            identifier_type='Figi',
-            identifier=instrument['figi']).lusid_instrument_id
         # Get the initial price for each constituent of the index from our analytics store
         inception_price = instrument['price_original']
         # Work out how much of the index this constituent should make up using its w
@@ -0,0 +1,27 @@
+"""
+Helpers shared by the use case notebooks: loading the sample data files (lusid_sample_data), printing LUSID
+responses (printer), building each LUSID api once per api factory (api_registry), sending large requests in
+concurrent batches (bulk), resolving instrument identifiers to LUIDs (identifiers) and generating sample data at
+volume (sample_data_generator).
+
+Submodules are only imported when first used, so importing the package is cheap. Each use case folder has
+small lusid_sample_data.py and printer.py shims, so notebooks can keep importing them by name. lazy_import lets
+the helpers in the use case folders defer their own heavy imports in the same way.
+"""
+import importlib
+
+from ._lazy import lazy_import
+
+_SUBMODULES = ["api_registry", "bulk", "identifiers", "lusid_sample_data", "printer", "sample_data_generator"]
+
+__all__ = _SUBMODULES + ["lazy_import"]
+
+
+def __getattr__(name):
+    if name in _SUBMODULES:
+        return importlib.import_module(f".{name}", __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,117 @@
+"""
+Deferred imports for the sample helpers. pandas, numpy and lusid take most of a second to import, which
+notebooks that only need create_scope_id or printer.heading should not have to pay for.
+"""
+import importlib
+import sys
+import threading
+import types
+
+# Callbacks waiting for a module to be imported, keyed by module name
+_import_hooks = {}
+_lock = threading.RLock()
+
+
+class LazyModule(types.ModuleType):
+    """
+    Stands in for a module and imports it the first time one of its attributes is used. The module's
+    attributes are then copied onto the stand in, so later lookups cost the same as on the module itself.
+    """
+
+    def __init__(self, name):
+        super().__init__(name)
+
+    def __getattr__(self, attr):
+        module = importlib.import_module(self.__name__)
+        self.__dict__.update(module.__dict__)
+        return getattr(module, attr)
+
+
+def lazy_import(name):
+    """
+    Returns a module without importing it until it is first used
+
+    Parameters
+    ----------
+    name : str
+        Name of the module
+
+    Returns
+    -------
+    module
+        The module itself if it is already imported, otherwise a LazyModule standing in for it
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    return LazyModule(name)
+
+
+def when_imported(name, callback):
+    """
+    Calls a function with a module once the module has been imported, by anyone. The function is called
+    straight away if the module is already imported.
+
+    Parameters
+    ----------
+    name : str
+        Name of the module
+    callback : callable
+        Function taking the module
+    """
+    with _lock:
+        module = sys.modules.get(name)
+        if module is None:
+            _import_hooks.setdefault(name, []).append(callback)
+            if not any(isinstance(finder, _PostImportFinder) for finder in sys.meta_path):
+                sys.meta_path.insert(0, _PostImportFinder())
+            return
+
+    callback(module)
+
+
+class _PostImportFinder:
+    """
+    Finds modules with import hooks using the other finders, and wraps their loader so the hooks run once
+    the module has been executed
+    """
+
+    def find_spec(self, fullname, path, target=None):
+        if fullname not in _import_hooks:
+            return None
+
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is not None:
+                if spec.loader is not None:
+                    spec.loader = _PostImportLoader(spec.loader)
+                return spec
+
+        return None
+
+
+class _PostImportLoader:
+    """
+    Delegates to a module's own loader, running the import hooks for the module after executing it
+    """
+
+    def __init__(self, loader):
+        self._loader = loader
+
+    def __getattr__(self, name):
+        return getattr(self._loader, name)
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        # Put the module's own loader back first, so nothing that inspects the module sees this one
+        module.__loader__ = module.__spec__.loader = self._loader
+        self._loader.exec_module(module)
+
+        with _lock:
+            callbacks = _import_hooks.pop(module.__name__, [])
+
+        for callback in callbacks:
+            callback(module)
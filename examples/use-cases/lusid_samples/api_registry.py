@@ -0,0 +1,125 @@
+"""
+Builds each LUSID api once per api factory. ApiClientFactory.build creates a new api object, and patches its class,
+on every call, so helpers that call it inside loops pay for that on every iteration. The apis built here all share
+the factory's ApiClient, and so one pool of HTTP connections, which stats() reports on.
+"""
+import threading
+import weakref
+
+
+class ApiRegistry:
+    """
+    Builds LUSID apis with an api factory the first time they are asked for and returns the same api after that
+
+    Parameters
+    ----------
+    api_factory : lusid.utilities.ApiClientFactory
+        The LUSID api factory to use
+    """
+
+    def __init__(self, api_factory):
+        self._api_factory = api_factory
+        self._apis = {}
+        self._lock = threading.Lock()
+
+        self.builds = 0
+        self.hits = 0
+
+    def build(self, api_class):
+        """
+        Returns an api, building it on first use. Takes the same argument as ApiClientFactory.build, so a registry
+        can be used in its place
+
+        Parameters
+        ----------
+        api_class : type
+            The LUSID api, for example lusid.api.InstrumentsApi
+
+        Returns
+        -------
+        object
+            The api
+        """
+        with self._lock:
+            api = self._apis.get(api_class)
+            if api is None:
+                api = self._apis[api_class] = self._api_factory.build(api_class)
+                self.builds += 1
+            else:
+                self.hits += 1
+            return api
+
+    def pool_size(self):
+        """
+        Returns
+        -------
+        int
+            The most connections kept open to each host, beyond which concurrent requests wait for a connection
+            or open one that is thrown away afterwards
+        """
+        return self._api_factory.api_client.configuration.connection_pool_maxsize
+
+    def pool_stats(self):
+        """
+        Returns
+        -------
+        [dict]
+            For each host connected to, the connections opened and the requests made, the difference being the
+            requests that reused a connection
+        """
+        pools = self._api_factory.api_client.rest_client.pool_manager.pools
+        stats = []
+
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            stats.append({
+                "host": pool.host,
+                "connections": pool.num_connections,
+                "requests": pool.num_requests,
+                "reused": pool.num_requests - pool.num_connections,
+            })
+
+        return stats
+
+    def stats(self):
+        """
+        Returns
+        -------
+        dict
+            The apis built and the builds avoided so far, and the connection pool stats
+        """
+        return {
+            "apis": sorted(api_class.__name__ for api_class in self._apis),
+            "builds": self.builds,
+            "hits": self.hits,
+            "pools": self.pool_stats(),
+        }
+
+
+_registries = weakref.WeakKeyDictionary()
+_registries_lock = threading.Lock()
+
+
+def registry_for(api_factory):
+    """
+    Returns the registry shared by everything using an api factory, creating it on first use. The registry only
+    holds a weak reference to the api factory, so the factory and its registry are dropped once nothing else uses
+    the factory
+
+    Parameters
+    ----------
+    api_factory : lusid.utilities.ApiClientFactory
+        The LUSID api factory to use
+
+    Returns
+    -------
+    ApiRegistry
+        The api factory's registry
+    """
+    with _registries_lock:
+        registry = _registries.get(api_factory)
+        if registry is None:
+            registry = _registries[api_factory] = ApiRegistry(weakref.proxy(api_factory))
+        return registry
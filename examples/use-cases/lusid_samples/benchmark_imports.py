@@ -0,0 +1,160 @@
+"""
+Measures how long notebook kernels take to import the sample helpers, using python -X importtime. Each case
+runs in a fresh interpreter from its use case folder, exactly as a notebook would import it. Cases with a
+budget fail the run if their median time is over it, e.g. from the use-cases folder
+
+    python -m lusid_samples.benchmark_imports --repeat 5
+"""
+import argparse
+import json
+import os
+import platform
+import re
+import statistics
+import subprocess
+import sys
+from datetime import datetime, timezone
+
+USE_CASES = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# (name, folder, statement, budget in milliseconds or None)
+CASES = [
+    ("create_scope_id", "ibor", "import lusid_sample_data; lusid_sample_data.create_scope_id()", 50),
+    ("printer.heading", "ibor", "import printer; printer.heading('Scope', 'example')", 50),
+    ("helper_functions", "ibor", "import helper_functions", 50),
+    ("globalfund", "ibor", "import globalfund", 50),
+]
+
+# Imports that take longer than this are listed in the report
+HEAVY_IMPORT_MS = 10
+
+STATEMENT_MARKER = "--- statement ---"
+
+IMPORT_TIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def parse_importtime(stderr):
+    """
+    Parses the output of python -X importtime
+
+    Parameters
+    ----------
+    stderr : str
+        Standard error of the interpreter
+
+    Returns
+    -------
+    [dict]
+        One record per module, in the order the imports finished, with the self and cumulative time in
+        microseconds and the depth of the import, 0 for imports made directly by the statement
+    """
+    records = []
+
+    for line in stderr.splitlines():
+        match = IMPORT_TIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            records.append({
+                "module": module,
+                "self_us": int(self_us),
+                "cumulative_us": int(cumulative_us),
+                "depth": (len(indent) - 1) // 2,
+            })
+
+    return records
+
+
+def run_case(folder, statement):
+    """
+    Runs a statement in a fresh interpreter, timing it and its imports
+
+    Parameters
+    ----------
+    folder : str
+        Folder to run the statement in
+    statement : str
+        Python statement to time
+
+    Returns
+    -------
+    (float, [dict])
+        Time taken by the statement in milliseconds and the imports it made
+    """
+    script = (
+        "import sys, time\n"
+        f"sys.stderr.write({STATEMENT_MARKER!r} + '\\n')\n"
+        "_start = time.perf_counter()\n"
+        f"{statement}\n"
+        "print((time.perf_counter() - _start) * 1000)\n"
+    )
+
+    # Bytecode is written so that every run after the first measures a kernel with a warm cache
+    env = {k: v for k, v in os.environ.items() if k != "PYTHONDONTWRITEBYTECODE"}
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", script], cwd=folder, env=env,
+                            check=True, capture_output=True, text=True)
+
+    # Everything imported before the statement runs, such as site, is the interpreter's startup cost
+    statement_stderr = result.stderr.split(STATEMENT_MARKER, 1)[1]
+    return float(result.stdout.splitlines()[-1]), parse_importtime(statement_stderr)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Benchmarks the import time of the sample helpers")
+    arg_parser.add_argument("--repeat", type=int, default=5, help="runs of each case after a warm up run")
+    arg_parser.add_argument("--cases", nargs="+", choices=[c[0] for c in CASES], default=[c[0] for c in CASES],
+                            help="cases to run")
+    arg_parser.add_argument("--output", default=None, help="path to write the results to as JSON")
+    args = arg_parser.parse_args()
+
+    results = []
+    over_budget = []
+
+    for name, folder, statement, budget in CASES:
+        if name not in args.cases:
+            continue
+
+        folder = os.path.join(USE_CASES, folder)
+        run_case(folder, statement)
+        runs = [run_case(folder, statement) for _ in range(args.repeat)]
+
+        wall_ms = statistics.median(ms for ms, _ in runs)
+        records = runs[-1][1]
+        # The modules the statement imports and the modules they import directly, which is where a slow
+        # import can be deferred
+        heavy = sorted((r for r in records if r["depth"] <= 1 and r["cumulative_us"] >= HEAVY_IMPORT_MS * 1000),
+                       key=lambda r: r["cumulative_us"], reverse=True)
+
+        results.append({
+            "case": name,
+            "statement": statement,
+            "median_ms": wall_ms,
+            "runs_ms": [ms for ms, _ in runs],
+            "budget_ms": budget,
+            "modules_imported": len(records),
+            "heavy_imports": heavy,
+        })
+
+        status = "" if budget is None else (" ok" if wall_ms <= budget else f" OVER BUDGET ({budget} ms)")
+        print(f"{name:<18} {wall_ms:8.1f} ms  {len(records):>5} modules{status}")
+        for r in heavy:
+            print(f"    {r['module']:<40} {r['cumulative_us'] / 1000:8.1f} ms")
+
+        if budget is not None and wall_ms > budget:
+            over_budget.append(name)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({
+                "created": datetime.now(timezone.utc).isoformat(),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "results": results,
+            }, f, indent=2)
+        print(f"saved results to {args.output}")
+
+    if over_budget:
+        sys.exit(f"over budget: {', '.join(over_budget)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,421 @@
+"""
+Sends large requests to LUSID as many smaller ones. Requests are split into batches which are sent concurrently by
+a bounded pool of threads, retrying batches that are rate limited or hit a server error, and the responses are
+merged back into one. Whole listings are paged through and deleted the same way, to tear down a sandbox.
+"""
+import collections
+import itertools
+import random
+import time
+from datetime import datetime, timezone
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from ._lazy import lazy_import
+from .api_registry import registry_for
+from .identifiers import resolver_for
+from .lusid_sample_data import TRANSACTION_BATCH_SIZE
+
+lusid = lazy_import("lusid")
+
+# The most requests sent at once. More threads than connections in the api client's pool would open connections
+# that are thrown away after each request, so the pool size caps this too
+MAX_WORKERS = 8
+
+# Statuses worth trying a batch again for: rate limiting and errors the server may recover from
+RETRY_STATUSES = frozenset([429, 500, 502, 503, 504])
+
+# How many times a batch is retried and the base of the exponential delay between attempts, in seconds
+MAX_RETRIES = 5
+RETRY_BACKOFF = 0.5
+
+# The most instruments sent in one upsert_instruments call
+INSTRUMENT_BATCH_SIZE = 2000
+
+# The most results asked for in each page of a list call
+PAGE_SIZE = 1000
+
+# The result of sending one batch. response is None and error the exception if the batch failed on every attempt
+BatchResult = collections.namedtuple("BatchResult", ["index", "batch", "response", "error", "seconds", "attempts"])
+
+# A BatchResult without the batch itself, so reports on millions of requests do not keep them all in memory
+BatchReport = collections.namedtuple("BatchReport", ["index", "size", "response", "error", "seconds", "attempts"])
+
+
+def is_retryable(error):
+    """
+    Parameters
+    ----------
+    error : Exception
+        The error a request failed with
+
+    Returns
+    -------
+    bool
+        Whether the request may succeed if it is sent again
+    """
+    return getattr(error, "status", None) in RETRY_STATUSES
+
+
+def retry_delay(error, attempt, backoff=RETRY_BACKOFF):
+    """
+    Works out how long to wait before retrying a request, the time LUSID asks for in the Retry-After header of a
+    rate limited response or otherwise an exponential backoff with jitter, so retrying threads spread out
+
+    Parameters
+    ----------
+    error : Exception
+        The error the request failed with
+    attempt : int
+        The number of attempts made so far
+    backoff : float
+        The delay before the first retry, doubled for each retry after that
+
+    Returns
+    -------
+    float
+        Seconds to wait
+    """
+    headers = getattr(error, "headers", None) or {}
+    retry_after = headers.get("Retry-After")
+    if retry_after is not None:
+        try:
+            return float(retry_after)
+        except ValueError:
+            pass
+
+    return random.uniform(0, backoff * 2 ** (attempt - 1))
+
+
+def max_workers_for(api_factory, max_workers=None):
+    """
+    Parameters
+    ----------
+    api_factory : lusid.utilities.ApiClientFactory
+        The LUSID api factory to use
+    max_workers : int
+        The threads asked for, if any
+
+    Returns
+    -------
+    int
+        The threads to send requests with, at most MAX_WORKERS and the api client's connection pool size
+    """
+    if max_workers is not None:
+        return max_workers
+    return max(1, min(MAX_WORKERS, registry_for(api_factory).pool_size()))
+
+
+def batched(iterable, size):
+    """
+    Splits an iterable into lists, reading it only as each list is needed
+
+    Parameters
+    ----------
+    iterable : iterable
+        The items to split
+    size : int
+        The most items in each list
+
+    Returns
+    -------
+    iterator of list
+        The items, size at a time
+    """
+    iterator = iter(iterable)
+    while True:
+        batch = list(itertools.islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def call_with_retries(call, retries=MAX_RETRIES, backoff=RETRY_BACKOFF, sleep=time.sleep):
+    """
+    Makes a request, making it again if it is rate limited or hits a server error
+
+    Parameters
+    ----------
+    call : callable
+        Makes the request, taking no arguments
+    retries : int
+        The most times the request is made again
+    backoff : float
+        The delay before the first retry in seconds, doubled for each retry after that
+    sleep : callable
+        Waits between retries
+
+    Returns
+    -------
+    object
+        The response
+    """
+    attempt = 0
+
+    while True:
+        attempt += 1
+        try:
+            return call()
+        except Exception as error:
+            if attempt > retries or not is_retryable(error):
+                raise
+            sleep(retry_delay(error, attempt, backoff))
+
+
+def _send(send, index, batch, retries, backoff, sleep):
+    start = time.perf_counter()
+    attempts = 0
+
+    def attempt():
+        nonlocal attempts
+        attempts += 1
+        return send(batch)
+
+    try:
+        response = call_with_retries(attempt, retries, backoff, sleep)
+    except Exception as error:
+        return BatchResult(index, batch, None, error, time.perf_counter() - start, attempts)
+
+    return BatchResult(index, batch, response, None, time.perf_counter() - start, attempts)
+
+
+def run_batches(send, batches, max_workers=MAX_WORKERS, max_pending=None, retries=MAX_RETRIES,
+                backoff=RETRY_BACKOFF, sleep=time.sleep):
+    """
+    Sends batches concurrently, retrying those that are rate limited or hit a server error. Batches are taken from
+    the iterable only as fast as they are sent, so a generator of batches is never read far ahead of the requests
+
+    Parameters
+    ----------
+    send : callable
+        Sends one batch, returning the response
+    batches : iterable
+        The batches to send
+    max_workers : int
+        The most batches sent at once
+    max_pending : int
+        The most batches taken from the iterable but not yet finished, twice max_workers by default
+    retries : int
+        The most times a batch is sent again
+    backoff : float
+        The delay before the first retry in seconds, doubled for each retry after that
+    sleep : callable
+        Waits between retries
+
+    Returns
+    -------
+    iterator of BatchResult
+        The result of each batch as it finishes. A batch that fails does not stop the others, its result holds the
+        error instead
+    """
+    max_pending = max_pending or 2 * max_workers
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending = set()
+
+        for index, batch in enumerate(batches):
+            if len(pending) >= max_pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                yield from sorted((future.result() for future in done), key=lambda result: result.index)
+            pending.add(executor.submit(_send, send, index, batch, retries, backoff, sleep))
+
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            yield from sorted((future.result() for future in done), key=lambda result: result.index)
+
+
+def upsert_instruments(api_factory, definitions, batch_size=INSTRUMENT_BATCH_SIZE, max_workers=None, **kwargs):
+    """
+    Upserts any number of instruments, in batches sent concurrently
+
+    Parameters
+    ----------
+    api_factory : lusid.utilities.ApiClientFactory
+        The LUSID api factory to use
+    definitions : dict
+        InstrumentDefinitions keyed by a correlation id, as for InstrumentsApi.upsert_instruments
+    batch_size : int
+        The most instruments in each request
+    max_workers : int
+        The most requests sent at once
+    kwargs
+        Passed on to InstrumentsApi.upsert_instruments, for example scope
+
+    Returns
+    -------
+    lusid.models.UpsertInstrumentsResponse
+        The responses to every batch merged together, in the order of the definitions. The instruments of batches
+        that failed on every attempt are in failed
+    """
+    instruments_api = registry_for(api_factory).build(lusid.api.InstrumentsApi)
+    items = list(definitions.items())
+    batches = (dict(items[start:start + batch_size]) for start in range(0, len(items), batch_size))
+
+    values = {}
+    staged = {}
+    failed = {}
+
+    for result in run_batches(lambda batch: instruments_api.upsert_instruments(request_body=batch, **kwargs),
+                              batches, max_workers_for(api_factory, max_workers)):
+        if result.error is None:
+            values.update(result.response.values or {})
+            staged.update(getattr(result.response, "staged", None) or {})
+            failed.update(result.response.failed or {})
+        else:
+            for key in result.batch:
+                failed[key] = lusid.models.ErrorDetail(
+                    id=key, type=type(result.error).__name__, detail=str(result.error))
+
+    def in_order(merged):
+        return {key: merged[key] for key in definitions if key in merged}
+
+    return lusid.models.UpsertInstrumentsResponse(values=in_order(values), staged=in_order(staged),
+                                                  failed=in_order(failed))
+
+
+def upsert_transactions(api_factory, scope, code, transaction_requests, batch_size=TRANSACTION_BATCH_SIZE,
+                        max_workers=None, max_pending=None):
+    """
+    Upserts any number of transactions into a portfolio, in batches sent concurrently. The transaction requests
+    are read only as fast as the batches are sent, so a generator of requests can backfill millions of
+    transactions without holding them all in memory
+
+    Parameters
+    ----------
+    api_factory : lusid.utilities.ApiClientFactory
+        The LUSID api factory to use
+    scope : str
+        The scope of the portfolio
+    code : str
+        The code of the portfolio
+    transaction_requests : iterable of lusid.models.TransactionRequest
+        The transactions to upsert
+    batch_size : int
+        The most transactions in each request
+    max_workers : int
+        The most requests sent at once
+    max_pending : int
+        The most batches built but not yet sent, twice max_workers by default
+
+    Returns
+    -------
+    [BatchReport]
+        The size, latency, attempts and response or error of each batch, in the order the batches were sent
+    """
+    transaction_portfolios_api = registry_for(api_factory).build(lusid.api.TransactionPortfoliosApi)
+
+    def send(batch):
+        return transaction_portfolios_api.upsert_transactions(scope=scope, code=code, transaction_request=batch)
+
+    reports = [
+        BatchReport(result.index, len(result.batch), result.response, result.error, result.seconds, result.attempts)
+        for result in run_batches(send, batched(transaction_requests, batch_size),
+                                  max_workers_for(api_factory, max_workers), max_pending)
+    ]
+    reports.sort(key=lambda report: report.index)
+
+    return reports
+
+
+def list_all(list_call, page_size=PAGE_SIZE, **kwargs):
+    """
+    Lists every result of a paginated list call, such as PortfoliosApi.list_portfolios, following the next page
+    token of each page until there are no more pages
+
+    Parameters
+    ----------
+    list_call : callable
+        The list call, which takes page and limit arguments and returns a page with values and next_page
+    page_size : int
+        The most results in each page
+    kwargs
+        Passed on to the list call, for example filter
+
+    Returns
+    -------
+    iterator
+        Every result, each page being requested only once the results before it have been used
+    """
+    page = None
+
+    while True:
+        response = call_with_retries(lambda: list_call(page=page, limit=page_size, **kwargs))
+        yield from response.values or []
+
+        page = response.next_page
+        if not page:
+            return
+
+
+def _delete_each(api_factory, delete, items, max_workers):
+    results = list(run_batches(delete, items, max_workers_for(api_factory, max_workers)))
+    results.sort(key=lambda result: result.index)
+    return results
+
+
+def delete_portfolios(api_factory, max_workers=None, page_size=PAGE_SIZE, **kwargs):
+    """
+    Deletes every portfolio, listing them a page at a time and deleting them concurrently
+
+    Parameters
+    ----------
+    api_factory : lusid.utilities.ApiClientFactory
+        The LUSID api factory to use
+    max_workers : int
+        The most deletes sent at once
+    page_size : int
+        The most portfolios listed in each page
+    kwargs
+        Passed on to PortfoliosApi.list_portfolios, for example filter to only delete some portfolios
+
+    Returns
+    -------
+    [BatchResult]
+        The result of each delete, with the portfolio as its batch
+    """
+    portfolios_api = registry_for(api_factory).build(lusid.api.PortfoliosApi)
+
+    # Pages are listed as at the start, so deleting portfolios does not move the later pages
+    portfolios = list_all(portfolios_api.list_portfolios, page_size, as_at=datetime.now(timezone.utc), **kwargs)
+
+    return _delete_each(
+        api_factory,
+        lambda portfolio: portfolios_api.delete_portfolio(scope=portfolio.id.scope, code=portfolio.id.code),
+        portfolios,
+        max_workers)
+
+
+def delete_instruments(api_factory, max_workers=None, page_size=PAGE_SIZE, **kwargs):
+    """
+    Deletes every instrument, listing them a page at a time and deleting them concurrently. Cached LUIDs are
+    dropped afterwards, as the instruments may be created again with new ones
+
+    Parameters
+    ----------
+    api_factory : lusid.utilities.ApiClientFactory
+        The LUSID api factory to use
+    max_workers : int
+        The most deletes sent at once
+    page_size : int
+        The most instruments listed in each page
+    kwargs
+        Passed on to InstrumentsApi.list_instruments, for example filter to only delete some instruments
+
+    Returns
+    -------
+    [BatchResult]
+        The result of each delete, with the instrument as its batch
+    """
+    instruments_api = registry_for(api_factory).build(lusid.api.InstrumentsApi)
+
+    # Pages are listed as at the start, so deleting instruments does not move the later pages
+    instruments = list_all(instruments_api.list_instruments, page_size, as_at=datetime.now(timezone.utc), **kwargs)
+
+    try:
+        return _delete_each(
+            api_factory,
+            lambda instrument: instruments_api.delete_instrument(
+                identifier_type="LusidInstrumentId", identifier=instrument.lusid_instrument_id),
+            instruments,
+            max_workers)
+    finally:
+        resolver_for(api_factory).invalidate()
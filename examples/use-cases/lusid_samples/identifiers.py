@@ -0,0 +1,229 @@
+"""
+Resolves instrument identifiers such as FIGIs to LUSID instrument ids (LUIDs). Lookups are sent to the bulk
+get_instruments endpoint in batches and the results are cached, so resolving the same FIGIs again, from any
+helper using the same api factory, costs no requests at all.
+"""
+import threading
+import time
+import weakref
+from collections import OrderedDict
+
+from ._lazy import lazy_import
+from .api_registry import registry_for
+
+lusid = lazy_import("lusid")
+
+# The most identifiers sent in one get_instruments call
+RESOLVE_BATCH_SIZE = 500
+
+# The most LUIDs each resolver keeps, the least recently used are dropped first
+CACHE_SIZE = 100000
+
+# Seconds a LUID is cached for. Sandbox instruments can be deleted and recreated under a new LUID, so entries
+# are not kept forever
+CACHE_TTL = 15 * 60
+
+
+class IdentifierResolver:
+    """
+    Resolves instrument identifiers to LUIDs with one get_instruments call per batch of uncached identifiers,
+    keeping the LUIDs in a least recently used cache whose entries expire after a time to live
+
+    Parameters
+    ----------
+    api_factory : lusid.utilities.ApiClientFactory
+        The LUSID api factory to use
+    batch_size : int
+        The most identifiers sent in one get_instruments call
+    max_size : int
+        The most LUIDs to cache
+    ttl : float
+        Seconds each LUID is cached for
+    clock : callable
+        Returns the current time in seconds, used for the time to live
+    """
+
+    def __init__(self, api_factory, batch_size=RESOLVE_BATCH_SIZE, max_size=CACHE_SIZE, ttl=CACHE_TTL,
+                 clock=time.monotonic):
+        # The registry only holds a weak reference to the api factory, so resolver_for does not keep it alive
+        self._registry = registry_for(api_factory)
+        self.batch_size = batch_size
+        self.max_size = max_size
+        self.ttl = ttl
+        self._clock = clock
+
+        # (identifier type, identifier) to (LUID, expiry time), least recently used first
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.requests = 0
+
+    def _cached(self, keys, now):
+        """
+        Looks up LUIDs in the cache, dropping any that have expired
+
+        Parameters
+        ----------
+        keys : [(str, str)]
+            Unique (identifier type, identifier) pairs
+        now : float
+            The current time
+
+        Returns
+        -------
+        (dict, [(str, str)])
+            The cached LUIDs by key and the keys that are not cached
+        """
+        found = {}
+        missing = []
+
+        with self._lock:
+            for key in keys:
+                entry = self._cache.get(key)
+                if entry is not None and entry[1] > now:
+                    self._cache.move_to_end(key)
+                    found[key] = entry[0]
+                else:
+                    if entry is not None:
+                        del self._cache[key]
+                    missing.append(key)
+
+            self.hits += len(found)
+            self.misses += len(missing)
+
+        return found, missing
+
+    def _store(self, luids, now):
+        with self._lock:
+            expires = now + self.ttl
+            for key, luid in luids.items():
+                self._cache[key] = (luid, expires)
+                self._cache.move_to_end(key)
+
+            while len(self._cache) > self.max_size:
+                self._cache.popitem(last=False)
+
+    def resolve(self, identifiers, identifier_type="Figi"):
+        """
+        Resolves identifiers to LUIDs
+
+        Parameters
+        ----------
+        identifiers : iterable of str
+            The identifiers, which may repeat
+        identifier_type : str
+            The type of the identifiers, for example 'Figi'
+
+        Returns
+        -------
+        [str]
+            The LUID of each identifier, in the same order
+
+        Raises
+        ------
+        KeyError
+            If any identifier is not the identifier of an instrument
+        """
+        identifiers = list(identifiers)
+        keys = list(dict.fromkeys((identifier_type, identifier) for identifier in identifiers))
+
+        now = self._clock()
+        luids, missing = self._cached(keys, now)
+
+        resolved = {}
+        for start in range(0, len(missing), self.batch_size):
+            batch = [identifier for _, identifier in missing[start:start + self.batch_size]]
+            response = self._registry.build(lusid.api.InstrumentsApi).get_instruments(
+                identifier_type=identifier_type, request_body=batch)
+            with self._lock:
+                self.requests += 1
+            for identifier, instrument in response.values.items():
+                resolved[(identifier_type, identifier)] = instrument.lusid_instrument_id
+
+        self._store(resolved, now)
+        luids.update(resolved)
+
+        unresolved = [key[1] for key in keys if key not in luids]
+        if unresolved:
+            raise KeyError(f"No instruments with {identifier_type} {', '.join(map(str, unresolved))}")
+
+        return [luids[(identifier_type, identifier)] for identifier in identifiers]
+
+    def luid(self, identifier, identifier_type="Figi"):
+        """
+        Resolves one identifier to its LUID
+
+        Parameters
+        ----------
+        identifier : str
+            The identifier
+        identifier_type : str
+            The type of the identifier, for example 'Figi'
+
+        Returns
+        -------
+        str
+            The LUID of the identifier
+        """
+        return self.resolve([identifier], identifier_type)[0]
+
+    def invalidate(self, identifiers=None, identifier_type="Figi"):
+        """
+        Drops LUIDs from the cache, for example after deleting instruments
+
+        Parameters
+        ----------
+        identifiers : iterable of str
+            The identifiers to drop, all of them if None
+        identifier_type : str
+            The type of the identifiers
+        """
+        with self._lock:
+            if identifiers is None:
+                self._cache.clear()
+                return
+            for identifier in identifiers:
+                self._cache.pop((identifier_type, identifier), None)
+
+    def stats(self):
+        """
+        Returns
+        -------
+        dict
+            The cache hits and misses, get_instruments requests made and LUIDs cached so far
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "requests": self.requests,
+                "cached": len(self._cache),
+            }
+
+
+_resolvers = weakref.WeakKeyDictionary()
+_resolvers_lock = threading.Lock()
+
+
+def resolver_for(api_factory):
+    """
+    Returns the resolver shared by everything using an api factory, creating it on first use. Like the api
+    factory's registry, the resolver is dropped once nothing else uses the factory
+
+    Parameters
+    ----------
+    api_factory : lusid.utilities.ApiClientFactory
+        The LUSID api factory to use
+
+    Returns
+    -------
+    IdentifierResolver
+        The api factory's resolver
+    """
+    with _resolvers_lock:
+        resolver = _resolvers.get(api_factory)
+        if resolver is None:
+            resolver = _resolvers[api_factory] = IdentifierResolver(api_factory)
+        return resolver
@@ -0,0 +1,1238 @@
+from datetime import datetime, timedelta, time
+import os
+import threading
+import time as default_time
+from collections import UserString
+from collections.abc import MutableMapping
+
+from ._lazy import lazy_import
+
+# These are only imported when a function first uses them, so that notebooks which only need
+# create_scope_id start quickly
+lusid = lazy_import('lusid')
+pytz = lazy_import('pytz')
+pd = lazy_import('pandas')
+np = lazy_import('numpy')
+
+# The column types of the sample files read by the functions in this module, keyed by file name
+SAMPLE_FILE_SCHEMAS = {
+    'portfolios.csv': {
+        'dtype': {'portfolio_group_name': str, 'portfolio_name': str}},
+    'holdings.csv': {
+        'dtype': {'portfolio_group_name': str, 'portfolio_name': str, 'instrument_name': str,
+                  'quantity': 'int64', 'price': 'float64'}},
+    'fundaccountantreport.csv': {
+        'dtype': {'portfolio_group_name': str, 'portfolio_name': str, 'instrument_name': str,
+                  'quantity': 'float64', 'price': 'float64'}},
+    'transactions.csv': {
+        'dtype': {'portfolio_group_name': str, 'portfolio_name': str, 'transaction_id': str, 'instrument_uid': str,
+                  'type': str, 'units': 'int64', 'transaction_price': 'float64', 'transaction_currency': str}},
+    'instruments.csv': {
+        'dtype': {'instrument_name': str, 'client_internal': str, 'currency': str, 'isin': str, 'figi': str,
+                  'exchange_code': str, 'country_issue': str, 'ticker': str, 'market_sector': str,
+                  'security_type': str, 'coupon': 'float64'}},
+    'paper-instruments.csv': {
+        'dtype': {'instrument_name': str, 'currency': str, 'figi': str, 'ticker': str, 'isin': str, 'sedol': str,
+                  'client_internal': str}},
+    'paper-analytics.csv': {
+        'dtype': {'instrument_name': str, 'currency': str, 'figi': str, 'price_original': 'float64',
+                  'price_current': 'float64', 'ticker': str, 'isin': str, 'sedol': str}},
+}
+
+# Transaction files loaded by fetch_client_transactions all share the same layout
+SAMPLE_FILE_SCHEMAS['paper-transactions.csv'] = SAMPLE_FILE_SCHEMAS['strategy-transactions.csv'] = {
+    'dtype': {'portfolio_name': str, 'transaction_id': str, 'instrument_name': str, 'transaction_description': str,
+              'transaction_type': str, 'transaction_units': 'int64', 'transaction_price': 'float64',
+              'transaction_currency': str, 'transaction_strategy': str, 'transaction_cost': 'float64', 'figi': str,
+              'currency': str}}
+
+# Data read by import_file, keyed by absolute path and parser, with the modification time and size it was read at
+_import_file_cache = {}
+
+class RefreshingToken(UserString):
+
+    def __init__(self):
+
+        token_data = {
+            "expires": datetime.now(),
+            "current_access_token": ''
+        }
+
+        current_access_token = ''
+
+        def get_token():
+            if token_data['expires'] <= datetime.now():
+                with open("./../access_token.txt", "r") as access_token_file:
+                    token_data['current_access_token'] = access_token_file.read()
+
+                token_data['expires'] = datetime.now() + timedelta(seconds=120)
+
+            return token_data['current_access_token']
+
+        self.access_token = get_token
+
+    def __getattribute__(self, name):
+        token = object.__getattribute__(self, 'access_token')()
+        if name == 'data':
+            return token
+        return token.__getattribute__(name)
+
+
+def authenticate_secrets():
+    
+    class LusidApi():
+
+        def __init__(self, client):
+            self.aggregation = lusid.AggregationApi(client)
+            self.metadata = lusid.ApplicationMetadataApi(client)
+            self.corporate_action_sources = lusid.CorporateActionSourcesApi(client)
+            self.data_types = lusid.DataTypesApi(client)
+            self.derived_transaction_portfolios = lusid.DerivedTransactionPortfoliosApi(client)
+            self.instruments = lusid.InstrumentsApi(client)
+            self.login = lusid.InstrumentsApi(client)
+            self.portfolio_groups = lusid.PortfolioGroupsApi(client)
+            self.portfolios = lusid.PortfoliosApi(client)
+            self.property_definitions = lusid.PropertyDefinitionsApi(client)
+            self.quotes = lusid.QuotesApi(client)
+            self.reconciliations = lusid.ReconciliationsApi(client)
+            self.reference_portfolios = lusid.ReferencePortfolioApi(client)
+            self.results = lusid.ResultsApi(client)
+            self.schemas = lusid.SchemasApi(client)
+            self.scopes = lusid.ScopesApi(client)
+            self.search = lusid.SearchApi(client)
+            self.transaction_portfolios = lusid.TransactionPortfoliosApi(client)
+            self.cut_labels = lusid.CutLabelDefinitionsApi(client)
+
+    environment = os.getenv("FBN_DEPLOYMENT_ENVIRONMENT", None)
+
+    if environment == "JupyterNotebook":
+        api_url = os.getenv("FBN_LUSID_API_URL", None)
+        if api_url is None:
+            raise KeyError("Missing FBN_LUSID_API_URL environment variable, please set it to the LUSID base API url")
+        api_factory = lusid.utilities.ApiClientFactory(
+            token=RefreshingToken(),
+            api_url=api_url,
+            app_name="LusidJupyterNotebook")
+        return api_factory
+
+    dir_path = os.path.dirname(os.path.realpath(__file__))
+    secrets_path = os.path.join(dir_path, "../secrets.json")
+
+    api_factory = lusid.utilities.ApiClientFactory(api_secrets_filename=secrets_path)
+
+    return api_factory
+
+def authenticate():
+    api_url = os.getenv("FBN_LUSID_API_URL")
+    api_token = {"access_token": os.environ["ACCESS_TOKEN"]}
+    credentials = BasicTokenAuthentication(api_token)
+    client = lusid.LUSIDAPI(credentials, api_url)
+    return client
+
+# Crockford's base 32 alphabet, in ascending order so that encoded ids sort in the same order as their values
+SCOPE_ID_ALPHABET = '0123456789abcdefghjkmnpqrstvwxyz'
+
+
+class ScopeIdAllocator:
+    """
+    This class allocates unique ids for use in scope and portfolio codes, in the style of a ULID.
+
+    Each id is 100 bits, encoded as 20 base 32 characters:
+
+        48 bits  milliseconds since epoch
+        12 bits  sequence number within the millisecond
+        40 bits  node, random bits chosen when the allocator is created and again in a forked process
+
+    Ids allocated by one process are strictly increasing, even if the clock goes backwards or more than
+    4096 ids are allocated in a millisecond, and ids allocated by different processes sort by time. The
+    node is entirely random rather than derived from the process id, as parallel test runs are often in
+    containers where process ids repeat. Two processes can only allocate the same id if they allocate in
+    the same millisecond with the same sequence number and also chose the same 40 random bits, a chance of
+    about one in a trillion for each such pair. Allocation is thread safe.
+    """
+
+    TIMESTAMP_BITS = 48
+    SEQUENCE_BITS = 12
+    NODE_BITS = 40
+
+    def __init__(self):
+        self._reset()
+
+    def _reset(self):
+        self._lock = threading.Lock()
+        self._last_timestamp = 0
+        self._sequence = 0
+        self._node = int.from_bytes(os.urandom(self.NODE_BITS // 8), 'big')
+
+    def allocate(self):
+        """
+        This method allocates the next id
+
+        Output
+        scope_id: The id as an integer
+        """
+
+        timestamp = default_time.time_ns() // 1000000
+
+        with self._lock:
+            if timestamp > self._last_timestamp:
+                self._last_timestamp = timestamp
+                self._sequence = 0
+            else:
+                # Same millisecond, or the clock has gone backwards, so carry on from the last id
+                self._sequence += 1
+                if self._sequence >> self.SEQUENCE_BITS:
+                    self._last_timestamp += 1
+                    self._sequence = 0
+
+            timestamp, sequence = self._last_timestamp, self._sequence
+
+        return (((timestamp << self.SEQUENCE_BITS) | sequence) << self.NODE_BITS) | self._node
+
+    @staticmethod
+    def encode(scope_id):
+        """
+        This method encodes an id as 20 base 32 characters
+
+        Input
+        scope_id: The id as an integer
+
+        Output
+        scope_id: The encoded id
+        """
+
+        return ''.join(SCOPE_ID_ALPHABET[(scope_id >> shift) & 31] for shift in range(95, -1, -5))
+
+
+_scope_id_allocator = ScopeIdAllocator()
+
+# A forked process would otherwise share its parent's node and allocate the same ids
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_scope_id_allocator._reset)
+
+
+def create_scope_id():
+    """
+    This function creates a unique ID for use as a scope id. IDs are unique across threads and, barring
+    a one in a trillion chance, processes and sort in the order they were created, see ScopeIdAllocator.
+    
+    Output
+    scopes: Scope identifier
+    """ 
+    return ScopeIdAllocator.encode(_scope_id_allocator.allocate())
+
+def import_file(csv_file, engine=None, sidecar=None):
+    """
+    This function is used to import data form our files. The sample files used by the functions below
+    are read with explicit column types rather than having pandas infer them, and files are cached for
+    the life of the kernel so they are only parsed again when they change on disk. A copy of the cached
+    data is returned, so callers are free to modify it.
+    
+    Input
+    csv_file: The name of the csv file including the extension i.e. .csv
+    engine: The pandas csv parser to use, 'pyarrow' is much faster for large files if pyarrow is installed
+    sidecar: Either 'feather' or 'parquet' to save a copy of the parsed data next to the csv file, which
+    is then memory mapped by later kernels rather than parsing the csv again. Requires pyarrow
+    
+    Output
+    data: DataFrame containing the data in the file
+    """
+    
+    csv_path = os.path.abspath(os.path.join('data', csv_file))
+    stat = os.stat(csv_path)
+    cache_key = (csv_path, engine)
+    
+    cached = _import_file_cache.get(cache_key)
+    
+    if cached is None or cached[0] != (stat.st_mtime_ns, stat.st_size):
+        if sidecar is not None:
+            data = _read_with_sidecar(csv_path, stat, sidecar, engine)
+        else:
+            data = _read_csv(csv_path, engine)
+        cached = ((stat.st_mtime_ns, stat.st_size), data)
+        _import_file_cache[cache_key] = cached
+    elif sidecar is not None:
+        # The data may have been cached by a call without a sidecar, which is saved now if it is not up to date
+        _save_sidecar(csv_path, stat, sidecar, cached[1])
+    
+    return cached[1].copy()
+
+
+def _read_csv(csv_path, engine):
+    """
+    This function reads a csv file, using the schema for the file if it is one of our known sample files
+    """
+    
+    return pd.read_csv(csv_path, **_read_csv_kwargs(csv_path, engine))
+
+
+def _read_csv_kwargs(csv_path, engine):
+    """
+    This function returns the pandas.read_csv arguments for a csv file, with the column types from the
+    schema for the file if it is one of our known sample files
+    """
+    
+    schema = SAMPLE_FILE_SCHEMAS.get(os.path.basename(csv_path), {})
+    
+    kwargs = {}
+    if engine is not None:
+        kwargs['engine'] = engine
+    
+    if schema:
+        # Only pass the types of the columns that are actually in the file, not every parser ignores the others
+        columns = set(pd.read_csv(csv_path, nrows=0).columns)
+        kwargs['dtype'] = {column: dtype for column, dtype in schema.get('dtype', {}).items() if column in columns}
+        parse_dates = [column for column in schema.get('parse_dates', []) if column in columns]
+        if parse_dates:
+            kwargs['parse_dates'] = parse_dates
+    
+    return kwargs
+
+
+def import_file_chunks(csv_file, chunksize):
+    """
+    This function is used to import data from our files a chunk at a time, so that files which are too
+    large to hold in memory can be processed. The chunks are read with the same column types as import_file
+    but are not cached.
+    
+    Input
+    csv_file: The name of the csv file including the extension i.e. .csv
+    chunksize: The number of rows in each chunk
+    
+    Output
+    chunks: Iterator of DataFrames containing the data in the file
+    """
+    
+    csv_path = os.path.abspath(os.path.join('data', csv_file))
+    
+    # The pyarrow parser does not support reading in chunks, so the default parser is always used
+    with pd.read_csv(csv_path, chunksize=chunksize, **_read_csv_kwargs(csv_path, None)) as reader:
+        yield from reader
+
+
+def _sidecar_path(csv_path, stat, sidecar):
+    """
+    This function returns the path of the feather or parquet sidecar of a csv file, and whether the sidecar
+    exists and is newer than the csv file
+    """
+    
+    if sidecar not in ('feather', 'parquet'):
+        raise ValueError(f"Unsupported sidecar format {sidecar}, please use 'feather' or 'parquet'")
+    
+    sidecar_path = f"{csv_path}.{sidecar}"
+    up_to_date = os.path.exists(sidecar_path) and os.stat(sidecar_path).st_mtime_ns >= stat.st_mtime_ns
+    
+    return sidecar_path, up_to_date
+
+
+def _save_sidecar(csv_path, stat, sidecar, data):
+    """
+    This function saves data parsed from a csv file to its feather or parquet sidecar, unless the sidecar
+    is already newer than the csv file
+    """
+    
+    sidecar_path, up_to_date = _sidecar_path(csv_path, stat, sidecar)
+    
+    if up_to_date:
+        return
+    
+    if sidecar == 'feather':
+        data.to_feather(sidecar_path)
+    else:
+        data.to_parquet(sidecar_path)
+
+
+def _read_with_sidecar(csv_path, stat, sidecar, engine):
+    """
+    This function reads a csv file from its feather or parquet sidecar if the sidecar is newer than the
+    csv file, otherwise it parses the csv file and saves a new sidecar
+    """
+    
+    sidecar_path, up_to_date = _sidecar_path(csv_path, stat, sidecar)
+    
+    if up_to_date:
+        import pyarrow.feather
+        import pyarrow.parquet
+        
+        if sidecar == 'feather':
+            return pyarrow.feather.read_table(sidecar_path, memory_map=True).to_pandas()
+        return pyarrow.parquet.read_table(sidecar_path, memory_map=True).to_pandas()
+    
+    data = _read_csv(csv_path, engine)
+    _save_sidecar(csv_path, stat, sidecar, data)
+    
+    return data
+
+
+def fetch_portfolio_names(csv_file):
+    """
+    This function loads the data from our portfolio names file and writes it to a dictionary
+    
+    Input
+    csv_file: The name of the csv file including the extension i.e. .csv
+    
+    Output
+    client_portfolios: Dictionary containing the client portfolios
+    """
+    
+    portfolios = import_file(csv_file)
+    portfolio_group, portfolio = portfolios.columns[:2]
+
+    client_portfolios = portfolios.groupby(portfolio_group, sort=False, dropna=False)[portfolio].agg(list).to_dict()
+    
+    return client_portfolios
+
+
+# Marks an instrument which does not have an identifier of a given type
+_NO_IDENTIFIER = object()
+
+
+def _indexable(value):
+    # Blank and NaN identifiers, such as LUIDs which have not been back-filled yet, are not indexed
+    return value is not _NO_IDENTIFIER and value == value and value != ''
+
+
+class InstrumentUniverse(MutableMapping):
+    """
+    This class holds an instrument universe column by column, with a hash index for each identifier type
+    so that an instrument can be found from any of its identifiers in constant time.
+
+    It behaves like the dictionary fetch_instrument_universe used to return, keyed by instrument name with
+    the identifiers and currency of each instrument:
+
+        instrument_universe['BAE SYS.']['identifiers']['LUID'] = 'LUID_12345678'
+        instrument_universe['GBP_Cash'] = {'identifiers': {'LUID': 'GBP'}, 'currency': 'GBP'}
+
+    Updates made through the dictionaries it returns are written back to the columns and indexes. The index
+    for an identifier type is built the first time it is used, and if several instruments share an
+    identifier the first of them is found.
+
+    Only the mapping protocol of the dictionary is kept, it is not a dict itself. Code that needs a real
+    dictionary, such as json.dumps or pd.DataFrame(instrument_universe), should use to_dict(), or
+    to_frame() for a DataFrame with a column for each type of identifier.
+    """
+
+    def __init__(self, instrument_names=(), currencies=(), identifiers=None):
+        """
+        Input
+        instrument_names: The name of each instrument
+        currencies: The currency of each instrument
+        identifiers: Dictionary of the identifiers of each instrument, keyed by identifier type
+        """
+
+        self._names = []
+        self._rows = {}
+        self._currencies = []
+        self._identifiers = {}
+        self._indexes = {}
+
+        instrument_names = list(instrument_names)
+        currencies = list(currencies)
+        identifiers = {identifier_type: list(values) for identifier_type, values in (identifiers or {}).items()}
+
+        if len(set(instrument_names)) == len(instrument_names):
+            self._names = instrument_names
+            self._rows = {name: row for row, name in enumerate(instrument_names)}
+            self._currencies = currencies
+            self._identifiers = identifiers
+        else:
+            # Like a dictionary, later instruments with the same name replace earlier ones
+            self._identifiers = {identifier_type: [] for identifier_type in identifiers}
+            for row, name in enumerate(instrument_names):
+                self[name] = {
+                    'identifiers': {identifier_type: values[row] for identifier_type, values in identifiers.items()},
+                    'currency': currencies[row]}
+
+    @property
+    def identifier_types(self):
+        return list(self._identifiers)
+
+    def _index(self, identifier_type):
+        index = self._indexes.get(identifier_type)
+        if index is None:
+            values = self._identifiers.get(identifier_type, [])
+            index = {}
+            for row, value in enumerate(values):
+                if _indexable(value) and value not in index:
+                    index[value] = row
+            self._indexes[identifier_type] = index
+        return index
+
+    def _set_identifier(self, row, identifier_type, value):
+        values = self._identifiers.get(identifier_type)
+        if values is None:
+            values = self._identifiers[identifier_type] = [_NO_IDENTIFIER] * len(self._names)
+
+        previous, values[row] = values[row], value
+
+        index = self._indexes.get(identifier_type)
+        if index is not None:
+            if _indexable(previous) and index.get(previous) == row:
+                del index[previous]
+            if _indexable(value):
+                index.setdefault(value, row)
+
+    def instrument_name(self, identifier_type, value):
+        """
+        This method finds the instrument with an identifier
+
+        Input
+        identifier_type: The type of identifier e.g. Figi or LUID
+        value: The identifier
+
+        Output
+        instrument_name: The name of the instrument, a KeyError is raised if there is no such instrument
+        """
+
+        return self._names[self._index(identifier_type)[value]]
+
+    def instrument_names(self, identifier_type, values, default=None):
+        """
+        This method finds the instruments with each of a number of identifiers
+
+        Input
+        identifier_type: The type of identifier e.g. Figi or LUID
+        values: The identifiers
+        default: The name to return for identifiers which no instrument has
+
+        Output
+        instrument_names: List containing the name of the instrument with each identifier
+        """
+
+        index, names = self._index(identifier_type), self._names
+
+        return [names[index[value]] if value in index else default for value in values]
+
+    def identifier_values(self, identifier_type, instrument_names=None):
+        """
+        This method returns one type of identifier for a number of instruments
+
+        Input
+        identifier_type: The type of identifier e.g. Figi or LUID
+        instrument_names: The names of the instruments, all instruments by default
+
+        Output
+        identifiers: List containing the identifier of each instrument, a KeyError is raised if an
+        instrument is not in the universe or does not have that type of identifier
+        """
+
+        values = self._identifiers.get(identifier_type, [_NO_IDENTIFIER] * len(self._names))
+
+        if instrument_names is None:
+            identifiers = list(values)
+        else:
+            rows = self._rows
+            identifiers = [values[rows[name]] for name in instrument_names]
+
+        if any(value is _NO_IDENTIFIER for value in identifiers):
+            raise KeyError(identifier_type)
+
+        return identifiers
+
+    def update_identifiers(self, identifier_type, identifiers):
+        """
+        This method sets one type of identifier for a number of instruments, for example to back-fill the
+        LUIDs of instruments once they have been upserted:
+
+            instrument_universe.update_identifiers('LUID', {
+                instrument_name: instrument.lusid_instrument_id
+                for instrument_name, instrument in response.values.items()})
+
+        Input
+        identifier_type: The type of identifier e.g. Figi or LUID
+        identifiers: Dictionary containing the new identifiers, keyed by instrument name
+        """
+
+        rows = self._rows
+        for name, value in identifiers.items():
+            self._set_identifier(rows[name], identifier_type, value)
+
+    def to_dict(self):
+        """
+        This method returns the instrument universe as a plain nested dictionary, in the same form as the
+        dictionary fetch_instrument_universe used to return
+
+        Output
+        instrument_universe: Dictionary containing the identifiers and currency of each instrument, keyed
+        by instrument name
+        """
+
+        identifiers = self._identifiers.items()
+
+        return {
+            name: {'identifiers': {identifier_type: values[row] for identifier_type, values in identifiers
+                                   if values[row] is not _NO_IDENTIFIER},
+                   'currency': self._currencies[row]}
+            for row, name in enumerate(self._names)}
+
+    def to_frame(self):
+        """
+        This method returns the instrument universe as a DataFrame with a column for each type of identifier
+
+        Output
+        instruments: DataFrame containing the instruments
+        """
+
+        columns = {'instrument_name': self._names, 'currency': self._currencies}
+        for identifier_type, values in self._identifiers.items():
+            columns[identifier_type] = [None if value is _NO_IDENTIFIER else value for value in values]
+
+        return pd.DataFrame(data=columns)
+
+    def copy(self):
+        return InstrumentUniverse(self._names, self._currencies, self._identifiers)
+
+    def __getitem__(self, instrument_name):
+        if instrument_name not in self._rows:
+            raise KeyError(instrument_name)
+        return _Instrument(self, instrument_name)
+
+    def __setitem__(self, instrument_name, instrument):
+        row = self._rows.get(instrument_name)
+
+        if row is None:
+            row = self._rows[instrument_name] = len(self._names)
+            self._names.append(instrument_name)
+            self._currencies.append(None)
+            for values in self._identifiers.values():
+                values.append(_NO_IDENTIFIER)
+
+        _Instrument(self, instrument_name)._replace(instrument)
+
+    def __delitem__(self, instrument_name):
+        # Every later instrument moves up a row, so the rows and indexes are rebuilt
+        row = self._rows.pop(instrument_name)
+        del self._names[row]
+        del self._currencies[row]
+        for values in self._identifiers.values():
+            del values[row]
+        self._rows = {name: row for row, name in enumerate(self._names)}
+        self._indexes = {}
+
+    def __contains__(self, instrument_name):
+        return instrument_name in self._rows
+
+    def __iter__(self):
+        return iter(self._names)
+
+    def __len__(self):
+        return len(self._names)
+
+    def __repr__(self):
+        return f"InstrumentUniverse({len(self)} instruments, identifiers: {', '.join(self._identifiers)})"
+
+
+class _Instrument(MutableMapping):
+    """
+    This class is the dictionary of an instrument in an InstrumentUniverse, with its identifiers and currency
+    """
+
+    __slots__ = ('_universe', '_name')
+
+    def __init__(self, universe, instrument_name):
+        self._universe = universe
+        self._name = instrument_name
+
+    def _replace(self, instrument):
+        instrument = dict(instrument)
+        self['currency'] = instrument.get('currency')
+        self['identifiers'] = instrument.get('identifiers', {})
+
+    def __getitem__(self, key):
+        if key == 'identifiers':
+            return _Identifiers(self._universe, self._name)
+        if key == 'currency':
+            return self._universe._currencies[self._universe._rows[self._name]]
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        universe = self._universe
+        row = universe._rows[self._name]
+        if key == 'identifiers':
+            value = dict(value)
+            for identifier_type in universe._identifiers:
+                universe._set_identifier(row, identifier_type, value.pop(identifier_type, _NO_IDENTIFIER))
+            for identifier_type, identifier in value.items():
+                universe._set_identifier(row, identifier_type, identifier)
+        elif key == 'currency':
+            universe._currencies[row] = value
+        else:
+            raise KeyError(f"Instruments only have identifiers and a currency, not {key}")
+
+    def __delitem__(self, key):
+        raise KeyError(f"The {key} of an instrument can not be deleted")
+
+    def __iter__(self):
+        return iter(('identifiers', 'currency'))
+
+    def __len__(self):
+        return 2
+
+    def __repr__(self):
+        return repr({'identifiers': dict(self['identifiers']), 'currency': self['currency']})
+
+
+class _Identifiers(MutableMapping):
+    """
+    This class is the dictionary of the identifiers of an instrument in an InstrumentUniverse, keyed by
+    identifier type
+    """
+
+    __slots__ = ('_universe', '_name')
+
+    def __init__(self, universe, instrument_name):
+        self._universe = universe
+        self._name = instrument_name
+
+    def __getitem__(self, identifier_type):
+        values = self._universe._identifiers.get(identifier_type)
+        value = _NO_IDENTIFIER if values is None else values[self._universe._rows[self._name]]
+        if value is _NO_IDENTIFIER:
+            raise KeyError(identifier_type)
+        return value
+
+    def __setitem__(self, identifier_type, value):
+        self._universe._set_identifier(self._universe._rows[self._name], identifier_type, value)
+
+    def __delitem__(self, identifier_type):
+        self[identifier_type]
+        self[identifier_type] = _NO_IDENTIFIER
+
+    def __iter__(self):
+        row = self._universe._rows[self._name]
+        return iter([identifier_type for identifier_type, values in self._universe._identifiers.items()
+                     if values[row] is not _NO_IDENTIFIER])
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        return repr(dict(self))
+
+
+def _identifier_values(instrument_universe, identifier_type, instrument_names):
+    """
+    This function looks up one type of identifier for a number of instruments, in bulk if the instrument
+    universe is an InstrumentUniverse
+    """
+
+    if isinstance(instrument_universe, InstrumentUniverse):
+        return instrument_universe.identifier_values(identifier_type, instrument_names)
+
+    return [instrument_universe[name]['identifiers'][identifier_type] for name in instrument_names]
+
+
+def fetch_instrument_universe(csv_file, paper=False):
+    """
+    This function loads the data from our instruments file and writes it to a dictionary
+    
+    Input
+    csv_file: The name of the csv file including the extension i.e. .csv
+    paper: Whether or not this is for the paper portfolios use case
+    
+    Output
+    instrument_universe: InstrumentUniverse containing the instrument universe, which can be used as a
+    dictionary keyed by instrument name. Use its to_dict method where a real dictionary is needed
+    """
+    
+    instruments = import_file(csv_file)
+    
+    if paper:
+        identifier_columns = {'Figi': 'figi', 'Isin': 'isin', 'Sedol': 'sedol', 'Ticker': 'ticker'}
+    else:
+        identifier_columns = {'ClientInternal': 'client_internal'}
+
+    identifiers = {identifier_type: instruments[column].tolist()
+                   for identifier_type, column in identifier_columns.items()}
+    # The LUIDs are back-filled once the instruments have been upserted
+    identifiers['LUID'] = [''] * len(instruments)
+
+    instrument_universe = InstrumentUniverse(
+        instruments['instrument_name'].tolist(), instruments['currency'].tolist(), identifiers)
+    
+    return instrument_universe
+
+
+def fetch_instrument_market_cap(csv_file):
+    """
+    This function loads the data from our instruments market cap file and writes it to a dictionary
+    
+    Input
+    csv_file: The name of the csv file including the extension i.e. .csv
+    
+    Output
+    instrument_market_cap: Dictionary containing the market capitalisations
+    """
+    
+    instruments = import_file(csv_file)
+    
+    
+    instrument_market_cap = dict(zip(instruments['instrument_name'].tolist(), instruments['marketcap'].tolist()))
+        
+    return instrument_market_cap
+
+
+def fetch_instrument_analytics(csv_file):
+    """
+    This function loads the data from our instruments market cap file and writes it to a dictionary
+    
+    Input
+    csv_file: The name of the csv file including the extension i.e. .csv
+    
+    Output
+    instrument_market_cap: Dictionary containing the market capitalisations
+    """
+    
+    instruments = import_file(csv_file)
+    
+    
+    instrument_analytics = dict(zip(
+        instruments['instrument_name'].tolist(),
+        zip(instruments['price_original'].tolist(), instruments['price_current'].tolist())))
+        
+    return instrument_analytics
+    
+
+def fetch_client_take_on_balances(csv_file):
+    """
+    This function loads the data from our take on balances file and writes it to a dictionary
+    
+    Input
+    csv_file: The name of the csv file including the extension i.e. .csv
+    
+    Output
+    client_holdings: Dictionary containing the client holdings
+    """
+    
+    # Selected by name, so a file with a different layout raises a KeyError rather than loading the wrong fields
+    holdings = import_file(csv_file)[['portfolio_name', 'instrument_name', 'quantity', 'price']]
+
+    # As each portfolio's dictionary is built with dict, a later row for the same instrument replaces the
+    # values of an earlier one but keeps its place
+    client_holdings = {
+        portfolio: dict(zip(portfolio_holdings['instrument_name'].tolist(),
+                            _records(portfolio_holdings[['quantity', 'price']])))
+        for portfolio, portfolio_holdings in holdings.groupby('portfolio_name', sort=False, dropna=False)
+    }
+    
+    return client_holdings
+
+
+def fetch_fund_accountant_daily_holdings_report(csv_file):
+    """
+    This function loads the data from our daily accountant report and writes it to a dictionary,
+    the logic is exactly the same as fetch_client_take_on_balances so we just use that.
+    
+    Input
+    csv_file: The name of the csv file including the extension i.e. .csv
+    
+    Output
+    fund_accountant_daily_holdings_report: Dictionary containing the client holdings
+    """
+    
+    fund_accountant_daily_holdings_report = fetch_client_take_on_balances(csv_file)
+    
+    return fund_accountant_daily_holdings_report
+
+
+
+# The hours after the open that client_transactions trades at by default, repeated for files with more
+# transactions than there are hours
+CLIENT_TRANSACTION_HOURS = [1, 5, 3, 8.2, 4, 2, 6, 8.3]
+
+# The length of the trading day in hours, over which the trade time distributions are spread
+TRADING_SESSION_HOURS = 8.5
+
+
+def trade_schedule(trade_open, size, hours=CLIENT_TRANSACTION_HOURS, settlement_days=None, seed=None, start=0):
+    """
+    This function generates the trade and settlement dates of a number of transactions, all at once rather
+    than one transaction at a time
+    
+    Input
+    trade_open: The time trading opens
+    size: The number of transactions
+    hours: When in the day each transaction trades. Either a list of hours after the open, which is
+    repeated for as many transactions as needed, or the name of a distribution over the trading session:
+    'uniform' for trades spread evenly through the day or 'u-shaped' for trades bunched around the open
+    and the close, as real trading volumes are
+    settlement_days: The number of days after its trade date each transaction settles. By default each
+    transaction settles as many days after the open as the hours after the open it trades
+    seed: The seed for the random number generator used by the distributions, or a numpy Generator
+    start: The position of the first transaction in the list of hours, when generating the schedule of a
+    file in chunks
+    
+    Output
+    trade_dates: DatetimeIndex containing the trade dates
+    settlement_dates: DatetimeIndex containing the settlement dates
+    """
+    
+    if isinstance(hours, str):
+        rng = np.random.default_rng(seed)
+        if hours == 'uniform':
+            trade_hours = rng.uniform(0, TRADING_SESSION_HOURS, size)
+        elif hours == 'u-shaped':
+            trade_hours = rng.beta(0.5, 0.5, size) * TRADING_SESSION_HOURS
+        else:
+            raise ValueError(f"Unsupported distribution {hours}, please use 'uniform' or 'u-shaped'")
+    else:
+        trade_hours = np.asarray(hours, dtype='float64')[(start + np.arange(size)) % len(hours)]
+    
+    # Round to whole microseconds, as timedelta does
+    trade_dates = pd.Timestamp(trade_open) + pd.to_timedelta(
+        np.round(trade_hours * 3600e6).astype('int64'), unit='us')
+    
+    if settlement_days is None:
+        settlement_dates = pd.Timestamp(trade_open) + pd.to_timedelta(
+            np.round(trade_hours * 86400e6).astype('int64'), unit='us')
+    else:
+        settlement_dates = trade_dates + pd.Timedelta(days=settlement_days)
+    
+    return trade_dates, settlement_dates
+
+
+def client_transactions(csv_file, instrument_universe, hours=CLIENT_TRANSACTION_HOURS, settlement_days=None,
+                        seed=None):
+    """
+    This function loads our transactions for our transactions export
+    
+    Input
+    csv_file: The name of the csv file including the extension i.e. .csv
+    instrument_universe: The instrument universe
+    hours: When in the day each transaction trades, see trade_schedule
+    settlement_days: The number of days after its trade date each transaction settles, see trade_schedule
+    seed: The seed for the random trade times when hours is a distribution
+    
+    Output
+    _client_transactions: Dictionary containing the client transactions
+    """
+        
+    yesterday = datetime.now(pytz.UTC) - timedelta(days=1)
+    t = time(hour=8, minute=0)
+    yesterday_trade_open = pytz.utc.localize(datetime.combine(yesterday, t))
+    transactions = import_file(csv_file)
+    
+    trade_dates, settlement_dates = trade_schedule(
+        yesterday_trade_open, len(transactions), hours, settlement_days, seed)
+    
+    columns = zip(
+        transactions['portfolio_name'].tolist(),
+        transactions['transaction_id'].tolist(),
+        transactions['type'].tolist(),
+        transactions['instrument_uid'].tolist(),
+        _identifier_values(instrument_universe, 'LUID', transactions['instrument_uid'].tolist()),
+        isoformat_utc(trade_dates),
+        isoformat_utc(settlement_dates),
+        transactions['units'].tolist(),
+        transactions['transaction_price'].tolist(),
+        transactions['transaction_currency'].tolist())
+    
+    _client_transactions = {}
+    
+    for portfolio, trans_id, ttype, instr_id, luid, trade_date, settlement_date, units, tprice, tcurrency in columns:
+        _client_transactions.setdefault(portfolio, {})[trans_id] = {'type': ttype,
+                                                                    'instrument_name': instr_id,
+                                                                    'instrument_uid': luid,
+                                                                    'transaction_date': trade_date,
+                                                                    'settlement_date': settlement_date,
+                                                                    'units': units,
+                                                                    'transaction_price': tprice,
+                                                                    'transaction_currency': tcurrency}
+                                                                       
+    return _client_transactions, yesterday_trade_open
+
+def random_trade_times(trade_open, days_back, size, seed=None):
+    """
+    This function generates random trade times during the first 8 hours of trading on each of a number of days
+    
+    Input
+    trade_open: The time trading opens on the first day
+    days_back: The number of days to spread the trades over
+    size: The number of trade times to generate
+    seed: The seed for the random number generator, the same seed always generates the same trade times
+    
+    Output
+    trade_times: DatetimeIndex containing the trade times
+    """
+    
+    rng = np.random.default_rng(seed)
+    
+    offsets = (pd.to_timedelta(rng.integers(0, days_back, size), unit='D')
+               + pd.to_timedelta(rng.integers(0, 9, size), unit='h')
+               + pd.to_timedelta(rng.integers(0, 60, size), unit='min')
+               + pd.to_timedelta(rng.integers(0, 60, size), unit='s')
+               + pd.to_timedelta(rng.integers(0, 1000000, size), unit='us'))
+    
+    return pd.Timestamp(trade_open) + offsets
+
+
+def isoformat_utc(dates):
+    """
+    This function formats dates as ISO 8601 strings in UTC, the same format as datetime.isoformat
+    
+    Input
+    dates: DatetimeIndex or datetime Series with a timezone
+    
+    Output
+    iso_dates: Array of ISO 8601 strings
+    """
+    
+    # numpy formats whole arrays far faster than strftime, but has no timezone support so we add the offset
+    utc_dates = pd.DatetimeIndex(dates).tz_convert('UTC').tz_localize(None).to_numpy()
+    iso_dates = np.datetime_as_string(utc_dates, unit='us')
+    
+    # Like datetime.isoformat, leave out the microseconds of dates on a whole second
+    whole_seconds = utc_dates.astype('datetime64[us]').astype('int64') % 1000000 == 0
+    iso_dates = np.where(whole_seconds, iso_dates.astype('<U19'), iso_dates)
+    
+    return np.char.add(iso_dates, '+00:00').astype(object)
+
+
+def fetch_client_transactions(csv_file, days_back, seed=None):
+    """
+    This function loads the data from our transactions file and gives each transaction a random
+    transaction date within the last days_back days, settling two days later.
+    
+    Input
+    csv_file: The name of the csv file including the extension i.e. .csv
+    days_back: The number of days to spread the transactions over
+    seed: The seed for the random transaction dates, pass a seed for reproducible transactions
+    
+    Output
+    _client_transactions: Dictionary containing the client transactions
+    """
+        
+    days_ago = datetime.now(pytz.UTC) - timedelta(days=days_back)
+    t = time(hour=8, minute=0)
+    days_ago_trade_open = pytz.utc.localize(datetime.combine(days_ago, t))
+    
+    transactions = import_file(csv_file)
+                                                                       
+    return _fetched_transactions_frame(transactions, days_ago_trade_open, days_back, seed)
+
+
+def _fetched_transactions_frame(transactions, trade_open, days_back, seed):
+    """
+    This function converts rows of a transactions file into the client transactions returned by
+    fetch_client_transactions, with random transaction dates
+    """
+
+    transaction_dates = random_trade_times(trade_open, days_back, len(transactions), seed)
+
+    # Use the FIGI where there is one, otherwise the currency for cash
+    identifiers = transactions['figi'].where(transactions['figi'].notna(), transactions['currency'])
+
+    __client_transactions = pd.DataFrame(data={
+        'transaction_id': transactions['transaction_id'],
+        'type': transactions['transaction_type'],
+        'portfolio': transactions['portfolio_name'],
+        'instrument_name': transactions['instrument_name'],
+        'instrument_uid': identifiers,
+        'transaction_date': isoformat_utc(transaction_dates),
+        'settlement_date': isoformat_utc(transaction_dates + pd.Timedelta(days=2)),
+        'units': transactions['transaction_units'],
+        'transaction_price': transactions['transaction_price'],
+        'transaction_currency': transactions['transaction_currency'],
+        'total_cost': transactions['transaction_cost'],
+        'strategy': transactions['transaction_strategy'],
+        'description': transactions['transaction_description']}
+    )
+
+    return __client_transactions
+
+
+def _records(frame):
+    """
+    This function converts a DataFrame to a list of dictionaries, one for each row, with python rather
+    than numpy values. It is much faster than DataFrame.to_dict(orient='records') for large frames.
+    """
+    
+    columns = frame.columns.tolist()
+    
+    return [dict(zip(columns, row)) for row in zip(*(frame[column].tolist() for column in columns))]
+
+
+# The number of transactions in each batch yielded by the streaming transaction loaders, small enough for a
+# single upsert_transactions call
+TRANSACTION_BATCH_SIZE = 2000
+
+# The most batches worth of transactions the streaming loaders hold back across all portfolios, waiting for
+# each portfolio's batch to fill up
+MAX_BUFFERED_BATCHES = 4
+
+
+def _portfolio_batches(chunks, portfolio_column, batch_size, to_transactions, max_buffered=None):
+    """
+    This function regroups chunks of a transactions file into batches of transactions for a single
+    portfolio. Partly filled batches are held back until they fill up, but once more than max_buffered
+    transactions are held back across all portfolios the fullest batch is yielded early, so memory use is
+    bounded by max_buffered plus one chunk however many portfolios are in the file.
+    """
+    
+    max_buffered = max_buffered or MAX_BUFFERED_BATCHES * batch_size
+    pending = {}
+    buffered = 0
+    
+    for chunk in chunks:
+        for portfolio, portfolio_rows in chunk.groupby(portfolio_column, sort=False):
+            batch = pending.setdefault(portfolio, [])
+            buffered -= len(batch)
+            batch.extend(to_transactions(portfolio_rows))
+            
+            while len(batch) >= batch_size:
+                yield portfolio, batch[:batch_size]
+                del batch[:batch_size]
+            
+            if batch:
+                buffered += len(batch)
+            else:
+                del pending[portfolio]
+            
+            while buffered > max_buffered:
+                fullest = max(pending, key=lambda name: len(pending[name]))
+                batch = pending.pop(fullest)
+                buffered -= len(batch)
+                yield fullest, batch
+    
+    for portfolio, batch in pending.items():
+        yield portfolio, batch
+
+
+def stream_client_transactions(csv_file, instrument_universe, batch_size=TRANSACTION_BATCH_SIZE,
+                               as_requests=False, hours=CLIENT_TRANSACTION_HOURS, settlement_days=None, seed=None):
+    """
+    This function is the streaming version of client_transactions. It reads our transactions file a chunk
+    at a time and yields batches of transactions for one portfolio, each small enough for a single
+    upsert_transactions call, so that files of any size can be loaded with bounded memory. The trade times
+    follow the same schedule as client_transactions.
+    
+    Input
+    csv_file: The name of the csv file including the extension i.e. .csv
+    instrument_universe: The instrument universe, with the LUID of each instrument populated
+    batch_size: The maximum number of transactions in each batch
+    as_requests: Whether to yield TransactionRequests rather than dictionaries
+    hours: When in the day each transaction trades, see trade_schedule
+    settlement_days: The number of days after its trade date each transaction settles, see trade_schedule
+    seed: The seed for the random trade times when hours is a distribution
+    
+    Output
+    batches: Iterator of (portfolio name, list of transactions) tuples
+    """
+    
+    yesterday = datetime.now(pytz.UTC) - timedelta(days=1)
+    t = time(hour=8, minute=0)
+    yesterday_trade_open = pytz.utc.localize(datetime.combine(yesterday, t))
+    
+    # One generator for the whole file, so chunks do not repeat each other's trade times
+    rng = np.random.default_rng(seed)
+    
+    def scheduled(chunks):
+        # The schedule is by row number in the file, so it is generated before rows are grouped by portfolio
+        for chunk in chunks:
+            trade_dates, settlement_dates = trade_schedule(
+                yesterday_trade_open, len(chunk), hours, settlement_days, rng, start=chunk.index[0])
+            yield chunk.assign(transaction_date=isoformat_utc(trade_dates),
+                               settlement_date=isoformat_utc(settlement_dates))
+    
+    def to_transactions(transactions):
+        batch = _records(pd.DataFrame(data={
+            'transaction_id': transactions['transaction_id'],
+            'type': transactions['type'],
+            'instrument_name': transactions['instrument_uid'],
+            'instrument_uid': _identifier_values(
+                instrument_universe, 'LUID', transactions['instrument_uid'].tolist()),
+            'transaction_date': transactions['transaction_date'],
+            'settlement_date': transactions['settlement_date'],
+            'units': transactions['units'],
+            'transaction_price': transactions['transaction_price'],
+            'transaction_currency': transactions['transaction_currency']}
+        ))
+        
+        if as_requests:
+            return [transaction_request(
+                        transaction,
+                        {'Instrument/default/LusidInstrumentId': transaction['instrument_uid']},
+                        transaction['units'] * transaction['transaction_price'])
+                    for transaction in batch]
+        return batch
+    
+    yield from _portfolio_batches(
+        scheduled(import_file_chunks(csv_file, batch_size)), 'portfolio_name', batch_size, to_transactions)
+
+
+def stream_fetch_client_transactions(csv_file, days_back, batch_size=TRANSACTION_BATCH_SIZE, seed=None,
+                                     as_requests=False, strategy_property_key=None):
+    """
+    This function is the streaming version of fetch_client_transactions. It reads our transactions file a
+    chunk at a time and yields batches of transactions for one portfolio, each small enough for a single
+    upsert_transactions call, so that files of any size can be loaded with bounded memory. With the same
+    seed and batch size the same transaction dates are generated every time.
+    
+    Input
+    csv_file: The name of the csv file including the extension i.e. .csv
+    days_back: The number of days to spread the transactions over
+    batch_size: The maximum number of transactions in each batch
+    seed: The seed for the random transaction dates, pass a seed for reproducible transactions
+    as_requests: Whether to yield TransactionRequests rather than dictionaries
+    strategy_property_key: The key of the transaction property to save each transaction's strategy in
+    when yielding TransactionRequests
+    
+    Output
+    batches: Iterator of (portfolio name, list of transactions) tuples
+    """
+    
+    days_ago = datetime.now(pytz.UTC) - timedelta(days=days_back)
+    t = time(hour=8, minute=0)
+    days_ago_trade_open = pytz.utc.localize(datetime.combine(days_ago, t))
+    
+    # A single generator is shared by every chunk so that each chunk gets different dates
+    rng = np.random.default_rng(seed)
+    
+    def to_transactions(transactions):
+        batch = _records(_fetched_transactions_frame(transactions, days_ago_trade_open, days_back, rng))
+        
+        if as_requests:
+            return [transaction_request(
+                        transaction,
+                        {'Instrument/default/Figi': transaction['instrument_uid']},
+                        transaction['total_cost'],
+                        {strategy_property_key: transaction['strategy']} if strategy_property_key else None)
+                    for transaction in batch]
+        return batch
+    
+    yield from _portfolio_batches(
+        import_file_chunks(csv_file, batch_size), 'portfolio_name', batch_size, to_transactions)
+
+
+def transaction_request(transaction, instrument_identifiers, total_consideration, properties=None):
+    """
+    This function creates a request to upsert one of our client transactions
+    
+    Input
+    transaction: Dictionary containing the transaction
+    instrument_identifiers: The identifiers of the instrument the transaction is in
+    total_consideration: The total consideration of the transaction in the transaction currency
+    properties: Dictionary of label values to set on the transaction, keyed by property key
+    
+    Output
+    request: TransactionRequest for the transaction
+    """
+    
+    return lusid.models.TransactionRequest(
+        transaction_id=transaction['transaction_id'],
+        type=transaction['type'],
+        instrument_identifiers=instrument_identifiers,
+        transaction_date=transaction['transaction_date'],
+        settlement_date=transaction['settlement_date'],
+        units=transaction['units'],
+        transaction_price=lusid.models.TransactionPrice(
+            price=transaction['transaction_price'],
+            type='Price'),
+        total_consideration=lusid.models.CurrencyAndAmount(
+            amount=total_consideration,
+            currency=transaction['transaction_currency']),
+        source='Client',
+        transaction_currency=transaction['transaction_currency'],
+        properties={
+            key: lusid.models.PerpetualProperty(key=key, value=lusid.models.PropertyValue(label_value=value))
+            for key, value in properties.items()} if properties else None)
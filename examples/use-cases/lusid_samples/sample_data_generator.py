@@ -0,0 +1,413 @@
+"""
+Generates the sample data files read by lusid_sample_data at realistic volumes, for load testing the helper
+pipelines. The files have the same layout and column types as the sample files, so they can be loaded with
+fetch_instrument_universe, fetch_client_take_on_balances, client_transactions and fetch_client_transactions.
+
+The large files are generated in parts across a process pool, e.g. from the use-cases folder
+
+    python -m lusid_samples.sample_data_generator --instruments 100000 --portfolios 1000 \
+        --transactions 10000000 --output-dir data-synthetic
+"""
+import argparse
+import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from .lusid_sample_data import SAMPLE_FILE_SCHEMAS
+
+# The share of instruments issued in each currency, and the exchange they are listed on
+CURRENCIES = {'GBP': 0.5, 'USD': 0.35, 'EUR': 0.15}
+EXCHANGES = {'GBP': 'LondonStockEx', 'USD': 'Nasdaq', 'EUR': 'Euronext'}
+COUNTRIES = {'GBP': 'united_kingdom', 'USD': 'united_states_america', 'EUR': 'france'}
+
+# The share of instruments which are government bonds rather than equities
+BOND_SHARE = 0.1
+
+STRATEGIES = ['quantitativeSignal', 'incomeRequirements', 'sectorRotation', 'riskReduction']
+
+# The share of paper transactions which are brokerage fees paid in cash
+FEE_SHARE = 0.05
+
+# Activity is concentrated in a few instruments and portfolios, following Zipf's law with this exponent
+ZIPF_EXPONENT = 1.1
+
+# The number of rows each worker generates and writes at a time
+ROWS_PER_PART = 1000000
+
+FILES = ['instruments.csv', 'paper-instruments.csv', 'portfolios.csv', 'holdings.csv', 'transactions.csv',
+         'paper-transactions.csv']
+
+# The instruments and portfolios the holdings and transactions are generated from, set in each worker
+_universe = {}
+
+
+def zipf_weights(size):
+    """
+    This function returns the probability of picking each of a number of items, with the first items far
+    more likely to be picked than the last
+
+    Input
+    size: The number of items
+
+    Output
+    weights: Array of probabilities summing to 1
+    """
+
+    weights = 1.0 / np.arange(1, size + 1) ** ZIPF_EXPONENT
+
+    return weights / weights.sum()
+
+
+def generate_instruments(count, rng):
+    """
+    This function generates an instrument universe with unique identifiers, in the layout of instruments.csv
+    with the sedol column of paper-instruments.csv, and a typical price for each instrument
+
+    Input
+    count: The number of instruments
+    rng: numpy random Generator
+
+    Output
+    instruments: DataFrame containing the instruments
+    """
+
+    index = np.arange(count)
+    currency = rng.choice(list(CURRENCIES), size=count, p=list(CURRENCIES.values()))
+    bond = rng.random(count) < BOND_SHARE
+    ticker = np.char.add('T', index.astype(str))
+    coupon = np.round(rng.uniform(0.5, 6.0, count) * 4) / 4
+
+    number = pd.Series(index.astype(str))
+    exchange = pd.Series(currency).map(EXCHANGES)
+    instrument_name = np.where(
+        bond,
+        'GovernmentBond' + number + '_' + pd.Series(coupon.astype(str)),
+        'Company' + number + '_' + exchange + '_' + ticker)
+
+    return pd.DataFrame(data={
+        'instrument_name': instrument_name,
+        'client_internal': np.char.add('imd_', np.char.zfill(index.astype(str), 8)),
+        'currency': currency,
+        'isin': np.char.add(np.char.add('XS', np.char.zfill(index.astype(str), 9)), '0'),
+        'figi': np.char.add('BBGS', np.char.zfill(index.astype(str), 8)),
+        'exchange_code': exchange.str[:2].str.upper(),
+        'country_issue': pd.Series(currency).map(COUNTRIES),
+        'ticker': ticker,
+        'market_sector': np.where(bond, 'government', 'equity'),
+        'security_type': np.where(bond, 'bond', 'common_stock'),
+        'coupon': np.where(bond, coupon, np.nan),
+        'sedol': np.char.zfill(index.astype(str), 7),
+        'price': np.round(rng.lognormal(np.log(20), 1.0, count), 4)}
+    )
+
+
+def generate_portfolios(count):
+    """
+    This function generates portfolios in groups of five, in the layout of portfolios.csv
+
+    Input
+    count: The number of portfolios
+
+    Output
+    portfolios: DataFrame containing the portfolios
+    """
+
+    index = np.arange(count)
+
+    return pd.DataFrame(data={
+        'portfolio_group_name': np.char.add(np.char.add('client-', (index // 5).astype(str)), '-portfolios'),
+        'portfolio_name': np.char.add(np.char.add('client-', (index // 5).astype(str)),
+                                      np.char.add('-strategy-', (index % 5).astype(str)))}
+    )
+
+
+def generate_holdings(start, stop, holdings_per_portfolio, rng):
+    """
+    This function generates the holdings of a range of portfolios, in the layout of holdings.csv. Popular
+    instruments are held by more portfolios.
+
+    Input
+    start: The index of the first portfolio
+    stop: The index after the last portfolio
+    holdings_per_portfolio: The number of holdings in each portfolio, fewer if an instrument is picked twice
+    rng: numpy random Generator
+
+    Output
+    holdings: DataFrame containing the holdings
+    """
+
+    instruments, portfolios = _universe['instruments'], _universe['portfolios']
+
+    portfolio = np.repeat(np.arange(start, stop), holdings_per_portfolio)
+    instrument = rng.choice(len(instruments), size=len(portfolio), p=_universe['instrument_weights'])
+
+    holdings = pd.DataFrame(data={
+        'portfolio_group_name': portfolios['portfolio_group_name'].to_numpy()[portfolio],
+        'portfolio_name': portfolios['portfolio_name'].to_numpy()[portfolio],
+        'instrument_name': instruments['instrument_name'].to_numpy()[instrument],
+        'quantity': np.maximum(rng.lognormal(np.log(50000), 1.5, len(portfolio)), 1).astype('int64'),
+        'price': instruments['price'].to_numpy()[instrument]}
+    )
+
+    return holdings.drop_duplicates(subset=['portfolio_name', 'instrument_name'])
+
+
+def generate_transactions(start, stop, rng):
+    """
+    This function generates a range of the client transactions, in the layout of transactions.csv. Most
+    trades are in the most popular instruments by the most active portfolios, at prices close to the
+    typical price of the instrument.
+
+    Input
+    start: The index of the first transaction
+    stop: The index after the last transaction
+    rng: numpy random Generator
+
+    Output
+    transactions: DataFrame containing the transactions
+    """
+
+    instruments, portfolios = _universe['instruments'], _universe['portfolios']
+    size = stop - start
+
+    portfolio = rng.choice(len(portfolios), size=size, p=_universe['portfolio_weights'])
+    instrument = rng.choice(len(instruments), size=size, p=_universe['instrument_weights'])
+
+    return pd.DataFrame(data={
+        'portfolio_group_name': portfolios['portfolio_group_name'].to_numpy()[portfolio],
+        'portfolio_name': portfolios['portfolio_name'].to_numpy()[portfolio],
+        'transaction_id': np.char.add('tid_', np.char.zfill(np.arange(start, stop).astype(str), 12)),
+        'instrument_uid': instruments['instrument_name'].to_numpy()[instrument],
+        'type': np.where(rng.random(size) < 0.55, 'Buy', 'Sell'),
+        'units': np.maximum(rng.lognormal(np.log(5000), 1.5, size), 1).astype('int64'),
+        'transaction_price': np.round(
+            instruments['price'].to_numpy()[instrument] * (1 + rng.normal(0, 0.02, size)), 4),
+        'transaction_currency': instruments['currency'].to_numpy()[instrument]}
+    )
+
+
+def generate_paper_transactions(start, stop, rng):
+    """
+    This function generates a range of the paper transactions, in the layout of paper-transactions.csv, with
+    a share of them being brokerage fees paid in cash
+
+    Input
+    start: The index of the first transaction
+    stop: The index after the last transaction
+    rng: numpy random Generator
+
+    Output
+    transactions: DataFrame containing the transactions
+    """
+
+    transactions = generate_transactions(start, stop, rng)
+    instruments = _universe['instruments']
+    size = stop - start
+
+    fee = rng.random(size) < FEE_SHARE
+    buy = transactions['type'].to_numpy() == 'Buy'
+    currency = transactions['transaction_currency'].to_numpy()
+    units = transactions['units'].to_numpy()
+    price = np.where(fee, 0.005, transactions['transaction_price'].to_numpy())
+    figi = pd.Series(transactions['instrument_uid']).map(
+        pd.Series(instruments['figi'].to_numpy(), index=instruments['instrument_name'])).to_numpy()
+
+    return pd.DataFrame(data={
+        'portfolio_name': transactions['portfolio_name'],
+        'transaction_id': transactions['transaction_id'],
+        'instrument_name': np.where(fee, np.char.add(currency.astype(str), '_Cash'),
+                                    transactions['instrument_uid']),
+        'transaction_description': np.where(fee, 'Brokerage Fees', np.where(buy, 'Purchase', 'Sale')),
+        'transaction_type': np.where(fee, 'FundsOut', transactions['type']),
+        'transaction_units': units,
+        'transaction_price': price,
+        'transaction_currency': currency,
+        'transaction_strategy': rng.choice(STRATEGIES, size=size),
+        'transaction_cost': np.round(units * price, 4),
+        'figi': np.where(fee, None, figi),
+        'currency': currency}
+    )
+
+
+def _init_worker(instruments, portfolios):
+    """
+    This function shares the instruments and portfolios with a worker process, once rather than with every part
+    """
+
+    _universe['instruments'] = instruments
+    _universe['portfolios'] = portfolios
+    _universe['instrument_weights'] = zipf_weights(len(instruments))
+    _universe['portfolio_weights'] = zipf_weights(len(portfolios))
+
+
+def _write_part(file_name, start, stop, seed, path, file_format, holdings_per_portfolio):
+    """
+    This function generates one part of a file and writes it, returning the number of rows written
+    """
+
+    rng = np.random.default_rng(seed)
+
+    if file_name == 'holdings.csv':
+        data = generate_holdings(start, stop, holdings_per_portfolio, rng)
+    elif file_name == 'transactions.csv':
+        data = generate_transactions(start, stop, rng)
+    else:
+        data = generate_paper_transactions(start, stop, rng)
+
+    write_file(data, file_name, path, file_format, header=start == 0)
+
+    return len(data)
+
+
+def write_file(data, file_name, path, file_format, header=True):
+    """
+    This function writes generated data with the column types of the sample file it is standing in for
+
+    Input
+    data: DataFrame containing the data
+    file_name: The name of the sample file, used to look up its schema
+    path: The path to write the data to
+    file_format: Either 'csv' or 'parquet'
+    header: Whether to write the column names, when writing csv
+    """
+
+    dtype = SAMPLE_FILE_SCHEMAS[file_name]['dtype']
+    data = data[list(dtype)].astype({column: t for column, t in dtype.items() if t is not str})
+
+    if file_format == 'parquet':
+        data.to_parquet(path, index=False)
+        return
+
+    try:
+        import pyarrow
+        import pyarrow.csv
+    except ImportError:
+        data.to_csv(path, index=False, header=header)
+        return
+
+    # pyarrow writes csv many times faster than pandas
+    pyarrow.csv.write_csv(
+        pyarrow.Table.from_pandas(data, preserve_index=False), path,
+        write_options=pyarrow.csv.WriteOptions(include_header=header, quoting_style='needed'))
+
+
+def generate(output_dir, instruments, portfolios, transactions, holdings_per_portfolio=25, file_format='csv',
+             files=None, workers=None, seed=0, rows_per_part=ROWS_PER_PART):
+    """
+    This function generates sample data files. The holdings and transactions files are generated in parts
+    across a pool of processes. For csv the parts are then joined into a single file, so the file can be
+    read with import_file, for parquet each file is a folder of parts which pandas.read_parquet reads as one.
+    The same seed always generates the same data.
+
+    Input
+    output_dir: The folder to write the files to
+    instruments: The number of instruments
+    portfolios: The number of portfolios
+    transactions: The number of transactions in each transactions file
+    holdings_per_portfolio: The number of holdings in each portfolio
+    file_format: Either 'csv' or 'parquet'
+    files: The names of the files to generate, all of them by default
+    workers: The maximum number of worker processes, the number of CPUs by default
+    seed: The seed for the random number generator
+    rows_per_part: The number of rows each worker generates at a time
+
+    Output
+    rows: Dictionary containing the number of rows written to each file
+    """
+
+    if file_format not in ('csv', 'parquet'):
+        raise ValueError(f"Unsupported file format {file_format}, please use 'csv' or 'parquet'")
+
+    files = FILES if files is None else files
+    os.makedirs(output_dir, exist_ok=True)
+
+    def output_path(file_name):
+        return os.path.join(output_dir, file_name if file_format == 'csv' else
+                            f"{os.path.splitext(file_name)[0]}.parquet")
+
+    seeds = np.random.SeedSequence(seed)
+    instrument_seed, *file_seeds = seeds.spawn(1 + len(FILES))
+    file_seeds = dict(zip(FILES, file_seeds))
+
+    instrument_data = generate_instruments(instruments, np.random.default_rng(instrument_seed))
+    portfolio_data = generate_portfolios(portfolios)
+    rows = {}
+
+    for file_name, data in [('instruments.csv', instrument_data), ('paper-instruments.csv', instrument_data),
+                            ('portfolios.csv', portfolio_data)]:
+        if file_name in files:
+            write_file(data, file_name, output_path(file_name), file_format)
+            rows[file_name] = len(data)
+
+    # Each part covers a range of portfolios for the holdings and a range of transactions otherwise
+    parts = []
+    for file_name in ['holdings.csv', 'transactions.csv', 'paper-transactions.csv']:
+        if file_name not in files:
+            continue
+
+        if file_name == 'holdings.csv':
+            count, step = portfolios, max(rows_per_part // holdings_per_portfolio, 1)
+        else:
+            count, step = transactions, rows_per_part
+
+        path = output_path(file_name)
+        if file_format == 'parquet':
+            shutil.rmtree(path, ignore_errors=True)
+            os.makedirs(path)
+
+        starts = range(0, count, step)
+        for part, (start, part_seed) in enumerate(zip(starts, file_seeds[file_name].spawn(len(starts)))):
+            part_path = os.path.join(path, f"part-{part:05d}.parquet") if file_format == 'parquet' else \
+                f"{path}.part-{part:05d}"
+            parts.append((file_name, start, min(start + step, count), part_seed, part_path))
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(instrument_data, portfolio_data)) as executor:
+        futures = [executor.submit(_write_part, file_name, start, stop, part_seed, part_path, file_format,
+                                   holdings_per_portfolio)
+                   for file_name, start, stop, part_seed, part_path in parts]
+        for (file_name, *_), future in zip(parts, futures):
+            rows[file_name] = rows.get(file_name, 0) + future.result()
+
+    if file_format == 'csv':
+        # Only the first part of each file has the column names, so the parts can simply be appended
+        for file_name in {file_name for file_name, *_ in parts}:
+            with open(output_path(file_name), 'wb') as output:
+                for part_file_name, *_, part_path in parts:
+                    if part_file_name == file_name:
+                        with open(part_path, 'rb') as part:
+                            shutil.copyfileobj(part, output)
+                        os.remove(part_path)
+
+    return rows
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Generates sample data files at realistic volumes")
+    arg_parser.add_argument("--instruments", type=int, default=10000, help="number of instruments")
+    arg_parser.add_argument("--portfolios", type=int, default=100, help="number of portfolios")
+    arg_parser.add_argument("--transactions", type=int, default=1000000,
+                            help="number of transactions in each transactions file")
+    arg_parser.add_argument("--holdings-per-portfolio", type=int, default=25, help="holdings in each portfolio")
+    arg_parser.add_argument("--format", choices=["csv", "parquet"], default="csv", help="file format to write")
+    arg_parser.add_argument("--files", nargs="+", choices=FILES, default=FILES, help="files to generate")
+    arg_parser.add_argument("--output-dir", default="data-synthetic", help="folder to write the files to")
+    arg_parser.add_argument("--workers", type=int, default=None, help="maximum number of worker processes")
+    arg_parser.add_argument("--seed", type=int, default=0, help="seed for the random number generator")
+    arg_parser.add_argument("--rows-per-part", type=int, default=ROWS_PER_PART,
+                            help="rows each worker generates at a time")
+    args = arg_parser.parse_args()
+
+    rows = generate(args.output_dir, args.instruments, args.portfolios, args.transactions,
+                    holdings_per_portfolio=args.holdings_per_portfolio, file_format=args.format, files=args.files,
+                    workers=args.workers, seed=args.seed, rows_per_part=args.rows_per_part)
+
+    for file_name, count in rows.items():
+        print(f"{file_name}: {count} rows")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""
+The lusid_sample_data loaders as they were before they were rewritten to work a column at a time, building their
+results a row at a time. The tests check the current loaders give the same results as these on the sample files.
+"""
+from datetime import datetime, time, timedelta
+
+import numpy as np
+import pandas as pd
+import pytz
+
+
+def import_file(csv_file):
+    return pd.read_csv('./data/{}'.format(csv_file))
+
+
+def fetch_portfolio_names(csv_file):
+    portfolios = import_file(csv_file)
+
+    client_portfolios = {}
+
+    for index, portfolio_group, portfolio in portfolios.itertuples():
+        client_portfolios.setdefault(portfolio_group, []).append(portfolio)
+
+    return client_portfolios
+
+
+def fetch_instrument_universe(csv_file, paper=False):
+    instruments = import_file(csv_file)
+
+    instrument_universe = {}
+
+    if paper:
+        instruments = instruments.loc[:, ['instrument_name', 'currency', 'figi', 'ticker', 'isin', 'sedol']]
+        for index, instrument_name, currency, figi, ticker, isin, sedol in instruments.itertuples():
+            instrument_universe[instrument_name] = {'identifiers': {'Figi': figi,
+                                                                    'Isin': isin,
+                                                                    'Sedol': sedol,
+                                                                    'Ticker': ticker,
+                                                                    'LUID': ''},
+                                                    'currency': currency}
+    else:
+        instruments = instruments.loc[:, ['instrument_name', 'client_internal', 'currency']]
+        for index, instrument_name, client_internal, currency in instruments.itertuples():
+            instrument_universe[instrument_name] = {'identifiers': {'ClientInternal': client_internal,
+                                                                    'LUID': ''},
+                                                    'currency': currency}
+
+    return instrument_universe
+
+
+def fetch_instrument_market_cap(csv_file):
+    instruments = import_file(csv_file)
+
+    instrument_market_cap = {}
+
+    instruments = instruments.loc[:, ['instrument_name', 'marketcap']]
+
+    for index, instrument_name, marketcap in instruments.itertuples():
+        instrument_market_cap[instrument_name] = marketcap
+
+    return instrument_market_cap
+
+
+def fetch_instrument_analytics(csv_file):
+    instruments = import_file(csv_file)
+
+    instrument_analytics = {}
+
+    instruments = instruments.loc[:, ['instrument_name', 'price_original', 'price_current']]
+
+    for index, instrument_name, price_original, price_current in instruments.itertuples():
+        instrument_analytics[instrument_name] = (price_original, price_current)
+
+    return instrument_analytics
+
+
+def fetch_client_take_on_balances(csv_file):
+    holdings = import_file(csv_file)
+
+    client_holdings = {}
+
+    for portfolio in holdings.loc[:, 'portfolio_name'].unique():
+        client_holdings[portfolio] = {}
+
+    for index, portfolio_group, portfolio, instrument_name, quantity, price in holdings.itertuples():
+        client_holdings[portfolio][instrument_name] = {'quantity': quantity,
+                                                       'price': price}
+
+    return client_holdings
+
+
+def client_transactions(csv_file, instrument_universe):
+    yesterday = datetime.now(pytz.UTC) - timedelta(days=1)
+    t = time(hour=8, minute=0)
+    yesterday_trade_open = pytz.utc.localize(datetime.combine(yesterday, t))
+    transactions = import_file(csv_file)
+
+    hours = [1, 5, 3, 8.2, 4, 2, 6, 8.3]
+
+    _client_transactions = {}
+
+    for portfolio in transactions.loc[:, 'portfolio_name'].unique():
+        _client_transactions[portfolio] = {}
+
+    for index, portfolio_group, portfolio, trans_id, instr_id, ttype, units, tprice, tcurrency in transactions.itertuples():
+        hour = hours[0]
+        hours.pop(0)
+
+        _client_transactions[portfolio][trans_id] = {'type': ttype,
+                                                     'instrument_name': instr_id,
+                                                     'instrument_uid': instrument_universe[instr_id]['identifiers']['LUID'],
+                                                     'transaction_date': (yesterday_trade_open + timedelta(hours=hour)).isoformat(),
+                                                     'settlement_date': (yesterday_trade_open + timedelta(days=hour)).isoformat(),
+                                                     'units': units,
+                                                     'transaction_price': tprice,
+                                                     'transaction_currency': tcurrency}
+
+    return _client_transactions, yesterday_trade_open
+
+
+def fetch_client_transactions(csv_file, days_back, transaction_dates):
+    """
+    As fetch_client_transactions was, except that the transaction dates are given rather than random, so the
+    rest of each transaction can be compared
+    """
+    transactions = import_file(csv_file)
+
+    _client_transactions = []
+
+    for (index, transaction), transaction_date in zip(transactions.iterrows(), transaction_dates):
+
+        if transaction['figi'] is not np.nan:
+            identifier = transaction['figi']
+        else:
+            identifier = transaction['currency']
+
+        _client_transactions.append(
+            {'transaction_id': transaction['transaction_id'],
+             'type': transaction['transaction_type'],
+             'portfolio': transaction['portfolio_name'],
+             'instrument_name': transaction['instrument_name'],
+             'instrument_uid': identifier,
+             'transaction_date': transaction_date.isoformat(),
+             'settlement_date': (transaction_date + timedelta(days=2)).isoformat(),
+             'units': transaction['transaction_units'],
+             'transaction_price': transaction['transaction_price'],
+             'transaction_currency': transaction['transaction_currency'],
+             'total_cost': transaction['transaction_cost'],
+             'strategy': transaction['transaction_strategy'],
+             'description': transaction['transaction_description'],
+             'portfolio': transaction['portfolio_name']}
+        )
+
+    return pd.DataFrame(data=_client_transactions)
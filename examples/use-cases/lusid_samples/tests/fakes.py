@@ -0,0 +1,39 @@
+import types
+
+import lusid
+
+
+class FakeApiFactory:
+    """
+    Stands in for lusid.utilities.ApiClientFactory in tests. Builds the stub given for a LUSID api, by the name of
+    its class, or otherwise a new instance of the api class as ApiClientFactory does, recording each build
+
+    Parameters
+    ----------
+    connection_pool_maxsize : int
+        The connection pool size of the fake api client
+    apis
+        Api stubs by class name, for example InstrumentsApi=stub
+    """
+
+    def __init__(self, connection_pool_maxsize=4, **apis):
+        self.apis = apis
+        self.built = []
+        self.api_client = types.SimpleNamespace(
+            configuration=types.SimpleNamespace(connection_pool_maxsize=connection_pool_maxsize),
+            rest_client=types.SimpleNamespace(pool_manager=types.SimpleNamespace(pools={})))
+
+    def build(self, api_class):
+        self.built.append(api_class)
+        api = self.apis.get(api_class.__name__)
+        return api if api is not None else api_class()
+
+
+def api_exception(status, retry_after=None):
+    """
+    Returns the error a LUSID api raises for a response with the given status and, if any, Retry-After header
+    """
+    error = lusid.ApiException(status=status)
+    if retry_after is not None:
+        error.headers = {"Retry-After": retry_after}
+    return error
@@ -0,0 +1,77 @@
+import gc
+import threading
+import unittest
+import weakref
+
+from fakes import FakeApiFactory
+from lusid_samples.api_registry import ApiRegistry, registry_for
+
+
+class InstrumentsApi:
+    pass
+
+
+class PortfoliosApi:
+    pass
+
+
+class ApiRegistryTests(unittest.TestCase):
+
+    def test_builds_each_api_once(self):
+        api_factory = FakeApiFactory()
+        registry = ApiRegistry(api_factory)
+
+        instruments_api = registry.build(InstrumentsApi)
+        self.assertIs(registry.build(InstrumentsApi), instruments_api)
+        self.assertIsInstance(registry.build(PortfoliosApi), PortfoliosApi)
+        registry.build(PortfoliosApi)
+
+        self.assertListEqual(api_factory.built, [InstrumentsApi, PortfoliosApi])
+        self.assertDictEqual(registry.stats(), {
+            "apis": ["InstrumentsApi", "PortfoliosApi"], "builds": 2, "hits": 2, "pools": []})
+
+    def test_builds_each_api_once_across_threads(self):
+        api_factory = FakeApiFactory()
+        registry = ApiRegistry(api_factory)
+        apis = []
+        start = threading.Barrier(8)
+
+        def build():
+            start.wait()
+            apis.append(registry.build(InstrumentsApi))
+
+        threads = [threading.Thread(target=build) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertListEqual(api_factory.built, [InstrumentsApi])
+        self.assertEqual(len({id(api) for api in apis}), 1)
+
+    def test_pool_size(self):
+        self.assertEqual(ApiRegistry(FakeApiFactory(connection_pool_maxsize=12)).pool_size(), 12)
+
+    def test_registry_is_shared_per_api_factory(self):
+        first = FakeApiFactory()
+        second = FakeApiFactory()
+
+        self.assertIs(registry_for(first), registry_for(first))
+        self.assertIsNot(registry_for(first), registry_for(second))
+
+        registry_for(first).build(InstrumentsApi)
+        registry_for(first).build(InstrumentsApi)
+        registry_for(second).build(InstrumentsApi)
+
+        self.assertListEqual(first.built, [InstrumentsApi])
+        self.assertListEqual(second.built, [InstrumentsApi])
+
+    def test_registry_does_not_keep_api_factory_alive(self):
+        api_factory = FakeApiFactory()
+        collected = weakref.ref(api_factory)
+        registry_for(api_factory).build(InstrumentsApi)
+
+        del api_factory
+        gc.collect()
+
+        self.assertIsNone(collected())
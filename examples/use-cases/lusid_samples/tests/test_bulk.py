@@ -0,0 +1,144 @@
+import threading
+import types
+import unittest
+
+from fakes import FakeApiFactory, api_exception
+from lusid_samples import bulk
+
+
+class RunBatchesTests(unittest.TestCase):
+
+    def setUp(self):
+        self.sleeps = []
+
+    def run_batches(self, send, batches, **kwargs):
+        return sorted(bulk.run_batches(send, batches, sleep=self.sleeps.append, **kwargs),
+                      key=lambda result: result.index)
+
+    def test_retries_server_errors_until_success(self):
+        errors = [api_exception(503)]
+
+        def send(batch):
+            if batch == "b" and errors:
+                raise errors.pop()
+            return batch.upper()
+
+        results = self.run_batches(send, ["a", "b", "c"], max_workers=2)
+
+        self.assertListEqual([result.response for result in results], ["A", "B", "C"])
+        self.assertListEqual([result.attempts for result in results], [1, 2, 1])
+        self.assertTrue(all(result.error is None for result in results))
+        self.assertEqual(len(self.sleeps), 1)
+
+    def test_waits_as_long_as_retry_after_asks_when_rate_limited(self):
+        errors = [api_exception(429, retry_after="2")]
+
+        def send(batch):
+            if errors:
+                raise errors.pop()
+            return batch
+
+        results = self.run_batches(send, ["a"], max_workers=1)
+
+        self.assertEqual(results[0].response, "a")
+        self.assertEqual(results[0].attempts, 2)
+        self.assertListEqual(self.sleeps, [2.0])
+
+    def test_gives_up_after_max_retries(self):
+        def send(batch):
+            raise api_exception(502)
+
+        results = self.run_batches(send, ["a"], max_workers=1, retries=2, backoff=0.1)
+
+        self.assertIsNone(results[0].response)
+        self.assertEqual(results[0].error.status, 502)
+        self.assertEqual(results[0].attempts, 3)
+        self.assertEqual(len(self.sleeps), 2)
+        self.assertTrue(all(0 <= delay <= 0.2 for delay in self.sleeps))
+
+    def test_does_not_retry_client_errors(self):
+        def send(batch):
+            raise api_exception(400)
+
+        results = self.run_batches(send, ["a"], max_workers=1)
+
+        self.assertEqual(results[0].error.status, 400)
+        self.assertEqual(results[0].attempts, 1)
+        self.assertListEqual(self.sleeps, [])
+
+    def test_reads_batches_only_as_fast_as_they_are_sent(self):
+        max_pending = 3
+        lock = threading.Lock()
+        finished = 0
+        most_outstanding = 0
+
+        def batches():
+            nonlocal most_outstanding
+            for index in range(50):
+                with lock:
+                    most_outstanding = max(most_outstanding, index - finished)
+                yield index
+
+        def send(batch):
+            nonlocal finished
+            threading.Event().wait(0.001)
+            with lock:
+                finished += 1
+            return batch
+
+        results = self.run_batches(send, batches(), max_workers=2, max_pending=max_pending)
+
+        self.assertListEqual([result.response for result in results], list(range(50)))
+        self.assertLessEqual(most_outstanding, max_pending)
+
+
+class UpsertInstrumentsApi:
+
+    def __init__(self, fail_with=None):
+        # Errors to raise, by the first key of the batch they are raised for
+        self.fail_with = fail_with or {}
+        self.batches = []
+
+    def upsert_instruments(self, request_body, **kwargs):
+        self.batches.append(list(request_body))
+        errors = self.fail_with.get(next(iter(request_body)))
+        if errors:
+            raise errors.pop(0)
+        return types.SimpleNamespace(
+            values={key: types.SimpleNamespace(lusid_instrument_id=f"LUID_{key}") for key in request_body},
+            staged={},
+            failed={})
+
+
+class UpsertInstrumentsTests(unittest.TestCase):
+
+    definitions = {f"I{index}": f"definition {index}" for index in range(7)}
+
+    def test_batches_are_merged_in_definition_order(self):
+        api = UpsertInstrumentsApi()
+
+        response = bulk.upsert_instruments(FakeApiFactory(InstrumentsApi=api), self.definitions, batch_size=3)
+
+        self.assertListEqual(sorted(map(len, api.batches)), [1, 3, 3])
+        self.assertListEqual(list(response.values), list(self.definitions))
+        self.assertDictEqual(response.failed, {})
+
+    def test_batch_that_fails_with_a_client_error_is_failed_as_a_whole(self):
+        api = UpsertInstrumentsApi(fail_with={"I3": [api_exception(400)]})
+
+        response = bulk.upsert_instruments(FakeApiFactory(InstrumentsApi=api), self.definitions, batch_size=3)
+
+        self.assertListEqual(list(response.values), ["I0", "I1", "I2", "I6"])
+        self.assertListEqual(list(response.failed), ["I3", "I4", "I5"])
+        self.assertEqual(response.failed["I4"].id, "I4")
+        self.assertEqual(response.failed["I4"].type, "ApiException")
+        self.assertEqual(len(api.batches), 3)
+
+    def test_batch_that_hits_a_server_error_is_retried(self):
+        api = UpsertInstrumentsApi(fail_with={"I3": [api_exception(503, retry_after="0")]})
+
+        response = bulk.upsert_instruments(FakeApiFactory(InstrumentsApi=api), self.definitions, batch_size=3)
+
+        self.assertListEqual(list(response.values), list(self.definitions))
+        self.assertDictEqual(response.failed, {})
+        self.assertEqual(len(api.batches), 4)
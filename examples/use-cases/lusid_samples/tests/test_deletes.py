@@ -0,0 +1,68 @@
+import threading
+import types
+import unittest
+
+from fakes import FakeApiFactory
+from lusid_samples import bulk
+from lusid_samples.identifiers import resolver_for
+
+
+class ListingApi:
+    """
+    Lists items a page at a time, recording the arguments of each list call and each delete
+    """
+
+    def __init__(self, items):
+        self.items = items
+        self.list_calls = []
+        self.deleted = []
+        self.lock = threading.Lock()
+
+    def list(self, page=None, limit=None, **kwargs):
+        self.list_calls.append(dict(kwargs, page=page, limit=limit))
+        start = int(page or 0)
+        end = start + limit
+        return types.SimpleNamespace(values=self.items[start:end],
+                                     next_page=str(end) if end < len(self.items) else None)
+
+    def delete(self, **kwargs):
+        with self.lock:
+            self.deleted.append(kwargs)
+
+
+class DeleteTests(unittest.TestCase):
+
+    def test_list_all_follows_next_page(self):
+        api = ListingApi(list(range(7)))
+
+        self.assertListEqual(list(bulk.list_all(api.list, page_size=3, filter="f")), list(range(7)))
+        self.assertListEqual([call["page"] for call in api.list_calls], [None, "3", "6"])
+        self.assertTrue(all(call["filter"] == "f" for call in api.list_calls))
+
+    def test_delete_portfolios_deletes_every_page_as_at_the_start(self):
+        portfolios = [types.SimpleNamespace(id=types.SimpleNamespace(scope="s", code=f"p{index}"))
+                      for index in range(5)]
+        api = ListingApi(portfolios)
+        api_factory = FakeApiFactory(
+            PortfoliosApi=types.SimpleNamespace(list_portfolios=api.list, delete_portfolio=api.delete))
+
+        results = bulk.delete_portfolios(api_factory, page_size=2)
+
+        self.assertListEqual([result.batch for result in results], portfolios)
+        self.assertListEqual(sorted(delete["code"] for delete in api.deleted), [f"p{index}" for index in range(5)])
+        self.assertEqual(len(api.list_calls), 3)
+        self.assertEqual(len({call["as_at"] for call in api.list_calls}), 1)
+
+    def test_delete_instruments_deletes_by_luid_and_drops_cached_luids(self):
+        instruments = [types.SimpleNamespace(lusid_instrument_id=f"LUID_{index}") for index in range(3)]
+        api = ListingApi(instruments)
+        api_factory = FakeApiFactory(
+            InstrumentsApi=types.SimpleNamespace(list_instruments=api.list, delete_instrument=api.delete))
+        resolver_for(api_factory)._store({("Figi", "F1"): "LUID_1"}, now=0)
+
+        results = bulk.delete_instruments(api_factory)
+
+        self.assertTrue(all(result.error is None for result in results))
+        self.assertListEqual(sorted(delete["identifier"] for delete in api.deleted), ["LUID_0", "LUID_1", "LUID_2"])
+        self.assertTrue(all(delete["identifier_type"] == "LusidInstrumentId" for delete in api.deleted))
+        self.assertEqual(resolver_for(api_factory).stats()["cached"], 0)
@@ -0,0 +1,136 @@
+import gc
+import types
+import unittest
+import weakref
+
+from fakes import FakeApiFactory
+from lusid_samples.identifiers import IdentifierResolver, resolver_for
+
+
+class InstrumentsApi:
+    """
+    Resolves every identifier starting with F to a LUID, recording the identifiers asked for in each call
+    """
+
+    def __init__(self):
+        self.calls = []
+
+    def get_instruments(self, identifier_type, request_body):
+        self.calls.append((identifier_type, list(request_body)))
+        return types.SimpleNamespace(values={
+            identifier: types.SimpleNamespace(lusid_instrument_id=f"LUID_{identifier}")
+            for identifier in request_body if identifier.startswith("F")
+        })
+
+
+class Clock:
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class IdentifierResolverTests(unittest.TestCase):
+
+    def setUp(self):
+        self.api_factory = FakeApiFactory(InstrumentsApi=InstrumentsApi())
+        self.calls = self.api_factory.apis["InstrumentsApi"].calls
+        self.clock = Clock()
+
+    def resolver(self, **kwargs):
+        return IdentifierResolver(self.api_factory, clock=self.clock, **kwargs)
+
+    def test_resolves_in_batches_of_500(self):
+        figis = [f"F{index}" for index in range(1200)]
+
+        luids = self.resolver().resolve(figis)
+
+        self.assertListEqual(luids, [f"LUID_{figi}" for figi in figis])
+        self.assertListEqual([len(identifiers) for _, identifiers in self.calls], [500, 500, 200])
+        self.assertTrue(all(identifier_type == "Figi" for identifier_type, _ in self.calls))
+
+    def test_repeated_identifiers_are_asked_for_once(self):
+        resolver = self.resolver()
+
+        self.assertListEqual(resolver.resolve(["F1", "F2", "F1"]), ["LUID_F1", "LUID_F2", "LUID_F1"])
+        self.assertListEqual(self.calls, [("Figi", ["F1", "F2"])])
+
+    def test_cached_identifiers_are_not_asked_for_again(self):
+        resolver = self.resolver()
+        resolver.resolve(["F1", "F2"])
+
+        self.assertEqual(resolver.luid("F1"), "LUID_F1")
+        resolver.resolve(["F2", "F3"])
+
+        self.assertListEqual(self.calls, [("Figi", ["F1", "F2"]), ("Figi", ["F3"])])
+        self.assertDictEqual(resolver.stats(), {"hits": 2, "misses": 3, "requests": 2, "cached": 3})
+
+    def test_identifier_types_are_cached_separately(self):
+        resolver = self.resolver()
+        resolver.resolve(["F1"])
+        resolver.resolve(["F1"], identifier_type="ClientInternal")
+
+        self.assertListEqual(self.calls, [("Figi", ["F1"]), ("ClientInternal", ["F1"])])
+
+    def test_expired_identifiers_are_asked_for_again(self):
+        resolver = self.resolver(ttl=60)
+        resolver.resolve(["F1"])
+
+        self.clock.now = 59
+        resolver.resolve(["F1"])
+        self.assertEqual(len(self.calls), 1)
+
+        self.clock.now = 60
+        resolver.resolve(["F1"])
+        self.assertEqual(len(self.calls), 2)
+
+    def test_least_recently_used_identifiers_are_dropped_first(self):
+        resolver = self.resolver(max_size=2)
+        resolver.resolve(["F1", "F2"])
+        resolver.resolve(["F1"])
+        resolver.resolve(["F3"])
+
+        resolver.resolve(["F1", "F3"])
+        self.assertEqual(len(self.calls), 2)
+
+        resolver.resolve(["F2"])
+        self.assertEqual(self.calls[-1], ("Figi", ["F2"]))
+        self.assertEqual(resolver.stats()["cached"], 2)
+
+    def test_unknown_identifiers_raise_key_error(self):
+        resolver = self.resolver()
+
+        with self.assertRaises(KeyError) as raised:
+            resolver.resolve(["F1", "X1", "X2"])
+
+        self.assertIn("X1, X2", str(raised.exception))
+        # The identifiers that were found are still cached
+        self.assertEqual(resolver.luid("F1"), "LUID_F1")
+        self.assertEqual(len(self.calls), 1)
+
+    def test_invalidate(self):
+        resolver = self.resolver()
+        resolver.resolve(["F1", "F2"])
+
+        resolver.invalidate(["F1"])
+        resolver.resolve(["F1", "F2"])
+        self.assertEqual(self.calls[-1], ("Figi", ["F1"]))
+
+        resolver.invalidate()
+        self.assertEqual(resolver.stats()["cached"], 0)
+
+    def test_resolver_is_shared_per_api_factory(self):
+        self.assertIs(resolver_for(self.api_factory), resolver_for(self.api_factory))
+        self.assertIsNot(resolver_for(self.api_factory), resolver_for(FakeApiFactory(InstrumentsApi=InstrumentsApi())))
+
+    def test_resolver_does_not_keep_api_factory_alive(self):
+        api_factory = FakeApiFactory(InstrumentsApi=InstrumentsApi())
+        collected = weakref.ref(api_factory)
+        resolver_for(api_factory).resolve(["F1"])
+
+        del api_factory
+        gc.collect()
+
+        self.assertIsNone(collected())
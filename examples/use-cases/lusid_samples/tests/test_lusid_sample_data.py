@@ -0,0 +1,544 @@
+import contextlib
+import json
+from datetime import datetime, time, timedelta, timezone
+import multiprocessing
+import os
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+import pandas as pd
+import pytz
+
+import baseline
+from lusid_samples import lusid_sample_data
+from lusid_samples.lusid_sample_data import InstrumentUniverse, ScopeIdAllocator, create_scope_id, import_file
+
+# The use-cases folder, whose sub folders hold the bundled sample files in their data folders
+USE_CASES = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@contextlib.contextmanager
+def working_folder(folder):
+    """
+    Runs the body in a folder, as the loaders read files from the data folder of the current folder
+    """
+    previous = os.getcwd()
+    os.chdir(folder)
+    try:
+        yield
+    finally:
+        os.chdir(previous)
+
+
+def _create_scope_ids(count):
+    return [create_scope_id() for _ in range(count)]
+
+
+class ScopeIdTests(unittest.TestCase):
+
+    def test_scope_ids_are_encoded_as_20_characters(self):
+        scope_id = create_scope_id()
+
+        self.assertEqual(len(scope_id), 20)
+        self.assertTrue(set(scope_id) <= set(lusid_sample_data.SCOPE_ID_ALPHABET))
+
+    def test_scope_ids_increase_within_a_process(self):
+        allocator = ScopeIdAllocator()
+        scope_ids = [ScopeIdAllocator.encode(allocator.allocate()) for _ in range(10000)]
+
+        self.assertListEqual(scope_ids, sorted(scope_ids))
+        self.assertEqual(len(set(scope_ids)), len(scope_ids))
+
+    def test_scope_ids_unique_across_threads(self):
+        scope_ids = []
+        lock = threading.Lock()
+
+        def allocate():
+            allocated = _create_scope_ids(2000)
+            with lock:
+                scope_ids.extend(allocated)
+
+        threads = [threading.Thread(target=allocate) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(scope_ids), 16000)
+        self.assertEqual(len(set(scope_ids)), len(scope_ids))
+
+    @unittest.skipUnless(hasattr(os, "fork"), "needs fork")
+    def test_scope_ids_unique_across_forked_processes(self):
+        # Allocate in the parent first, so the children are forked from an allocator that has been used
+        scope_ids = _create_scope_ids(1000)
+
+        with multiprocessing.get_context("fork").Pool(4) as pool:
+            for allocated in pool.map(_create_scope_ids, [1000] * 4):
+                scope_ids.extend(allocated)
+
+        self.assertEqual(len(scope_ids), 5000)
+        self.assertEqual(len(set(scope_ids)), len(scope_ids))
+
+    def test_allocators_with_the_same_pid_and_clock_do_not_collide(self):
+        # As in two containers started together, which share process ids and allocate in the same milliseconds
+        with mock.patch("os.getpid", return_value=1), \
+                mock.patch.object(lusid_sample_data.default_time, "time_ns", return_value=1700000000000000000):
+            first = ScopeIdAllocator()
+            second = ScopeIdAllocator()
+            first_ids = {first.allocate() for _ in range(5000)}
+            second_ids = {second.allocate() for _ in range(5000)}
+
+        self.assertEqual(len(first_ids), 5000)
+        self.assertEqual(len(second_ids), 5000)
+        self.assertFalse(first_ids & second_ids)
+
+
+class InstrumentUniverseTests(unittest.TestCase):
+
+    def setUp(self):
+        self.universe = InstrumentUniverse(
+            ["BAE", "BP", "Shell", "BP Copy"],
+            ["GBP", "GBP", "GBP", "GBP"],
+            {"Figi": ["F1", "F2", "F3", "F2"], "LUID": ["", "", "", ""]})
+
+    def test_instrument_name_finds_first_instrument_with_identifier(self):
+        self.assertEqual(self.universe.instrument_name("Figi", "F1"), "BAE")
+        self.assertEqual(self.universe.instrument_name("Figi", "F2"), "BP")
+
+        with self.assertRaises(KeyError):
+            self.universe.instrument_name("Figi", "F9")
+
+    def test_instrument_names_uses_default_for_unknown_identifiers(self):
+        self.assertListEqual(self.universe.instrument_names("Figi", ["F3", "F9", "F1"], default="?"),
+                             ["Shell", "?", "BAE"])
+
+    def test_blank_identifiers_are_not_indexed(self):
+        with self.assertRaises(KeyError):
+            self.universe.instrument_name("LUID", "")
+
+    def test_identifier_values(self):
+        self.assertListEqual(self.universe.identifier_values("Figi", ["Shell", "BAE"]), ["F3", "F1"])
+        self.assertListEqual(self.universe.identifier_values("Figi"), ["F1", "F2", "F3", "F2"])
+
+        with self.assertRaises(KeyError):
+            self.universe.identifier_values("Isin")
+
+    def test_update_identifiers_keeps_index_in_sync(self):
+        # Build the indexes first, so the update has to maintain them rather than them being built afterwards
+        self.assertEqual(self.universe.instrument_name("Figi", "F1"), "BAE")
+        self.universe.instrument_names("LUID", [])
+
+        self.universe.update_identifiers("LUID", {"BAE": "LUID_1", "Shell": "LUID_3"})
+        self.universe.update_identifiers("Figi", {"BAE": "F9"})
+
+        self.assertEqual(self.universe.instrument_name("LUID", "LUID_1"), "BAE")
+        self.assertEqual(self.universe.instrument_name("LUID", "LUID_3"), "Shell")
+        self.assertEqual(self.universe.instrument_name("Figi", "F9"), "BAE")
+        with self.assertRaises(KeyError):
+            self.universe.instrument_name("Figi", "F1")
+        self.assertEqual(self.universe["BAE"]["identifiers"]["LUID"], "LUID_1")
+
+    def test_updates_through_nested_dictionaries_keep_index_in_sync(self):
+        self.universe.instrument_name("Figi", "F1")
+
+        self.universe["BAE"]["identifiers"]["Figi"] = "F7"
+        self.universe["GBP_Cash"] = {"identifiers": {"LUID": "GBP"}, "currency": "GBP"}
+
+        self.assertEqual(self.universe.instrument_name("Figi", "F7"), "BAE")
+        self.assertEqual(self.universe.instrument_name("LUID", "GBP"), "GBP_Cash")
+        self.assertNotIn("Figi", self.universe["GBP_Cash"]["identifiers"])
+
+    def test_deleting_an_instrument_reindexes_the_rest(self):
+        self.universe.instrument_name("Figi", "F3")
+
+        del self.universe["BAE"]
+
+        self.assertEqual(self.universe.instrument_name("Figi", "F3"), "Shell")
+        self.assertListEqual(list(self.universe), ["BP", "Shell", "BP Copy"])
+
+    def test_to_dict_matches_the_dictionary_fetch_instrument_universe_returned(self):
+        as_dict = self.universe.to_dict()
+
+        self.assertDictEqual(as_dict["BAE"], {"identifiers": {"Figi": "F1", "LUID": ""}, "currency": "GBP"})
+        self.assertEqual(json.loads(json.dumps(as_dict)), as_dict)
+        self.assertEqual(pd.DataFrame(as_dict).shape, (2, 4))
+        self.assertEqual(self.universe.to_frame().shape, (4, 4))
+
+
+class ImportFileTests(unittest.TestCase):
+
+    def setUp(self):
+        cache = mock.patch.dict(lusid_sample_data._import_file_cache, clear=True)
+        cache.start()
+        self.addCleanup(cache.stop)
+
+        folder = tempfile.TemporaryDirectory()
+        self.addCleanup(folder.cleanup)
+        self.folder = folder.name
+        os.mkdir(os.path.join(self.folder, "data"))
+
+    def write(self, content, file_name="holdings.csv", mtime_ns=None):
+        path = os.path.join(self.folder, "data", file_name)
+        with open(path, "w") as f:
+            f.write(content)
+        if mtime_ns is not None:
+            os.utime(path, ns=(mtime_ns, mtime_ns))
+        return path
+
+    def import_file(self, csv_file="holdings.csv", **kwargs):
+        with working_folder(self.folder):
+            return import_file(csv_file, **kwargs)
+
+    def test_sample_files_are_read_with_their_schemas(self):
+        self.write("portfolio_group_name,portfolio_name,instrument_name,quantity,price\nG,007,BP,10,1.5\n")
+
+        data = self.import_file()
+
+        self.assertEqual(data["portfolio_name"][0], "007")
+        self.assertEqual(str(data["quantity"].dtype), "int64")
+        self.assertEqual(str(data["price"].dtype), "float64")
+
+    def test_bundled_sample_files_match_inferred_parsing(self):
+        for folder, file_names in [
+                ("ibor", ["portfolios.csv", "holdings.csv", "fundaccountantreport.csv", "transactions.csv",
+                          "instruments.csv"]),
+                ("change-management", ["paper-instruments.csv", "paper-analytics.csv", "paper-transactions.csv"]),
+                ("risk-and-performance", ["strategy-transactions.csv"])]:
+            for file_name in file_names:
+                with self.subTest(file_name=file_name), working_folder(os.path.join(USE_CASES, folder)):
+                    typed = import_file(file_name)
+                    inferred = pd.read_csv(os.path.join("data", file_name))
+
+                    pd.testing.assert_frame_equal(typed, inferred, check_dtype=False)
+                    schema = lusid_sample_data.SAMPLE_FILE_SCHEMAS[file_name]["dtype"]
+                    for column in typed.columns.intersection(list(schema)):
+                        expected = "object" if schema[column] is str else schema[column]
+                        self.assertEqual(str(typed[column].dtype), expected, column)
+
+    def test_cached_until_the_file_changes(self):
+        self.write("portfolio_name,quantity\nA,1\n", mtime_ns=1000000000)
+        self.assertEqual(self.import_file()["quantity"][0], 1)
+
+        with mock.patch.object(lusid_sample_data, "_read_csv", side_effect=AssertionError("parsed again")):
+            self.assertEqual(self.import_file()["quantity"][0], 1)
+
+        self.write("portfolio_name,quantity\nA,2\n", mtime_ns=2000000000)
+        self.assertEqual(self.import_file()["quantity"][0], 2)
+
+    def test_each_call_returns_a_copy(self):
+        self.write("portfolio_name,quantity\nA,1\n")
+
+        first = self.import_file()
+        first.loc[0, "quantity"] = 99
+        first["extra"] = 1
+
+        second = self.import_file()
+        self.assertEqual(second["quantity"][0], 1)
+        self.assertNotIn("extra", second.columns)
+        self.assertIsNot(first, second)
+
+    def test_sidecar_is_saved_and_reused(self):
+        self.write("portfolio_name,quantity\n007,1\n")
+        sidecar_path = os.path.join(self.folder, "data", "holdings.csv.parquet")
+
+        data = self.import_file(sidecar="parquet")
+        self.assertTrue(os.path.exists(sidecar_path))
+
+        # As in a new kernel, with nothing cached
+        lusid_sample_data._import_file_cache.clear()
+        with mock.patch.object(lusid_sample_data, "_read_csv", side_effect=AssertionError("parsed again")):
+            pd.testing.assert_frame_equal(self.import_file(sidecar="parquet"), data)
+
+    def test_sidecar_is_saved_when_the_file_was_cached_without_one(self):
+        self.write("portfolio_name,quantity\nA,1\n")
+        sidecar_path = os.path.join(self.folder, "data", "holdings.csv.feather")
+
+        self.import_file()
+        self.assertFalse(os.path.exists(sidecar_path))
+
+        self.import_file(sidecar="feather")
+        self.assertTrue(os.path.exists(sidecar_path))
+
+    def test_stale_sidecar_is_replaced(self):
+        self.write("portfolio_name,quantity\nA,1\n", mtime_ns=1000000000)
+        self.import_file(sidecar="parquet")
+
+        lusid_sample_data._import_file_cache.clear()
+        self.write("portfolio_name,quantity\nA,2\n", mtime_ns=4000000000000000000)
+
+        self.assertEqual(self.import_file(sidecar="parquet")["quantity"][0], 2)
+
+    def test_unsupported_sidecar(self):
+        self.write("portfolio_name,quantity\nA,1\n")
+
+        with self.assertRaises(ValueError):
+            self.import_file(sidecar="csv")
+
+
+class LoaderParityTests(unittest.TestCase):
+    """
+    The loaders give the same results, in the same order, as the row by row versions in baseline
+    """
+
+    def assertSameItems(self, result, expected):
+        # Compares the order of the keys as well as the values, at every level
+        self.assertEqual(result, expected)
+        self.assertListEqual(list(result), list(expected))
+        for key, value in expected.items():
+            if isinstance(value, dict):
+                self.assertSameItems(result[key], value)
+
+    def setUp(self):
+        cache = mock.patch.dict(lusid_sample_data._import_file_cache, clear=True)
+        cache.start()
+        self.addCleanup(cache.stop)
+
+    def test_ibor_loaders(self):
+        with working_folder(os.path.join(USE_CASES, "ibor")):
+            self.assertSameItems(lusid_sample_data.fetch_portfolio_names("portfolios.csv"),
+                                 baseline.fetch_portfolio_names("portfolios.csv"))
+            self.assertSameItems(lusid_sample_data.fetch_instrument_universe("instruments.csv").to_dict(),
+                                 baseline.fetch_instrument_universe("instruments.csv"))
+            for file_name in ["holdings.csv", "fundaccountantreport.csv"]:
+                self.assertSameItems(lusid_sample_data.fetch_client_take_on_balances(file_name),
+                                     baseline.fetch_client_take_on_balances(file_name))
+            self.assertSameItems(
+                lusid_sample_data.fetch_fund_accountant_daily_holdings_report("fundaccountantreport.csv"),
+                baseline.fetch_client_take_on_balances("fundaccountantreport.csv"))
+
+    def test_paper_loaders(self):
+        with working_folder(os.path.join(USE_CASES, "change-management")):
+            self.assertSameItems(
+                lusid_sample_data.fetch_instrument_universe("paper-instruments.csv", paper=True).to_dict(),
+                baseline.fetch_instrument_universe("paper-instruments.csv", paper=True))
+            self.assertSameItems(lusid_sample_data.fetch_instrument_market_cap("paper-weights.csv"),
+                                 baseline.fetch_instrument_market_cap("paper-weights.csv"))
+            self.assertSameItems(lusid_sample_data.fetch_instrument_analytics("paper-analytics.csv"),
+                                 baseline.fetch_instrument_analytics("paper-analytics.csv"))
+
+    def test_take_on_balances_with_repeated_instruments(self):
+        with tempfile.TemporaryDirectory() as folder, working_folder(folder):
+            os.mkdir("data")
+            with open(os.path.join("data", "repeated.csv"), "w") as f:
+                f.write("portfolio_group_name,portfolio_name,instrument_name,quantity,price\n"
+                        "G,P1,BP,1,1.5\n"
+                        "G,P1,Shell,2,2.5\n"
+                        "G,P2,BP,3,3.5\n"
+                        "G,P1,BP,4,4.5\n")
+
+            self.assertSameItems(lusid_sample_data.fetch_client_take_on_balances("repeated.csv"),
+                                 baseline.fetch_client_take_on_balances("repeated.csv"))
+
+    def test_take_on_balances_columns_are_selected_by_name(self):
+        with tempfile.TemporaryDirectory() as folder, working_folder(folder):
+            os.mkdir("data")
+            with open(os.path.join("data", "reordered.csv"), "w") as f:
+                f.write("price,instrument_name,portfolio_name,quantity\n1.5,BP,P1,1\n")
+
+            self.assertDictEqual(lusid_sample_data.fetch_client_take_on_balances("reordered.csv"),
+                                 {"P1": {"BP": {"quantity": 1, "price": 1.5}}})
+
+
+class StreamingLoaderTests(unittest.TestCase):
+
+    def setUp(self):
+        cache = mock.patch.dict(lusid_sample_data._import_file_cache, clear=True)
+        cache.start()
+        self.addCleanup(cache.stop)
+
+    def test_streamed_client_transactions_match_client_transactions(self):
+        with working_folder(os.path.join(USE_CASES, "ibor")):
+            universe = lusid_sample_data.fetch_instrument_universe("instruments.csv")
+            universe.update_identifiers("LUID", {name: f"LUID_{index}" for index, name in enumerate(universe)})
+
+            eager, _ = lusid_sample_data.client_transactions("transactions.csv", universe)
+            streamed = {}
+            for portfolio, batch in lusid_sample_data.stream_client_transactions(
+                    "transactions.csv", universe, batch_size=2):
+                self.assertLessEqual(len(batch), 2)
+                for transaction in batch:
+                    transaction = dict(transaction)
+                    streamed.setdefault(portfolio, {})[transaction.pop("transaction_id")] = transaction
+
+        self.assertEqual(streamed, eager)
+        for portfolio in eager:
+            self.assertListEqual(list(streamed[portfolio]), list(eager[portfolio]))
+
+    def test_streamed_fetch_client_transactions_match_fetch_client_transactions(self):
+        with working_folder(os.path.join(USE_CASES, "change-management")):
+            eager = lusid_sample_data.fetch_client_transactions("paper-transactions.csv", 10, seed=1)
+            batches = list(lusid_sample_data.stream_fetch_client_transactions(
+                "paper-transactions.csv", 10, batch_size=4, seed=1))
+            again = list(lusid_sample_data.stream_fetch_client_transactions(
+                "paper-transactions.csv", 10, batch_size=4, seed=1))
+
+        self.assertEqual(batches, again)
+        self.assertTrue(all(len(batch) <= 4 for _, batch in batches))
+
+        self.assertTrue(all(transaction["portfolio"] == portfolio
+                            for portfolio, batch in batches for transaction in batch))
+
+        streamed = pd.DataFrame([transaction for _, batch in batches for transaction in batch])
+
+        # The dates are drawn a batch at a time rather than for the whole file, so only the rest is the same
+        dates = ["transaction_date", "settlement_date"]
+        streamed = streamed.set_index("transaction_id").loc[eager["transaction_id"]].reset_index()
+        pd.testing.assert_frame_equal(streamed.drop(columns=dates), eager.drop(columns=dates), check_dtype=False)
+
+    def test_batches_are_bounded_however_many_portfolios_there_are(self):
+        portfolios = [f"P{index}" for index in range(50)]
+        chunk_size = 50
+        batch_size = 10
+        read = 0
+        yielded = 0
+        most_held = 0
+
+        def chunks():
+            nonlocal read
+            for start in range(0, 2000, chunk_size):
+                rows = list(range(start, start + chunk_size))
+                read += len(rows)
+                yield pd.DataFrame({"portfolio": [portfolios[row % len(portfolios)] for row in rows], "row": rows})
+
+        batches = []
+        for portfolio, batch in lusid_sample_data._portfolio_batches(
+                chunks(), "portfolio", batch_size, lambda rows: rows["row"].tolist(), max_buffered=40):
+            yielded += len(batch)
+            most_held = max(most_held, read - yielded)
+            batches.append((portfolio, batch))
+
+        # Held back rows never exceed max_buffered plus the chunk being regrouped
+        self.assertLessEqual(most_held, 40 + chunk_size)
+        self.assertTrue(all(0 < len(batch) <= batch_size for _, batch in batches))
+
+        rows = {}
+        for portfolio, batch in batches:
+            rows.setdefault(portfolio, []).extend(batch)
+        self.assertEqual(sum(map(len, rows.values())), 2000)
+        for portfolio, portfolio_rows in rows.items():
+            index = portfolios.index(portfolio)
+            self.assertListEqual(portfolio_rows, list(range(index, 2000, len(portfolios))))
+
+
+class TransactionDateTests(unittest.TestCase):
+
+    def setUp(self):
+        cache = mock.patch.dict(lusid_sample_data._import_file_cache, clear=True)
+        cache.start()
+        self.addCleanup(cache.stop)
+
+    def test_isoformat_utc_matches_datetime_isoformat(self):
+        dates = [datetime(2020, 3, 1, 8, tzinfo=timezone.utc),
+                 datetime(2020, 3, 1, 8, 0, 0, 1, tzinfo=timezone.utc),
+                 datetime(2020, 3, 1, 23, 59, 59, 999999, tzinfo=timezone.utc),
+                 datetime(2021, 12, 31, 10, 30, 15, 500000, tzinfo=timezone.utc)]
+
+        self.assertListEqual(list(lusid_sample_data.isoformat_utc(pd.DatetimeIndex(dates))),
+                             [date.isoformat() for date in dates])
+
+    def test_isoformat_utc_converts_to_utc(self):
+        dates = pd.DatetimeIndex([datetime(2020, 6, 1, 9, 30)]).tz_localize("Europe/London")
+
+        self.assertListEqual(list(lusid_sample_data.isoformat_utc(dates)), ["2020-06-01T08:30:00+00:00"])
+
+    def test_random_trade_times_are_within_the_ranges_the_loop_drew_from(self):
+        trade_open = datetime(2020, 3, 2, 8, tzinfo=timezone.utc)
+
+        offsets = lusid_sample_data.random_trade_times(trade_open, 5, 10000, seed=3) - pd.Timestamp(trade_open)
+
+        # randint(0, days_back - 1) days, randint(0, 8) hours and so on, each inclusive
+        self.assertEqual(offsets.days.min(), 0)
+        self.assertEqual(offsets.days.max(), 4)
+        self.assertLessEqual((offsets - pd.to_timedelta(offsets.days, unit="D")).max(),
+                             pd.Timedelta(hours=8, minutes=59, seconds=59, microseconds=999999))
+
+    def test_random_trade_times_are_reproducible_with_a_seed(self):
+        trade_open = datetime(2020, 3, 2, 8, tzinfo=timezone.utc)
+
+        first = lusid_sample_data.random_trade_times(trade_open, 5, 100, seed=3)
+
+        self.assertTrue(first.equals(lusid_sample_data.random_trade_times(trade_open, 5, 100, seed=3)))
+        self.assertFalse(first.equals(lusid_sample_data.random_trade_times(trade_open, 5, 100, seed=4)))
+
+    def test_fetch_client_transactions_matches_the_loop_given_the_same_dates(self):
+        for folder, file_name in [("change-management", "paper-transactions.csv"),
+                                  ("risk-and-performance", "strategy-transactions.csv")]:
+            with self.subTest(file_name=file_name), working_folder(os.path.join(USE_CASES, folder)):
+                transactions = lusid_sample_data.fetch_client_transactions(file_name, 10, seed=7)
+                self.assertTrue(transactions.equals(lusid_sample_data.fetch_client_transactions(file_name, 10, seed=7)))
+
+                days_ago = datetime.now(pytz.UTC) - timedelta(days=10)
+                trade_open = pytz.utc.localize(datetime.combine(days_ago, time(hour=8, minute=0)))
+                dates = lusid_sample_data.random_trade_times(trade_open, 10, len(transactions), seed=7)
+
+                pd.testing.assert_frame_equal(
+                    transactions,
+                    baseline.fetch_client_transactions(file_name, 10, dates.to_pydatetime()),
+                    check_dtype=False)
+
+
+class TradeScheduleTests(unittest.TestCase):
+
+    trade_open = datetime(2020, 3, 2, 8, tzinfo=pytz.utc)
+
+    def loop(self, size, hours=lusid_sample_data.CLIENT_TRANSACTION_HOURS):
+        # As client_transactions used to, but repeating the hours rather than running out of them
+        trade_dates = []
+        settlement_dates = []
+        for index in range(size):
+            hour = hours[index % len(hours)]
+            trade_dates.append((self.trade_open + timedelta(hours=hour)).isoformat())
+            settlement_dates.append((self.trade_open + timedelta(days=hour)).isoformat())
+        return trade_dates, settlement_dates
+
+    def schedule(self, size, *args, **kwargs):
+        trade_dates, settlement_dates = lusid_sample_data.trade_schedule(self.trade_open, size, *args, **kwargs)
+        return (list(lusid_sample_data.isoformat_utc(trade_dates)),
+                list(lusid_sample_data.isoformat_utc(settlement_dates)))
+
+    def test_matches_the_loop(self):
+        self.assertTupleEqual(self.schedule(8), self.loop(8))
+
+    def test_repeats_the_hours_for_longer_files(self):
+        self.assertTupleEqual(self.schedule(100), self.loop(100))
+        self.assertTupleEqual(self.schedule(5, [0.5, 1.25]), self.loop(5, [0.5, 1.25]))
+
+    def test_start_continues_the_schedule_of_an_earlier_chunk(self):
+        trade_dates, settlement_dates = self.loop(20)
+
+        self.assertTupleEqual(self.schedule(7, start=13), (trade_dates[13:], settlement_dates[13:]))
+
+    def test_settlement_days(self):
+        trade_dates, settlement_dates = lusid_sample_data.trade_schedule(self.trade_open, 10, settlement_days=2)
+
+        self.assertTrue((settlement_dates - trade_dates == pd.Timedelta(days=2)).all())
+
+    def test_distributions_are_within_the_session_and_reproducible(self):
+        for hours in ["uniform", "u-shaped"]:
+            with self.subTest(hours=hours):
+                trade_dates, _ = lusid_sample_data.trade_schedule(self.trade_open, 1000, hours, seed=2)
+                again, _ = lusid_sample_data.trade_schedule(self.trade_open, 1000, hours, seed=2)
+
+                self.assertTrue(trade_dates.equals(again))
+                self.assertGreaterEqual(trade_dates.min(), pd.Timestamp(self.trade_open))
+                self.assertLessEqual(trade_dates.max(), pd.Timestamp(self.trade_open) + pd.Timedelta(
+                    hours=lusid_sample_data.TRADING_SESSION_HOURS))
+
+        with self.assertRaises(ValueError):
+            lusid_sample_data.trade_schedule(self.trade_open, 10, "normal")
+
+    def test_client_transactions_matches_the_loop(self):
+        with mock.patch.dict(lusid_sample_data._import_file_cache, clear=True), \
+                working_folder(os.path.join(USE_CASES, "ibor")):
+            universe = lusid_sample_data.fetch_instrument_universe("instruments.csv")
+            universe.update_identifiers("LUID", {name: f"LUID_{index}" for index, name in enumerate(universe)})
+
+            transactions, trade_open = lusid_sample_data.client_transactions("transactions.csv", universe)
+            expected, expected_trade_open = baseline.client_transactions("transactions.csv", universe)
+
+        self.assertEqual(trade_open, expected_trade_open)
+        self.assertEqual(transactions, expected)
+        for portfolio in expected:
+            self.assertListEqual(list(transactions[portfolio]), list(expected[portfolio]))
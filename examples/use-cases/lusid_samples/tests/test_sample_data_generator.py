@@ -0,0 +1,112 @@
+import filecmp
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import pandas as pd
+
+import baseline
+from lusid_samples import lusid_sample_data, sample_data_generator
+from test_lusid_sample_data import working_folder
+
+
+def generate(output_dir, **kwargs):
+    options = dict(instruments=50, portfolios=12, transactions=500, holdings_per_portfolio=5, rows_per_part=100)
+    options.update(kwargs)
+    return sample_data_generator.generate(output_dir, **options)
+
+
+class SampleDataGeneratorTests(unittest.TestCase):
+
+    def setUp(self):
+        cache = mock.patch.dict(lusid_sample_data._import_file_cache, clear=True)
+        cache.start()
+        self.addCleanup(cache.stop)
+
+        folder = tempfile.TemporaryDirectory()
+        self.addCleanup(folder.cleanup)
+        self.folder = folder.name
+
+    def output_dir(self, name):
+        return os.path.join(self.folder, name, "data")
+
+    def assertSameFiles(self, first, second):
+        match, mismatch, errors = filecmp.cmpfiles(first, second, sample_data_generator.FILES, shallow=False)
+        self.assertListEqual(sorted(match), sorted(sample_data_generator.FILES))
+
+    def test_same_seed_generates_the_same_files(self):
+        rows = generate(self.output_dir("first"), seed=5, workers=2)
+        generate(self.output_dir("second"), seed=5, workers=2)
+        generate(self.output_dir("other"), seed=6, workers=2)
+
+        self.assertSameFiles(self.output_dir("first"), self.output_dir("second"))
+        self.assertFalse(filecmp.cmp(os.path.join(self.output_dir("first"), "transactions.csv"),
+                                     os.path.join(self.output_dir("other"), "transactions.csv"), shallow=False))
+        self.assertEqual(rows["transactions.csv"], 500)
+        self.assertEqual(rows["portfolios.csv"], 12)
+
+    def test_number_of_workers_does_not_change_the_files(self):
+        generate(self.output_dir("one"), workers=1)
+        generate(self.output_dir("three"), workers=3)
+
+        self.assertSameFiles(self.output_dir("one"), self.output_dir("three"))
+
+    def test_parts_are_joined_in_order(self):
+        generate(self.output_dir("data"), files=["transactions.csv"], workers=2)
+
+        transactions = pd.read_csv(os.path.join(self.output_dir("data"), "transactions.csv"))
+
+        self.assertEqual(len(transactions), 500)
+        self.assertListEqual(transactions["transaction_id"].tolist(), [f"tid_{index:012d}" for index in range(500)])
+        self.assertListEqual(os.listdir(self.output_dir("data")), ["transactions.csv"])
+
+    def test_generated_files_have_the_layout_and_types_of_the_sample_files(self):
+        generate(self.output_dir("data"), workers=2)
+
+        with working_folder(os.path.dirname(self.output_dir("data"))):
+            for file_name in sample_data_generator.FILES:
+                with self.subTest(file_name=file_name):
+                    data = lusid_sample_data.import_file(file_name)
+                    schema = lusid_sample_data.SAMPLE_FILE_SCHEMAS[file_name]["dtype"]
+
+                    self.assertListEqual(data.columns.tolist(), list(schema))
+                    for column, dtype in schema.items():
+                        self.assertEqual(str(data[column].dtype), "object" if dtype is str else dtype, column)
+
+            # Identifiers made of digits keep their leading zeros
+            self.assertEqual(lusid_sample_data.import_file("paper-instruments.csv")["sedol"][0], "0000000")
+
+    def test_generated_files_load_as_the_row_by_row_loaders_did(self):
+        generate(self.output_dir("data"), workers=2)
+
+        # The row by row loaders read the files the same way, so only how they build their results is compared
+        with working_folder(os.path.dirname(self.output_dir("data"))), \
+                mock.patch.object(baseline, "import_file", lusid_sample_data.import_file):
+            self.assertEqual(lusid_sample_data.fetch_portfolio_names("portfolios.csv"),
+                             baseline.fetch_portfolio_names("portfolios.csv"))
+            self.assertEqual(lusid_sample_data.fetch_instrument_universe("instruments.csv").to_dict(),
+                             baseline.fetch_instrument_universe("instruments.csv"))
+            self.assertEqual(lusid_sample_data.fetch_instrument_universe("paper-instruments.csv", paper=True).to_dict(),
+                             baseline.fetch_instrument_universe("paper-instruments.csv", paper=True))
+            self.assertEqual(lusid_sample_data.fetch_client_take_on_balances("holdings.csv"),
+                             baseline.fetch_client_take_on_balances("holdings.csv"))
+
+            transactions = lusid_sample_data.fetch_client_transactions("paper-transactions.csv", 5, seed=1)
+            dates = pd.DatetimeIndex(pd.to_datetime(transactions["transaction_date"]))
+            pd.testing.assert_frame_equal(
+                transactions,
+                baseline.fetch_client_transactions("paper-transactions.csv", 5, dates.to_pydatetime()),
+                check_dtype=False)
+
+    def test_parquet_files_are_folders_of_parts(self):
+        generate(self.output_dir("data"), files=["transactions.csv"], file_format="parquet", workers=2)
+
+        transactions = pd.read_parquet(os.path.join(self.output_dir("data"), "transactions.parquet"))
+
+        self.assertEqual(len(transactions), 500)
+        self.assertEqual(len(os.listdir(os.path.join(self.output_dir("data"), "transactions.parquet"))), 5)
+
+    def test_unsupported_file_format(self):
+        with self.assertRaises(ValueError):
+            generate(self.output_dir("data"), file_format="json")
@@ -0,0 +1,30 @@
+import types
+import unittest
+
+from fakes import FakeApiFactory, api_exception
+from lusid_samples import bulk
+
+
+class UpsertTransactionsTests(unittest.TestCase):
+
+    def test_reports_each_batch_in_order(self):
+        sent = []
+
+        def upsert_transactions(scope, code, transaction_request):
+            sent.append((scope, code, transaction_request))
+            if transaction_request[0] == "t2":
+                raise api_exception(400)
+            return "response"
+
+        api_factory = FakeApiFactory(
+            TransactionPortfoliosApi=types.SimpleNamespace(upsert_transactions=upsert_transactions))
+
+        reports = bulk.upsert_transactions(api_factory, "scope", "code", (f"t{index}" for index in range(5)),
+                                           batch_size=2)
+
+        self.assertListEqual([report.index for report in reports], [0, 1, 2])
+        self.assertListEqual([report.size for report in reports], [2, 2, 1])
+        self.assertListEqual([report.response for report in reports], ["response", None, "response"])
+        self.assertEqual(reports[1].error.status, 400)
+        self.assertEqual(len(sent), 3)
+        self.assertTrue(all(request[:2] == ("scope", "code") for request in sent))
@@ -1,19 +1,23 @@
-# Import LUSID
-import lusid
-import lusid.models as models
-import lusid_sample_data as import_data
 # Import Libraries
-import pprint
-from datetime import datetime, timedelta, time, date
-import pytz
-import uuid
-import printer as prettyprint
-from datetime import datetime
-import pandas as pd
-import numpy as np
 import os
-import json
-import time
+import sys
+from datetime import datetime, timedelta
+
+# The shared helpers are in the lusid_samples package, in the use-cases folder above this one
+_use_cases = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _use_cases not in sys.path:
+    sys.path.append(_use_cases)
+
+import printer as prettyprint
+from lusid_samples import lazy_import
+from lusid_samples.api_registry import registry_for
+
+# Import LUSID, pandas and pytz only when a helper first uses them, so that importing the helpers is quick
+lusid = lazy_import('lusid')
+models = lazy_import('lusid.models')
+pd = lazy_import('pandas')
+pytz = lazy_import('pytz')
+
 globals = {}
 
 
@@ -35,7 +39,7 @@ def create_portfolio_group(api_factory, scope, code, portfolios):
     portfolio_creation_date = datetime.now(pytz.UTC) - timedelta(days=5000)
 
     try:
-        api_factory.build(lusid.api.PortfolioGroupsApi).delete_portfolio_group(
+        registry_for(api_factory).build(lusid.api.PortfolioGroupsApi).delete_portfolio_group(
             scope=scope,
             code=code)
     except:
@@ -49,7 +53,7 @@ def create_portfolio_group(api_factory, scope, code, portfolios):
         description=None,
         created=portfolio_creation_date)
 
-    portfolio_group = api_factory.build(lusid.api.PortfolioGroupsApi).create_portfolio_group(
+    portfolio_group = registry_for(api_factory).build(lusid.api.PortfolioGroupsApi).create_portfolio_group(
         scope=scope,
         create_portfolio_group_request=group_request)
     
@@ -125,7 +129,7 @@ def upsert_quotes(api_factory, scope, data_frame, instrument_identifier_mapping,
 
         
     # Upsert the quotes into LUSID
-    response = api_factory.build(lusid.api.QuotesApi).upsert_quotes(
+    response = registry_for(api_factory).build(lusid.api.QuotesApi).upsert_quotes(
         scope=scope,
         request_body=instrument_quotes)
 
@@ -153,7 +157,7 @@ def create_portfolios(api_factory, scopes, code, currency):
     for scope in scopes:
     
         try:
-            api_factory.build(lusid.api.PortfoliosApi).delete_portfolio(
+            registry_for(api_factory).build(lusid.api.PortfoliosApi).delete_portfolio(
                 scope=scope,
                 code=code
             )
@@ -169,7 +173,7 @@ def create_portfolios(api_factory, scopes, code, currency):
             sub_holding_keys=None)
 
         # Call LUSID to create your portfolio
-        response = api_factory.build(lusid.api.TransactionPortfoliosApi).create_portfolio(
+        response = registry_for(api_factory).build(lusid.api.TransactionPortfoliosApi).create_portfolio(
             scope=scope,
             create_transaction_portfolio_request=transaction_portfolio_request)
         
@@ -230,8 +234,8 @@ def create_cut_labels(api_factory, exchange_names, cut_label_type):
     for exchange in exchange_names:
         exchange_code = exchange+'_'+cut_label_type
         try:
-            response = api_factory.build(lusid.api.CutLabelDefinitionsApi).get_cut_label_definition(code=exchange_code)
-            response = api_factory.build(lusid.api.CutLabelDefinitionsApi).delete_cut_label_definition(code=exchange_code)
+            response = registry_for(api_factory).build(lusid.api.CutLabelDefinitionsApi).get_cut_label_definition(code=exchange_code)
+            response = registry_for(api_factory).build(lusid.api.CutLabelDefinitionsApi).delete_cut_label_definition(code=exchange_code)
         except lusid.ApiException as e:
             pass
     
@@ -247,7 +251,7 @@ def create_cut_labels(api_factory, exchange_names, cut_label_type):
             cut_local_time=exchange_time,
             time_zone=exchange_info[exchange]['time_zone'])           
         try:
-            response = api_factory.build(lusid.api.CutLabelDefinitionsApi).create_cut_label_definition(
+            response = registry_for(api_factory).build(lusid.api.CutLabelDefinitionsApi).create_cut_label_definition(
                 create_cut_label_definition_request=request)
             responses.append(response)             
         except lusid.ApiException as e: